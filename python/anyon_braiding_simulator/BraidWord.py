@@ -0,0 +1,196 @@
+# Standard Library
+from typing import List, Optional, Sequence, Tuple
+
+# A braid word is a sequence of signed generators. Generator k > 0 is sigma_{k-1},
+# the swap (k - 1, k) of neighbouring anyons, and -k is its inverse, the swap
+# (k, k - 1). Generators commute when their indices differ by at least 2.
+Word = List[int]
+
+
+def to_generator(index_A: int, index_B: int) -> int:
+    """
+    Converts a swap of adjacent anyons to its signed generator
+    """
+    if abs(index_A - index_B) != 1:
+        raise ValueError(f'The pair ({index_A}, {index_B}) is not adjacent')
+    return index_B if index_A < index_B else -index_A
+
+
+def to_swap(generator: int) -> Tuple[int, int]:
+    """
+    Converts a signed generator to its swap of adjacent anyons
+    """
+    if generator == 0:
+        raise ValueError('0 is not a generator')
+    return (generator - 1, generator) if generator > 0 else (-generator, -generator - 1)
+
+
+def to_word(swaps: Sequence[Sequence[Tuple[int, int]]]) -> Word:
+    """
+    Flattens time steps of swaps into a braid word
+    """
+    return [to_generator(index_A, index_B) for layer in swaps for index_A, index_B in layer]
+
+
+def commute(g: int, h: int) -> bool:
+    """
+    Whether two generators commute, i.e. act on disjoint pairs of anyons
+    """
+    return abs(abs(g) - abs(h)) >= 2
+
+
+def asap_layers(word: Word) -> List[Word]:
+    """
+    Packs a word into time steps, placing each generator in the step after the
+    last generator it does not commute with. Only dependencies between
+    generators fix their order, so the number of steps is the longest chain of
+    dependent generators, which is the fewest any reordering can reach
+    """
+    last_layer = {}
+    layers: List[Word] = []
+    for g in word:
+        k = abs(g)
+        layer = 1 + max(last_layer.get(k - 1, -1), last_layer.get(k, -1), last_layer.get(k + 1, -1))
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(g)
+        last_layer[k] = layer
+    return layers
+
+
+def _reduce_power(exponent: int, order: Optional[int]) -> int:
+    """
+    Reduces an exponent modulo the order of a generator into (-order / 2, order / 2]
+    """
+    if order is None:
+        return exponent
+    exponent %= order
+    return exponent - order if exponent > order // 2 else exponent
+
+
+def reduce_word(word: Word, order: Optional[int] = None) -> Word:
+    """
+    Cancels inverse pairs and merges powers of a generator across any
+    generators that commute with it. With an order n, where sigma^n = 1 for
+    every generator, powers are also reduced modulo n.
+
+    Generators are stacked into levels like in asap_layers, with each level
+    holding at most one power per index. A new generator can only merge with
+    the highest level power it does not commute with, and only if that power
+    has its index; the powers of an index stay in increasing level order since
+    a generator always lands above the ones it depends on
+    """
+    # Powers are [index, exponent, level], and stacks hold the powers of each index
+    powers = []
+    stacks = {}
+    for g in word:
+        k, sign = abs(g), 1 if g > 0 else -1
+        tops = [stacks[j][-1] for j in (k - 1, k, k + 1) if stacks.get(j)]
+        blocker = max(tops, key=lambda power: power[2], default=None)
+
+        if blocker is not None and blocker[0] == k:
+            blocker[1] = _reduce_power(blocker[1] + sign, order)
+            if blocker[1] == 0:
+                stacks[k].pop()
+            continue
+
+        power = [k, _reduce_power(sign, order), 0 if blocker is None else blocker[2] + 1]
+        powers.append(power)
+        stacks.setdefault(k, []).append(power)
+
+    # Levels are a valid order of the powers, and sorting keeps insertion order within a level
+    reduced: Word = []
+    for k, exponent, _ in sorted((power for power in powers if power[1] != 0), key=lambda power: power[2]):
+        reduced.extend([k if exponent > 0 else -k] * abs(exponent))
+    return reduced
+
+
+def braid_relation(x: int, y: int, z: int) -> Optional[Tuple[int, int, int]]:
+    """
+    Returns the other side of a braid relation x y z = x' y' z' between
+    neighbouring generators a and b, or None if there is none:
+    - a b a = b a b, and the same with all inverses
+    - a^e b^d a^-e = b^-e a^d b^e
+    """
+    if abs(abs(x) - abs(y)) != 1 or abs(z) != abs(x):
+        return None
+    a, b = abs(x), abs(y)
+    e, d = (1 if x > 0 else -1), (1 if y > 0 else -1)
+    if z == x and d == e:
+        return e * b, e * a, e * b
+    if z == -x:
+        return -e * b, d * a, e * b
+    return None
+
+
+def _next_dependent(word: Word, g: int, start: int, step: int, skip: Tuple[int, ...] = ()) -> Optional[int]:
+    """
+    The position of the first generator from start on, moving by step, that
+    does not commute with g
+    """
+    position = start
+    while 0 <= position < len(word):
+        if position not in skip and not commute(word[position], g):
+            return position
+        position += step
+    return None
+
+
+def yang_baxter_pass(word: Word) -> Word:
+    """
+    Rewrites braid relations x y z -> x' y' z' whose result cancels against a
+    neighbouring generator. The letters x and y of a relation may be spread out
+    with generators they commute with in between, and the rewritten letters
+    take the place of z
+    """
+    word = list(word)
+    p = 0
+    while p < len(word):
+        x = word[p]
+        q = _next_dependent(word, x, p + 1, 1)
+        if q is None or abs(abs(word[q]) - abs(x)) != 1:
+            p += 1
+            continue
+        y = word[q]
+
+        # Everything between y and z must commute with x too, so x can follow y
+        r = _next_dependent(word, y, q + 1, 1)
+        rewritten = None
+        if r is not None and all(commute(word[i], x) for i in range(q + 1, r)):
+            rewritten = braid_relation(x, y, word[r])
+
+        if rewritten is not None:
+            # Cancel straight away, so every rewrite shortens the word and a
+            # relation is never rewritten back and forth
+            before = _next_dependent(word, rewritten[0], r - 1, -1, skip=(p, q))
+            after = _next_dependent(word, rewritten[2], r + 1, 1)
+            if before is not None and word[before] == -rewritten[0]:
+                start = min(p, before)
+                middle = [word[i] for i in range(start, r) if i not in (p, q, before)]
+                word = word[:start] + middle + list(rewritten[1:]) + word[r + 1 :]
+                p = max(start - 2, 0)
+                continue
+            if after is not None and word[after] == -rewritten[2]:
+                middle = word[p + 1 : q] + word[q + 1 : r] + list(rewritten[:2])
+                word = word[:p] + middle + word[r + 1 : after] + word[after + 1 :]
+                p = max(p - 2, 0)
+                continue
+        p += 1
+    return word
+
+
+def optimize_word(word: Word, order: Optional[int] = None, relations: bool = True) -> Word:
+    """
+    Shortens a braid word by cancellation, commutation, power reduction
+    modulo the generator order and, unless relations is False, braid
+    relations that enable cancellations, until none of them remove any more
+    generators
+    """
+    word = reduce_word(word, order)
+    if not relations:
+        return word
+    while True:
+        rewritten = reduce_word(yang_baxter_pass(word), order)
+        if len(rewritten) >= len(word):
+            return word
+        word = rewritten
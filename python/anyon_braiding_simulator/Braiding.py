@@ -1,19 +1,75 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
-from anyon_braiding_simulator import State, Fusion, Model
+from anyon_braiding_simulator import AnyonModel, State, Fusion, Model, StateVec
+import scipy.sparse as sp
+from BraidWord import asap_layers, optimize_word, to_generator, to_swap, to_word
+from GeneratorCache import GeneratorCache, generator_cache, register_signature
+
+def _apply_to_qubit(unitary: np.ndarray, gate: np.ndarray, qubit: int) -> None:
+    """
+    Multiplies a 2^n x 2^n matrix or 2^n state in place by a single qubit gate
+    on the left. Qubit 0 is the most significant, like in generate_overall_unitary
+    """
+    rows = unitary.reshape(2**qubit, 2, -1)
+    rows[:] = np.einsum('ij,ajb->aib', gate, rows)
+
+
+def _fusion_tree(num_anyons: int, operations) -> Tuple[List[Tuple[int, int]], dict]:
+    """
+    Replays fusion operations into a binary tree over the anyon positions.
+    Leaves are 0 to n - 1 and the i-th fusion is node n + i, whose children are
+    the nodes its two anyons stood for when it happened
+
+    Returns:
+    - list: The (child, child) pair of each fusion node
+    - dict: The parent of every fused node
+    """
+    nodes = list(range(num_anyons))
+    children = []
+    parents = {}
+    for _, op in operations:
+        node = num_anyons + len(children)
+        pair = (nodes[op.anyon_1], nodes[op.anyon_2])
+        children.append(pair)
+        parents[pair[0]] = parents[pair[1]] = node
+        nodes[op.anyon_1] = node
+    return children, parents
+
 
 class Braid:
-    def __init__(self, state: State, model: Model):
+    def __init__(self, state: State, model: Model, debug: bool = False, cache: Optional[GeneratorCache] = None):
         """
         Parameters:
         - state (State): The state of the system containing anyons and fusion operations
         - model (Model): Model to use for the braid simulation
+        - debug (bool): Enables generate_overall_unitary, which builds dense 2^n x 2^n unitaries
+        - cache (GeneratorCache): Cache of generator unitaries, shared by every braid by default
         """
         self.state = state
-        self.anyons = state.anyons
+        self.cache = generator_cache if cache is None else cache
+        # State hands out an immutable snapshot, copy it since swaps reorder the anyons
+        self.anyons = list(state.anyons)
         self.swaps = []
+        # Unitaries of the first t time steps in debug mode, or their states
+        # otherwise, extended as they are asked for, and the (time step,
+        # unitary or state) checkpoints of undone time steps
+        self._prefixes = []
+        self._undone = []
+        # Order of the anyons after the first t time steps, kept as swaps are
+        # recorded so looking up the charges of a swap does not replay the braid
+        self._orders = [tuple(self.anyons)]
         self.model = model
-        self.fusion = Fusion(state)
+        # Custom models define their own fusion rules, the built in models are known to Fusion
+        if model.get_model_type() == AnyonModel.Custom:
+            self.fusion = Fusion(state, model._rules)
+        else:
+            self.fusion = Fusion(state)
+        # Fusion copies the state, so the basis is the operations at this point
+        self._operations = state.operations
+        self._children, self._parents = _fusion_tree(len(self.anyons), self._operations)
+        # Register signatures by charge order, hashed once per order this braid sees
+        self._signatures = {}
+        self.debug = debug
 
         # Check if there are fewer than 3 anyons
         if len(state.anyons) < 3:
@@ -29,16 +85,16 @@ class Braid:
         Swaps the positions of anyons in list "anyons" based on provided swaps to occur at the present time
 
         Parameters:
-        - time (int): Time step at which the swaps are performed
         - swaps (list): List of tuples where each tuple is a pair of anyon indices to swap
 
         Swaps only adjacent anyons
         """
         time = len(self.swaps)
+        self._truncate(time)
         self.swaps.append([])
 
-        # Track used indices directly in the swaps list
-        used_indices = set([swap for sublist in self.swaps[:time] for swap in sublist])
+        # Only the current time step constrains which indices can be swapped
+        used_indices = set()
 
         for index_A, index_B in swaps:
             if len(set([index_A, index_B])) != 2:
@@ -59,6 +115,286 @@ class Braid:
             used_indices.add(index_A)
             used_indices.add(index_B)
 
+        self._orders.append(tuple(self.anyons))
+
+    def swap_layers(self, layers) -> None:
+        """
+        Records many time steps of swaps in one call, validating them with
+        vectorized checks. Unlike swap, an invalid swap rejects the whole
+        batch rather than being skipped, and nothing is recorded
+
+        Parameters:
+        - layers (array-like): Integer array of shape (T, k, 2) holding up to k swaps for each of
+          T time steps, or (k, 2) for a single time step. Rows of (-1, -1) pad shorter time steps
+        """
+        layers = np.asarray(layers, dtype=np.int64)
+        if layers.ndim == 2:
+            layers = layers[np.newaxis]
+        if layers.ndim != 3 or layers.shape[2] != 2:
+            raise ValueError('Swap layers must have shape (T, k, 2)')
+
+        start = len(self.swaps)
+        num_anyons = len(self.anyons)
+        index_A, index_B = layers[..., 0], layers[..., 1]
+        active = (index_A >= 0) | (index_B >= 0)
+
+        # Swaps must be between adjacent anyons that exist
+        valid = (np.abs(index_A - index_B) == 1) & (np.minimum(index_A, index_B) >= 0)
+        valid &= np.maximum(index_A, index_B) < num_anyons
+        invalid = np.argwhere(active & ~valid)
+        if len(invalid):
+            time, row = invalid[0]
+            raise ValueError(
+                f'The pair ({index_A[time, row]}, {index_B[time, row]}) could not be swapped at time {start + time}'
+            )
+
+        # Each index may be used at most once per time step, found by sorting (time, index) keys
+        times = np.broadcast_to(np.arange(len(layers))[:, np.newaxis], active.shape)[active]
+        keys = np.concatenate([times * num_anyons + index_A[active], times * num_anyons + index_B[active]])
+        keys.sort()
+        repeated = keys[1:][keys[1:] == keys[:-1]]
+        if len(repeated):
+            time, index = divmod(int(repeated[0]), num_anyons)
+            raise ValueError(f'Index {index} is used more than once at time {start + time}')
+
+        # Swaps within a time step are disjoint, so each step is a single permutation
+        self._truncate(start)
+        order = np.arange(num_anyons)
+        for time in range(len(layers)):
+            layer_A = index_A[time][active[time]]
+            layer_B = index_B[time][active[time]]
+            order[layer_A], order[layer_B] = order[layer_B], order[layer_A]
+            self.swaps.append(list(zip(layer_A.tolist(), layer_B.tolist())))
+            self._orders.append(tuple(self.anyons[i] for i in order))
+
+        self.anyons = [self.anyons[i] for i in order]
+
+    def schedule(self, sequence: List[Tuple[int, int]]) -> int:
+        """
+        Records a flat sequence of adjacent swaps in as few time steps as
+        possible. Swaps on disjoint pairs of anyons commute, so each swap is
+        moved to the time step after the last swap it shares an anyon with.
+        Like swap_layers, an invalid swap rejects the whole sequence
+
+        Parameters:
+        - sequence (list): Swaps (index_A, index_B) of adjacent anyons, in the order they are performed
+
+        Returns:
+        - int: The number of time steps added
+        """
+        word = [to_generator(index_A, index_B) for index_A, index_B in sequence]
+        layers = asap_layers(word)
+        if not layers:
+            return 0
+
+        padded = np.full((len(layers), max(len(layer) for layer in layers), 2), -1, dtype=np.int64)
+        for time, layer in enumerate(layers):
+            padded[time, : len(layer)] = [to_swap(g) for g in layer]
+        self.swap_layers(padded)
+        return len(layers)
+
+    def generator_order(self, max_order: int = 64) -> Optional[int]:
+        """
+        Returns the smallest even n with sigma^n = 1 for every swap matrix of
+        the braid, or None if there is no such n up to max_order. Swap
+        matrices are R or conjugates of R, so this is the order of R, which is
+        only shared by every swap when all anyons have the same charge
+        """
+        r_mtx = getattr(self.model, '_r_mtx', None)
+        if r_mtx is None or len({anyon.charge.to_string() for anyon in self.anyons}) != 1:
+            return None
+
+        # sigma^n must also permute the anyons back, so n is even
+        power = np.eye(len(r_mtx), dtype=complex)
+        for n in range(1, max_order + 1):
+            power = power @ r_mtx
+            if n % 2 == 0 and np.allclose(power, np.eye(len(r_mtx))):
+                return n
+        return None
+
+    def satisfies_braid_relation(self) -> bool:
+        """
+        Checks that the swap matrices of the register satisfy the braid
+        relation sigma_i sigma_i+1 sigma_i = sigma_i+1 sigma_i sigma_i+1. Swaps
+        act as single qubit gates, or as the identity off the qubits, so this
+        often fails even though the braid group itself satisfies it
+        """
+        # Without fusions there are no qubits for the swaps to act on
+        if not self._operations:
+            return True
+        if self.model.get_model_type() == AnyonModel.Custom:
+            return False
+
+        try:
+            generators = [self.generator_unitary(k, sparse=True) for k in range(1, len(self.anyons))]
+        except ValueError:
+            # Some swap has no single matrix on this register
+            return False
+        for a, b in zip(generators, generators[1:]):
+            if abs(a @ b @ a - b @ a @ b).max() > 1e-9:
+                return False
+        return True
+
+    def optimize(self) -> int:
+        """
+        Shortens the recorded swaps without changing what they simulate.
+        Inverse swaps cancel across swaps they commute with, powers of a swap
+        are reduced modulo the order of R, and braid relations are applied
+        where they lead to cancellations if the register's swap matrices
+        satisfy them. The remaining swaps are packed into as few time steps as
+        possible. Swap matrices depend on the charges they swap, so nothing is
+        changed unless every anyon has the same charge
+
+        Returns:
+        - int: The number of swaps removed
+        """
+        if len({anyon.charge.to_string() for anyon in self.anyons}) != 1:
+            return 0
+
+        word = to_word(self.swaps)
+        optimized = optimize_word(word, self.generator_order(), relations=self.satisfies_braid_relation())
+        self._truncate(0)
+        self.swaps = [[to_swap(g) for g in layer] for layer in asap_layers(optimized)]
+        anyons = list(self._orders[0])
+        for layer in self.swaps:
+            self._permute(layer, anyons)
+            self._orders.append(tuple(anyons))
+        return len(word) - len(optimized)
+
+    def _truncate(self, time: int) -> None:
+        """
+        Drops the cached prefixes after a time step and the undone time
+        steps, before the swaps from that time step on are changed
+        """
+        del self._prefixes[time + 1 :]
+        del self._orders[time + 1 :]
+        self._undone.clear()
+
+    def _permute(self, layer: List[Tuple[int, int]], anyons: Optional[list] = None) -> None:
+        """
+        Swaps the anyons of a time step, which also reverses it since its swaps
+        are disjoint. Permutes the braid's own anyons by default
+        """
+        anyons = self.anyons if anyons is None else anyons
+        for index_A, index_B in layer:
+            anyons[index_A], anyons[index_B] = anyons[index_B], anyons[index_A]
+
+    def anyons_at(self, time: int) -> list:
+        """
+        Returns the order of the anyons when the swaps of a time step start,
+        i.e. after the swaps of the time steps before it
+
+        Parameters:
+        - time (int): Time step, where the swaps of time step t are self.swaps[t - 1]
+        """
+        return list(self._orders[max(time - 1, 0)])
+
+    def undo(self) -> List[Tuple[int, int]]:
+        """
+        Removes the last time step of swaps, keeping its accumulated unitary
+        or state as a checkpoint so redo does not recompute it
+
+        Returns:
+        - list: The swaps of the removed time step
+        """
+        if not self.swaps:
+            raise ValueError('There are no swaps to undo')
+
+        layer = self.swaps.pop()
+        self._permute(layer)
+        self._orders.pop()
+        time = len(self.swaps)
+        prefix = self._prefixes[time + 1] if len(self._prefixes) > time + 1 else None
+        del self._prefixes[time + 1 :]
+        self._undone.append((layer, prefix))
+        return layer
+
+    def redo(self) -> List[Tuple[int, int]]:
+        """
+        Restores the last undone time step of swaps. Recording new swaps
+        discards the undone time steps
+
+        Returns:
+        - list: The swaps of the restored time step
+        """
+        if not self._undone:
+            raise ValueError('There are no swaps to redo')
+
+        layer, prefix = self._undone.pop()
+        self._permute(layer)
+        self._orders.append(tuple(self.anyons))
+        if prefix is not None and len(self._prefixes) == len(self.swaps) + 1:
+            self._prefixes.append(prefix)
+        self.swaps.append(layer)
+        return layer
+
+    def unitary(self, time: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the dense 2^n x 2^n unitary of the first time steps of swaps.
+        Unitaries of each prefix of the braid are cached, so appending, undoing
+        or redoing a time step only costs the matrix products of that step.
+        Like generate_overall_unitary, this is only available in debug mode
+
+        Parameters:
+        - time (int): Number of time steps to include, all of them by default
+
+        Returns:
+        - np.ndarray: The read-only accumulated unitary
+        """
+        if not self.debug:
+            raise ValueError('Dense unitaries are only available in debug mode, use amplitudes instead')
+        return self._prefix(time)
+
+    def amplitudes(self, time: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the 2^n amplitudes of the fusion qubits after the first time
+        steps of swaps, starting from |0...0>. Outside debug mode the braid
+        keeps the running state of each prefix rather than its unitary, so
+        this costs O(2^n) per new swap and no dense unitary is ever built
+
+        Parameters:
+        - time (int): Number of time steps to include, all of them by default
+
+        Returns:
+        - np.ndarray: The read-only amplitudes
+        """
+        if self.debug:
+            return self._prefix(time)[:, 0]
+        return self._prefix(time)
+
+    def _prefix(self, time: Optional[int]) -> np.ndarray:
+        """
+        Returns the cached unitary in debug mode, or state otherwise, of the
+        first time steps, extending the cache from the last cached prefix
+        """
+        self._require_qubits()
+        time = len(self.swaps) if time is None else time
+        if not 0 <= time <= len(self.swaps):
+            raise ValueError(f'Time must be between 0 and {len(self.swaps)}')
+
+        if not self._prefixes:
+            dim = 2 ** len(self.fusion.qubit_enc())
+            if self.debug:
+                initial = np.eye(dim, dtype=complex)
+            else:
+                initial = np.zeros(dim, dtype=complex)
+                initial[0] = 1
+            initial.flags.writeable = False
+            self._prefixes.append(initial)
+
+        while len(self._prefixes) <= time:
+            step = len(self._prefixes)
+            prefix = self._prefixes[-1].copy()
+            anyons = self._orders[step - 1]
+            for swap_index, (index_A, index_B) in enumerate(self.swaps[step - 1]):
+                qubit = self.swap_to_qubit(step, swap_index)
+                if qubit is not None:
+                    _apply_to_qubit(prefix, np.asarray(self.swap_matrix(index_A, index_B, anyons)), qubit)
+            prefix.flags.writeable = False
+            self._prefixes.append(prefix)
+
+        return self._prefixes[time]
+
     def swap_to_qubit(self, time: int, swap_index: int) -> int:
         """
         Determines which qubit the swap operation is acting on
@@ -67,19 +403,16 @@ class Braid:
         - time (int): Time step at which the swap(s) are performed
         - swap_index (int): Index of the swap operation in the swaps list
         """
+        self._require_qubits()
+
         # Get the swap at the desired time
         swap = self.swaps[time-1] if time > 0 else []
 
         # Get the indices of the swap anyons
         index_A, index_B = swap[swap_index]
 
-        # Iterate through the qubit encoding to find the matching qubit
-        for qubit_index, fusion_pair in enumerate(self.fusion.qubit_enc()):
-            if {index_A, index_B} == {fusion_pair.anyon_1, fusion_pair.anyon_2}:
-                return qubit_index
-
-        # If no matching qubit is found or if indices are out of range
-        return None
+        # Look up the qubit in the fusion's cached encoding, None if the swap is not on a qubit
+        return self.fusion.qubit_index(index_A, index_B)
     
     def generate_swap_matrix(self, time: int, swap_index: int) -> np.ndarray:
         """
@@ -90,13 +423,32 @@ class Braid:
         - swap_index (int): Index of the swap operation in the swaps list
 
         Returns:
-        - np.ndarray: Swap matrix F^{-1}RF or R depending on fusion tree
+        - np.ndarray: Swap matrix F^{-1}RF or R depending on fusion tree, inverted
+          when the swap (index_A, index_B) has index_A > index_B
         """
         # Get the indices of the anyons to swap
         index_A, index_B = self.swaps[time-1][swap_index]
-        
+        # The charges at each position are the ones when the time step starts
+        return self.swap_matrix(index_A, index_B, self.anyons_at(time))
+
+    def swap_matrix(self, index_A: int, index_B: int, anyons: Optional[list] = None) -> np.ndarray:
+        """
+        Generates the swap matrix for swapping the anyons at two indices
+
+        Parameters:
+        - index_A (int): Index of anyon A
+        - index_B (int): Index of anyon B
+        - anyons (list): Order of the anyons when the swap happens, the current order by default
+
+        Returns:
+        - np.ndarray: Swap matrix F^{-1}RF or R depending on fusion tree, inverted
+          when index_A > index_B
+        """
+        self._require_qubits()
+        anyons = self.anyons if anyons is None else anyons
+
         # Check if indices are valid
-        if index_A < 0 or index_A >= len(self.anyons) or index_B < 0 or index_B >= len(self.anyons):
+        if index_A < 0 or index_A >= len(anyons) or index_B < 0 or index_B >= len(anyons):
             raise ValueError("Invalid anyon indices")
 
         # Check if index_A and index_B are adjacent in fusion operations
@@ -104,53 +456,191 @@ class Braid:
             # Direct swap using R matrix
             swap_matrix = self.model._r_mtx
         else:
-            # Indices not adjacent, need basis transformation
-            swap_matrix = np.linalg.inv(self.model._f_mtx)
-            swap_matrix = np.dot(swap_matrix, self.model._r_mtx)
-            swap_matrix = np.dot(swap_matrix, self.model._f_mtx)
+            # Indices not adjacent, need basis transformation, which the model precomputes
+            swap_matrix = self._basis_change_swap(min(index_A, index_B), max(index_A, index_B), anyons)
+
+        # A swap to the left is the inverse braid generator, and the swap matrices are unitary
+        if index_A > index_B:
+            swap_matrix = np.conj(swap_matrix).T
 
         return swap_matrix
 
+    def _require_qubits(self) -> None:
+        """
+        Raises ValueError for custom models, whose anyons have no qubit
+        encoding yet, so their swaps cannot be turned into matrices
+        """
+        if self.model.get_model_type() == AnyonModel.Custom:
+            raise ValueError('Swap matrices are not supported for custom models, which have no qubit encoding yet')
+
+    def _leaves(self, node: int) -> List[int]:
+        """
+        Returns the anyon positions below a node of the fusion tree
+        """
+        num_anyons = len(self.anyons)
+        if node < num_anyons:
+            return [node]
+        left, right = self._children[node - num_anyons]
+        return self._leaves(left) + self._leaves(right)
+
+    def _node_charge(self, node: int, charges: List[int]) -> int:
+        """
+        Returns the charge index of a node of the fusion tree, given the charge
+        index at every position. The charge must be definite, i.e. the only
+        charge the anyons below the node can fuse to
+        """
+        leaves = self._leaves(node)
+        support = {charges[leaves[0]]}
+        for leaf in leaves[1:]:
+            support = {c for a in support for c in np.flatnonzero(self.model._rules[a, charges[leaf]])}
+        if len(support) != 1:
+            raise ValueError(f'The anyons at {leaves} have no definite fused charge to label the basis change')
+        return int(support.pop())
+
+    def _basis_change_swap(self, index_A: int, index_B: int, anyons: list) -> np.ndarray:
+        """
+        Returns F^-1 R F for swapping the anyons at index_A < index_B that are
+        not siblings in the fusion tree. F moves the fusion where their branches
+        meet, ((x A) B)_d or (A (B y))_d, to one where A and B are siblings.
+        The F labels are the charges of x or y, A, B and d in the given order
+        """
+        charges = [self.model._charge_index(anyon.charge.to_string().lower()) for anyon in anyons]
+
+        # The lowest common ancestor of the two anyons
+        ancestors = set()
+        node = index_A
+        while node in self._parents:
+            node = self._parents[node]
+            ancestors.add(node)
+        node = index_B
+        while node not in ancestors and node in self._parents:
+            node = self._parents[node]
+        if node not in ancestors:
+            # Anyons that are never fused together only exchange, with no basis change
+            return self.model.getRMatrix(charges[index_A], charges[index_B])
+
+        num_anyons = len(anyons)
+        left, right = self._children[node - num_anyons]
+        if index_A not in self._leaves(left):
+            left, right = right, left
+        total = self._node_charge(node, charges)
+
+        if right == index_B and left >= num_anyons and index_A in self._children[left - num_anyons]:
+            # ((x A) B)_d
+            rest = next(child for child in self._children[left - num_anyons] if child != index_A)
+            return self.model.getFInvRF(self._node_charge(rest, charges), charges[index_A], charges[index_B], total)
+
+        if left == index_A and right >= num_anyons and index_B in self._children[right - num_anyons]:
+            # (A (B y))_d, moved the other way
+            rest = next(child for child in self._children[right - num_anyons] if child != index_B)
+            labels = (charges[index_A], charges[index_B], self._node_charge(rest, charges), total)
+            r_mtx = self.model.getRMatrix(charges[index_A], charges[index_B])
+            return self.model.getFMatrix(*labels) @ r_mtx @ self.model.getFInv(*labels)
+
+        raise ValueError(f'Swapping the anyons at {index_A} and {index_B} takes more than one F move')
+
+    def apply_swap(self, state_vec: StateVec, time: int, swap_index: int) -> None:
+        """
+        Applies a swap operation to the state vector in place. Only the
+        amplitudes of the qubit the swap acts on are updated, which takes
+        O(2^n) time and no extra memory
+
+        Parameters:
+        - state_vec (StateVec): State vector over the qubits of the fusion qubit encoding
+        - time (int): Time step at which the swap(s) are performed
+        - swap_index (int): Index of the swap operation in the swaps list
+        """
+        swap_qubit_index = self.swap_to_qubit(time, swap_index)
+        if swap_qubit_index is None:
+            # The swap does not act on any encoded qubit
+            return
+
+        swap_matrix = np.asarray(self.generate_swap_matrix(time, swap_index), dtype=complex)
+        state_vec.apply_single_qubit(swap_matrix, swap_qubit_index)
+
     def generate_overall_unitary(self, time: int, swap_index: int) -> np.ndarray:
-        qubit_encoding = self.fusion.qubit_enc()
-        if qubit_encoding is None:
-            raise ValueError("Fusion qubit encoding returned None")
+        """
+        Builds the dense 2^n x 2^n unitary of a swap operation. Memory grows as
+        4^n, so this is only available in debug mode; use apply_swap to
+        simulate swaps
 
-        num_qubits = len(self.fusion.qubit_enc())
-        unitary = np.eye(2**num_qubits)  # Start with identity matrix of appropriate size
+        Parameters:
+        - time (int): Time step at which the swap(s) are performed
+        - swap_index (int): Index of the swap operation in the swaps list
+        """
+        if not self.debug:
+            raise ValueError('Dense unitaries are only available in debug mode, use apply_swap instead')
 
-        for i in range(num_qubits):
-            swap_qubit_index = self.swap_to_qubit(time, swap_index)
-            if i == swap_qubit_index:
-                swap_matrix = self.generate_swap_matrix(time, swap_index)
-                unitary = np.kron(unitary, swap_matrix)
-            else:
-                unitary = np.kron(unitary, np.eye(2))  # Kronecker with identity for non-involved qubits
+        index_A, index_B = self.swaps[time-1][swap_index]
+        return self.generator_unitary(to_generator(index_A, index_B), anyons=self.anyons_at(time))
 
+    def signature(self, anyons: Optional[list] = None) -> str:
+        """
+        Hash of the model, the charges of the anyons in their current order, or
+        the given order, and the fusion basis, which together fix every
+        generator's unitary. The fusion basis is fixed when the braid is
+        created, so each charge order is only hashed the first time it is seen
+        """
+        charges = tuple(anyon.charge.to_string() for anyon in (self.anyons if anyons is None else anyons))
+        if charges not in self._signatures:
+            self._signatures[charges] = register_signature(self.model, charges, self._operations)
+        return self._signatures[charges]
+
+    def generator_unitary(self, generator: int, sparse: bool = False, anyons: Optional[list] = None):
+        """
+        Returns the 2^n x 2^n unitary of a signed braid generator over the
+        fusion qubits. Unitaries are cached by the braid's signature, so braids
+        over the same register share them; dense ones are read-only
+
+        Parameters:
+        - generator (int): Signed generator, k for the swap (k - 1, k) and -k for (k, k - 1)
+        - sparse (bool): Return a CSR matrix, for registers too large for dense unitaries
+        - anyons (list): Order of the anyons when the swap happens, the current order by default
+        """
+        self._require_qubits()
+        if not 0 < abs(generator) < len(self.anyons):
+            raise ValueError(f'Generators must be between -{len(self.anyons) - 1} and {len(self.anyons) - 1}, except 0')
+        anyons = self.anyons if anyons is None else anyons
+        key = (self.signature(anyons), generator, sparse)
+        return self.cache.get(key, lambda: self._build_generator_unitary(generator, sparse, anyons))
+
+    def _build_generator_unitary(self, generator: int, sparse: bool, anyons: list):
+        """
+        Builds the unitary of a signed generator, the identity if its swap is not on a qubit
+        """
+        index_A, index_B = to_swap(generator)
+        num_qubits = len(self.fusion.qubit_enc())
+        qubit = self.fusion.qubit_index(index_A, index_B)
+
+        if qubit is None:
+            if sparse:
+                return sp.identity(2**num_qubits, dtype=complex, format='csr')
+            return np.eye(2**num_qubits, dtype=complex)
+
+        swap_matrix = np.asarray(self.swap_matrix(index_A, index_B, anyons), dtype=complex)
+        if sparse:
+            # Qubit 0 is the most significant, so the gate sits between identities on either side
+            left = sp.identity(2**qubit, dtype=complex)
+            right = sp.identity(2 ** (num_qubits - qubit - 1), dtype=complex)
+            return sp.kron(sp.kron(left, sp.csr_matrix(swap_matrix)), right, format='csr')
+
+        unitary = np.eye(2**num_qubits, dtype=complex)
+        _apply_to_qubit(unitary, swap_matrix, qubit)
         return unitary
 
     def is_direct_swap(self, index_A: int, index_B: int) -> bool:
         """
-        Checks if two anyons at indices index_A and index_B have a fusion operation at time 1
+        Checks if two anyons at indices index_A and index_B are fused with each other directly
 
         Parameters:
         - index_A (int): Index of anyon A
         - index_B (int): Index of anyon B
 
         Returns:
-        - bool: True if index_A and index_B have a fusion operation at time 1, False otherwise
-        """
-        # Get most recent fusion operation at time step 1
-        fusion_operations = self.state.operations
-
-        # Check if anyon indices index_A and index_B are adjacent in fusion operations at time 1
-        for fusion in fusion_operations:
-            if fusion[0] == 1:
-                if {index_A, index_B} == {fusion[1].anyon_1, fusion[1].anyon_2}:
-                    return True
-        
-        # No fusion operation found at time 1 for the given indices
-        return False
+        - bool: True if index_A and index_B are siblings in the fusion tree, False otherwise
+        """
+        # The fusion tree keeps parent links, so this is a constant time lookup
+        return self.fusion.are_siblings(index_A, index_B)
     
     def __str__(self) -> str:
         """
@@ -199,3 +689,90 @@ class Braid:
 
         # Convert the output grid to a string and remove trailing empty rows
         return '\n'.join([''.join(row) for row in output if any(c != ' ' for c in row)])
+
+
+class BraidBatch:
+    def __init__(self, state: State, model: Model, cache: Optional[GeneratorCache] = None):
+        """
+        Evaluates many braid words over the same anyons at once. Words are
+        given as a (B, T) integer array of signed generators, where k > 0 is
+        the swap (k - 1, k), -k is the swap (k, k - 1) and 0 pads shorter words.
+        Each generator's unitary over the fusion qubits comes from the braid
+        generator cache, built from the model's R and F tables on a miss, so
+        evaluating a batch is T stacked products. A generator's matrix depends
+        on the charges it swaps, so every anyon must have the same charge.
+
+        Parameters:
+        - state (State): The state of the system containing anyons and fusion operations
+        - model (Model): Model to use for the braid simulation
+        - cache (GeneratorCache): Cache of generator unitaries, shared by every braid by default
+        """
+        self.braid = Braid(state, model, cache=cache)
+        self.braid._require_qubits()
+        if len({anyon.charge.to_string() for anyon in self.braid.anyons}) != 1:
+            raise ValueError('Braid batches need every anyon to have the same charge')
+        self.num_generators = len(self.braid.anyons) - 1
+        self.num_qubits = len(self.braid.fusion.qubit_enc())
+
+        # generators[g + num_generators] is the 2^n x 2^n unitary of the signed generator g
+        dim = 2**self.num_qubits
+        self.generators = np.empty((2 * self.num_generators + 1, dim, dim), dtype=complex)
+        for g in range(-self.num_generators, self.num_generators + 1):
+            self.generators[g + self.num_generators] = np.eye(dim) if g == 0 else self.braid.generator_unitary(g)
+
+    def _validate(self, words) -> np.ndarray:
+        """
+        Checks a batch of words, returning it as a (B, T) integer array
+        """
+        words = np.asarray(words)
+        if words.ndim == 1:
+            words = words[np.newaxis]
+        if words.ndim != 2 or not np.issubdtype(words.dtype, np.integer):
+            raise ValueError('Words must be a (B, T) integer array')
+        if np.any(np.abs(words) > self.num_generators):
+            raise ValueError(f'Generators must be between -{self.num_generators} and {self.num_generators}')
+        return words
+
+    def unitaries(self, words) -> np.ndarray:
+        """
+        Returns the (B, 2^n, 2^n) unitaries of a batch of words
+
+        Parameters:
+        - words (array-like): (B, T) integer array of signed generators, or (T,) for a single word
+        """
+        words = self._validate(words)
+        dim = 2**self.num_qubits
+        unitaries = np.broadcast_to(np.eye(dim, dtype=complex), (len(words), dim, dim)).copy()
+        # The gathered generators and products reuse the same buffers at every step. Words are
+        # already validated, so np.take can clip rather than buffer its output to check indices
+        gathered = np.empty_like(unitaries)
+        product = np.empty_like(unitaries)
+        for step in words.T:
+            np.take(self.generators, step + self.num_generators, axis=0, out=gathered, mode='clip')
+            np.matmul(gathered, unitaries, out=product)
+            unitaries, product = product, unitaries
+        return unitaries
+
+    def amplitudes(self, words, state_vec) -> np.ndarray:
+        """
+        Returns the (B, 2^n) amplitudes of a state vector after each word of a
+        batch, without building the unitaries
+
+        Parameters:
+        - words (array-like): (B, T) integer array of signed generators, or (T,) for a single word
+        - state_vec (StateVec or array-like): Initial amplitudes over the fusion qubits
+        """
+        words = self._validate(words)
+        initial = np.asarray(state_vec.vec if isinstance(state_vec, StateVec) else state_vec, dtype=complex)
+        if initial.shape != (2**self.num_qubits,):
+            raise ValueError(f'The state vector must have {2**self.num_qubits} amplitudes')
+
+        # Amplitudes are (B, 2^n, 1) columns so each step is one stacked matmul into a reused buffer
+        amplitudes = np.broadcast_to(initial[:, np.newaxis], (len(words), len(initial), 1)).copy()
+        gathered = np.empty((len(words), len(initial), len(initial)), dtype=complex)
+        product = np.empty_like(amplitudes)
+        for step in words.T:
+            np.take(self.generators, step + self.num_generators, axis=0, out=gathered, mode='clip')
+            np.matmul(gathered, amplitudes, out=product)
+            amplitudes, product = product, amplitudes
+        return amplitudes[:, :, 0]
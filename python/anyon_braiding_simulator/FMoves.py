@@ -0,0 +1,251 @@
+# Standard Library
+import heapq
+from functools import lru_cache
+from itertools import count
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import scipy.sparse as sp
+from anyon_braiding_simulator import Basis, State
+from Model import Model
+
+# A fusion tree shape is either a leaf, given by its anyon index, or a pair of
+# subtrees. An F-move is the path of 0 (left) and 1 (right) steps from the root
+# to the node it rotates, and whether it is inverted. The move F turns
+# ((A, B), C) into (A, (B, C)) and its inverse turns (A, (B, C)) into ((A, B), C).
+Shape = Union[int, Tuple['Shape', 'Shape']]
+FMove = Tuple[Tuple[int, ...], bool]
+
+
+def tree_shape(basis: Basis, num_anyons: int) -> Shape:
+    """
+    Builds the shape of the fusion tree of a basis over anyons 0..num_anyons-1
+    """
+    slots: List[Optional[Shape]] = list(range(num_anyons))
+    for _, pair in basis.ops:
+        left, right = slots[pair.anyon_1], slots[pair.anyon_2]
+        if left is None or right is None:
+            raise ValueError(f'The anyons ({pair.anyon_1} {pair.anyon_2}) cannot be fused')
+        slots[pair.anyon_1] = (left, right)
+        slots[pair.anyon_2] = None
+
+    roots = [slot for slot in slots if slot is not None]
+    if len(roots) != 1:
+        raise ValueError('The basis must fuse every anyon into one')
+    return roots[0]
+
+
+def _intervals(shape: Shape) -> set:
+    """
+    The range of anyons under every internal node of a shape
+    """
+    intervals = set()
+
+    def visit(node: Shape) -> Tuple[int, int]:
+        if isinstance(node, int):
+            return node, node
+        low, _ = visit(node[0])
+        _, high = visit(node[1])
+        intervals.add((low, high))
+        return low, high
+
+    visit(shape)
+    return intervals
+
+
+def _rotations(shape: Shape, path: Tuple[int, ...] = ()):
+    """
+    Yields every shape one F-move away from a shape, along with the move
+    """
+    if isinstance(shape, int):
+        return
+    left, right = shape
+    if not isinstance(left, int):
+        yield (left[0], (left[1], right)), (path, False)
+    if not isinstance(right, int):
+        yield ((left, right[0]), right[1]), (path, True)
+    for rotated, move in _rotations(left, path + (0,)):
+        yield (rotated, right), move
+    for rotated, move in _rotations(right, path + (1,)):
+        yield (left, rotated), move
+
+
+@lru_cache(maxsize=1024)
+def shortest_f_moves(source: Shape, target: Shape) -> Tuple[FMove, ...]:
+    """
+    Finds a minimal sequence of F-moves from one tree shape to another by A*
+    search over rotations. Every F-move changes the anyon range of exactly one
+    internal node, so the number of ranges of the current shape missing from
+    the target never overestimates the remaining moves. Paths only depend on
+    the shapes, so they are cached across planners and states
+    """
+    target_intervals = _intervals(target)
+
+    def heuristic(shape: Shape) -> int:
+        return len(_intervals(shape) - target_intervals)
+
+    # Ties are broken by insertion order so shapes are never compared
+    tie_break = count()
+    queue = [(heuristic(source), next(tie_break), source)]
+    moves: Dict[Shape, Tuple[FMove, ...]] = {source: ()}
+    while queue:
+        _, _, shape = heapq.heappop(queue)
+        if shape == target:
+            return moves[shape]
+        for rotated, move in _rotations(shape):
+            path = moves[shape] + (move,)
+            if rotated not in moves or len(path) < len(moves[rotated]):
+                moves[rotated] = path
+                heapq.heappush(queue, (len(path) + heuristic(rotated), next(tie_break), rotated))
+
+    raise ValueError('The bases are not over the same anyons')
+
+
+class FMovePlanner:
+    def __init__(self, state: State, model: Model):
+        """
+        Plans changes between fusion tree bases of the anyons in a state
+
+        Parameters:
+        - state (State): The state of the system containing the anyons
+        - model (Model): Model providing the fusion rules and F symbols
+        """
+        self.state = state
+        self.model = model
+        self._leaf_charges = tuple(model._charge_index(anyon.charge.to_string().lower()) for anyon in state.anyons)
+
+        # [F^{abc}_d]^-1 for every index tuple, pseudo-inverted since F is zero
+        # outside the allowed fusion channels
+        self._f_symbols = np.asarray(model._f_symbols, dtype=complex)
+        self._f_inv_symbols = np.linalg.pinv(self._f_symbols)
+
+    def shape(self, basis: Basis) -> Shape:
+        """
+        Returns the tree shape of a basis of the state's anyons
+        """
+        num_anyons = len(self._leaf_charges)
+        if not basis.verify_basis(num_anyons):
+            raise ValueError('Invalid basis')
+        return tree_shape(basis, num_anyons)
+
+    def plan(self, source: Basis, target: Basis) -> List[FMove]:
+        """
+        Returns a minimal sequence of F-moves from the source basis to the
+        target basis, as (path, inverse) tuples
+        """
+        return list(shortest_f_moves(self.shape(source), self.shape(target)))
+
+    def labellings(self, shape: Shape, total_charge: Optional[Union[int, str]] = None) -> List[tuple]:
+        """
+        Returns every labelling of a tree shape allowed by the fusion rules.
+        Leaves are labelled by their anyon's charge index and internal nodes
+        are (charge, left, right) tuples. The order of the list is the order
+        of the basis used by basis_change
+        """
+        rules = self.model._rules
+
+        def visit(node: Shape) -> List[tuple]:
+            if isinstance(node, int):
+                return [self._leaf_charges[node]]
+            labelled = []
+            for left in visit(node[0]):
+                for right in visit(node[1]):
+                    for c in np.flatnonzero(rules[_charge(left), _charge(right)]):
+                        labelled.append((int(c), left, right))
+            return labelled
+
+        labelled = visit(shape)
+        if total_charge is not None:
+            total_charge = self.model._charge_index(total_charge)
+            labelled = [tree for tree in labelled if _charge(tree) == total_charge]
+        return labelled
+
+    def _f_move_matrix(self, labelled: List[tuple], move: FMove) -> Tuple[sp.csr_matrix, List[tuple]]:
+        """
+        Builds the sparse matrix of one F-move from the basis of labellings of
+        a shape to the basis of the rotated shape, along with the new labellings
+        """
+        path, inverse = move
+        rows, columns, values = [], [], []
+        rotated_index: Dict[tuple, int] = {}
+
+        for column, tree in enumerate(labelled):
+            for rotated, amplitude in self._rotate(tree, path, inverse):
+                rows.append(rotated_index.setdefault(rotated, len(rotated_index)))
+                columns.append(column)
+                values.append(amplitude)
+
+        matrix = sp.csr_matrix((values, (rows, columns)), shape=(len(rotated_index), len(labelled)))
+        return matrix, list(rotated_index)
+
+    def _rotate(self, tree: tuple, path: Tuple[int, ...], inverse: bool):
+        """
+        Yields the labelled trees that one F-move takes a labelled tree to,
+        with their amplitudes
+        """
+        if path:
+            d, left, right = tree
+            for rotated, amplitude in self._rotate(tree[1 + path[0]], path[1:], inverse):
+                yield ((d, rotated, right) if path[0] == 0 else (d, left, rotated)), amplitude
+            return
+
+        rules = self.model._rules
+        if not inverse:
+            # |((a b)_e c)_d> = sum_f [F^{abc}_d]_{ef} |(a (b c)_f)_d>
+            d, (e, a, b), c = tree
+            column = self._f_symbols[_charge(a), _charge(b), _charge(c), d, e]
+            for f in np.flatnonzero(rules[_charge(b), _charge(c)]):
+                if column[f] != 0 and rules[_charge(a), f, d]:
+                    yield (d, a, (int(f), b, c)), column[f]
+        else:
+            # |(a (b c)_f)_d> = sum_e [(F^{abc}_d)^-1]_{fe} |((a b)_e c)_d>
+            d, a, (f, b, c) = tree
+            row = self._f_inv_symbols[_charge(a), _charge(b), _charge(c), d, f]
+            for e in np.flatnonzero(rules[_charge(a), _charge(b)]):
+                if row[e] != 0 and rules[e, _charge(c), d]:
+                    yield (d, (int(e), a, b), c), row[e]
+
+    def basis_change(
+        self, source: Basis, target: Basis, total_charge: Optional[Union[int, str]] = None
+    ) -> Tuple[sp.csr_matrix, List[tuple], List[tuple]]:
+        """
+        Builds the operator taking amplitudes in the source basis to amplitudes
+        in the target basis, as the sparse product of a minimal sequence of
+        F-moves
+
+        Parameters:
+        - source (Basis): Basis the amplitudes are given in
+        - target (Basis): Basis to change to
+        - total_charge (int or str): Only build the operator on this total charge sector
+
+        Returns:
+        - The operator, and the labellings indexing its columns and rows
+        """
+        source_shape = self.shape(source)
+        labelled = self.labellings(source_shape, total_charge)
+        source_labelled = labelled
+
+        operator = sp.identity(len(labelled), dtype=complex, format='csr')
+        for move in shortest_f_moves(source_shape, self.shape(target)):
+            matrix, labelled = self._f_move_matrix(labelled, move)
+            operator = matrix @ operator
+
+        # Order the rows like labellings of the target shape. Labellings no
+        # move reaches have zero amplitude
+        target_labelled = self.labellings(self.shape(target), total_charge)
+        order = {tree: i for i, tree in enumerate(labelled)}
+        rows = [i for i, tree in enumerate(target_labelled) if tree in order]
+        permutation = sp.csr_matrix(
+            (np.ones(len(rows)), (rows, [order[target_labelled[i]] for i in rows])),
+            shape=(len(target_labelled), len(labelled)),
+        )
+        operator = permutation @ operator
+
+        return operator, source_labelled, target_labelled
+
+
+def _charge(tree: Union[int, tuple]) -> int:
+    """
+    The charge at the root of a labelled tree
+    """
+    return tree if isinstance(tree, int) else tree[0]
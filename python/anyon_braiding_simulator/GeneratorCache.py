@@ -0,0 +1,107 @@
+# Standard Library
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from anyon_braiding_simulator import AnyonModel, FusionPair
+from Model import Model
+
+
+def register_signature(model: Model, charges: Sequence[str], operations: Sequence[Tuple[int, FusionPair]]) -> str:
+    """
+    Hashes what the braid generators of a register depend on: the model, the
+    charge of each anyon in order and the fusion operations of the basis.
+    Custom models also hash their F and R symbols, since they are not fixed
+    by the model type
+    """
+    basis = tuple((time, op.anyon_1, op.anyon_2) for time, op in operations)
+    digest = hashlib.sha256(repr((str(model.get_model_type()), tuple(charges), basis)).encode())
+    if model.get_model_type() == AnyonModel.Custom:
+        for table in (model._f_symbols, model._r_symbols):
+            digest.update(np.ascontiguousarray(table).tobytes())
+    return digest.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    """
+    The memory held by a dense or sparse matrix
+    """
+    if sp.issparse(value):
+        value = value.tocsr()
+        return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    return np.asarray(value).nbytes
+
+
+class GeneratorCache:
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        """
+        Least recently used cache of braid generator matrices, bounded by the
+        memory of the matrices it holds. Matrices are made read-only since they
+        are shared by every braid with the same signature, sparse ones by
+        freezing the arrays of their CSR form
+
+        Parameters:
+        - max_bytes (int): Memory the cached matrices may use, 256 MiB by default
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Returns the matrix cached under a key, building and caching it on a
+        miss. Matrices larger than max_bytes are returned without being cached
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+        self.misses += 1
+        value = build()
+        if sp.issparse(value):
+            # Canonical CSR is never sorted or deduplicated in place by later operations
+            value = value.tocsr()
+            value.sum_duplicates()
+            for array in (value.data, value.indices, value.indptr):
+                array.flags.writeable = False
+        elif isinstance(value, np.ndarray):
+            value.flags.writeable = False
+
+        size = _nbytes(value)
+        if size <= self.max_bytes:
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+        return value
+
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counts, the number of entries and their memory
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'nbytes': self.nbytes}
+
+    def clear(self) -> None:
+        """
+        Drops every entry and resets the counters
+        """
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+# Cache shared by every Braid that is not given its own
+generator_cache = GeneratorCache()
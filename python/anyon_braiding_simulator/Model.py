@@ -1,15 +1,91 @@
 # Standard Library
 import cmath
+import numbers
+import os
 from itertools import product
+from typing import Optional, Tuple, Union
 
 import numpy as np
 from anyon_braiding_simulator import AnyonModel
 
 
+def _admissible_f_symbols(rules: np.ndarray) -> np.ndarray:
+    """
+    Returns the F symbols [F^{abc}_d]_{ef} that are 1 wherever all four fusion
+    vertices a x b -> e, e x c -> d, b x c -> f and a x f -> d are allowed
+    """
+    allowed = rules > 0
+    return np.einsum('abe,ecd,bcf,afd->abcdef', allowed, allowed, allowed, allowed).astype(float)
+
+
+def _ising_symbols() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fusion multiplicities, F symbols and R symbols of the Ising model, indexed
+    (vacuum, sigma, psi), in the gauge where R^{sigma sigma} matches _r_mtx
+    """
+    vacuum, sigma, psi = 0, 1, 2
+
+    rules = np.zeros((3, 3, 3), dtype=np.int64)
+    for a in range(3):
+        rules[vacuum, a, a] = rules[a, vacuum, a] = 1
+    rules[sigma, sigma, vacuum] = rules[sigma, sigma, psi] = 1
+    rules[sigma, psi, sigma] = rules[psi, sigma, sigma] = 1
+    rules[psi, psi, vacuum] = 1
+
+    f_symbols = _admissible_f_symbols(rules)
+    hadamard = 1 / np.sqrt(2) * np.array([[1, 1], [1, -1]])
+    f_symbols[sigma, sigma, sigma, sigma][np.ix_([vacuum, psi], [vacuum, psi])] = hadamard
+    f_symbols[sigma, psi, sigma, psi, sigma, sigma] = -1
+    f_symbols[psi, sigma, psi, sigma, sigma, sigma] = -1
+
+    r_symbols = rules.astype(complex)
+    r_symbols[sigma, sigma, vacuum] = cmath.exp(-1j * np.pi / 8)
+    r_symbols[sigma, sigma, psi] = cmath.exp(3j * np.pi / 8)
+    r_symbols[sigma, psi, sigma] = r_symbols[psi, sigma, sigma] = -1j
+    r_symbols[psi, psi, vacuum] = -1
+
+    return rules, f_symbols, r_symbols
+
+
+def _fibonacci_symbols() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fusion multiplicities, F symbols and R symbols of the Fibonacci model,
+    indexed (vacuum, tau), with the same chirality as _r_mtx
+    """
+    vacuum, tau = 0, 1
+
+    rules = np.zeros((2, 2, 2), dtype=np.int64)
+    rules[vacuum, vacuum, vacuum] = rules[vacuum, tau, tau] = rules[tau, vacuum, tau] = 1
+    rules[tau, tau, vacuum] = rules[tau, tau, tau] = 1
+
+    phi = (1 + np.sqrt(5)) / 2
+    f_symbols = _admissible_f_symbols(rules)
+    f_symbols[tau, tau, tau, tau] = np.array([[1 / phi, 1 / np.sqrt(phi)], [1 / np.sqrt(phi), -1 / phi]])
+
+    r_symbols = rules.astype(complex)
+    r_symbols[tau, tau, vacuum] = cmath.exp(4j * np.pi / 5)
+    r_symbols[tau, tau, tau] = -1 * cmath.exp(2j * np.pi / 5)
+
+    return rules, f_symbols, r_symbols
+
+
 class Model:
-    def __init__(self, model_type: AnyonModel, num_fusion_channels=5) -> None:
+    def __init__(
+        self,
+        model_type: AnyonModel,
+        num_fusion_channels=5,
+        symbol_path: Optional[str] = None,
+        check_symbols: bool = False,
+    ) -> None:
         """
-        Requires: 'model_type' representing the type of model being used
+        Requires: 'model_type' representing the type of model being used, and
+        'symbol_path' when the model is Custom (see _load_symbols for the layout)
+
+        'check_symbols' runs check_consistency on the symbol tables and raises
+        ValueError if they violate the pentagon or hexagon equations, or if
+        the F and R matrices served to braids disagree with them. The check
+        grows as r^9 for r charges, so it is off by default and meant for
+        validating a new custom model once
 
         The Ising, Fibonacci, and Custom models correspond to 1, 2, an 3 respectively
 
@@ -24,6 +100,11 @@ class Model:
             1 = sigma
             2 = psi
 
+        The F^-1 and F^-1RF matrices of every index tuple are computed once,
+        on the first lookup that needs them, and stored as read-only arrays
+        like the F matrices, so lookups never allocate and loading a custom
+        model stays cheap
+
         For details on notation, c.f.r. On classification of modular tensor
         categories by Rowell, Stong, and Wang
         https://www.arxiv.org/abs/0712.1377
@@ -32,7 +113,10 @@ class Model:
 
         if model_type == AnyonModel.Ising:
             self._charges = {'vacuum', 'sigma', 'psi'}
+            self._charge_indices = {'vacuum': 0, 'sigma': 1, 'psi': 2}
             self._r_mtx = cmath.exp(-1j * np.pi / 8) * np.array([[1, 0], [0, 1j]])
+            # Qubits are the (vacuum, psi) fusion channels of sigma x sigma
+            self._qubit_charge, self._qubit_channels = 1, [0, 2]
 
             self._f_mtx = np.zeros((3, 3, 3, 3, 2, 2))
 
@@ -44,21 +128,295 @@ class Model:
                 self._f_mtx[2][1][1][i] = self._f_mtx[1][2][1][i] = self._f_mtx[1][1][2][i] = -1 * np.identity(2)
                 self._f_mtx[1][2][2][i] = self._f_mtx[2][1][2][i] = self._f_mtx[2][2][1][i] = -1 * np.identity(2)
 
-            self._rules = []
+            self._rules, self._f_symbols, self._r_symbols = _ising_symbols()
 
         elif model_type == AnyonModel.Fibonacci:
             self._charges = {'vacuum', 'psi'}
+            # The charge is tau, and the names 'psi' and 'sigma' are kept for older callers
+            self._charge_indices = {'vacuum': 0, 'tau': 1, 'psi': 1, 'sigma': 1}
             self._r_mtx = np.array([[cmath.exp(4 * np.pi * 1j / 5), 0], [0, -1 * cmath.exp(2 * np.pi * 1j / 5)]])
-            self._f_mtx = []
-            self._rules = []
+            # Qubits are the (vacuum, tau) fusion channels of tau x tau
+            self._qubit_charge, self._qubit_channels = 1, [0, 1]
+
+            self._f_mtx = np.zeros((2, 2, 2, 2, 2, 2))
+
+            for w, x, y, z in product(range(2), repeat=4):
+                self._f_mtx[w][x][y][z] = np.identity(2)
+
+            phi = (1 + np.sqrt(5)) / 2
+            self._f_mtx[1][1][1][1] = np.array([[1 / phi, 1 / np.sqrt(phi)], [1 / np.sqrt(phi), -1 / phi]])
+
+            self._rules, self._f_symbols, self._r_symbols = _fibonacci_symbols()
+
         elif model_type == AnyonModel.Custom:
-            raise NotImplementedError('Custom Models not yet implemented')
+            if symbol_path is None:
+                raise ValueError('Custom models require a symbol_path')
+            self._load_symbols(symbol_path)
 
         else:
             raise ValueError('Model type not recognized')
 
         self._num_fusion_channels = num_fusion_channels
 
+        self._precompute_tables()
+
+        if check_symbols:
+            report = self.check_consistency()
+            if not report['consistent']:
+                raise ValueError(
+                    'Symbols are inconsistent: pentagon residual {:.3g}, hexagon residual {:.3g}, '
+                    'served residual {:.3g}'.format(
+                        report['pentagon_residual'], report['hexagon_residual'], report['served_residual']
+                    )
+                )
+
+    def _load_symbols(self, path: str) -> None:
+        """
+        Loads a custom model from either a directory of .npy files, which are
+        memory-mapped read-only so large models open without reading the
+        tables and share pages between processes, or a single .npz archive,
+        which is read eagerly. With r charges the files are:
+
+            charges.npy       (r,) charge names, in index order
+            fusion_rules.npy  (r, r, r) fusion multiplicities N_ab^c
+            f_symbols.npy     (r, r, r, r, r, r) F symbols [F^{abc}_d]_{ef}
+            r_symbols.npy     (r, r, r) R symbols R^{ab}_c
+            f_inv.npy         optional precomputed F^-1, written by save_symbols
+            finvrf.npy        optional precomputed F^-1RF, written by save_symbols
+        """
+        if os.path.isdir(path):
+            tables = {}
+            for name in ('charges', 'fusion_rules', 'f_symbols', 'r_symbols', 'f_inv', 'finvrf'):
+                file = os.path.join(path, f'{name}.npy')
+                if os.path.exists(file):
+                    tables[name] = np.load(file, mmap_mode='r')
+        elif path.endswith('.npz'):
+            with np.load(path) as archive:
+                tables = {name: archive[name] for name in archive.files}
+        else:
+            raise ValueError('symbol_path must be a directory of .npy files or a .npz archive')
+
+        missing = {'charges', 'fusion_rules', 'f_symbols', 'r_symbols'} - tables.keys()
+        if missing:
+            raise ValueError(f'Missing symbol tables: {", ".join(sorted(missing))}')
+
+        charges = [str(charge) for charge in tables['charges']]
+        num_charges = len(charges)
+        if tables['fusion_rules'].shape != (num_charges,) * 3:
+            raise ValueError('fusion_rules must have shape (r, r, r)')
+        if tables['f_symbols'].shape != (num_charges,) * 6:
+            raise ValueError('f_symbols must have shape (r, r, r, r, r, r)')
+        if tables['r_symbols'].shape != (num_charges,) * 3:
+            raise ValueError('r_symbols must have shape (r, r, r)')
+        if (np.asarray(tables['fusion_rules']) < 0).any():
+            raise ValueError('Fusion multiplicities must be non-negative')
+
+        self._charges = set(charges)
+        self._charge_indices = {charge: i for i, charge in enumerate(charges)}
+        self._rules = np.ascontiguousarray(tables['fusion_rules'], dtype=np.int64)
+        self._f_mtx = tables['f_symbols']
+        self._f_symbols = self._f_mtx
+        self._r_symbols = tables['r_symbols']
+        self._r_mtx = None
+
+        # R^{ab} acts diagonally on the fusion channel c
+        self._r_table = np.zeros((num_charges,) * 4, dtype=complex)
+        channels = np.arange(num_charges)
+        self._r_table[:, :, channels, channels] = self._r_symbols
+
+        self._f_inv = tables.get('f_inv')
+        self._finvrf = tables.get('finvrf')
+
+    def check_consistency(self, tol: float = 1e-9) -> dict:
+        """
+        Checks the pentagon and hexagon equations over every index tuple of the
+        F symbols [F^{abc}_d]_{ef} and R symbols R^{ab}_c, with each side
+        evaluated as a batched einsum contraction. Symbols outside the allowed
+        fusion channels must be zero. The pentagon is evaluated one value of
+        its first index at a time, so memory grows as r^8 rather than r^9
+
+        Custom models serve their symbols directly. The built in models serve
+        2x2 F and R matrices over the qubit channels, which are compared with
+        the symbols they are blocks of
+
+        Returns
+        -------
+        a dict with the maximum absolute residual of each family of equations
+        and of the served matrices, the index tuples whose residual exceeds
+        tol as (M, 9) pentagon rows (a, b, c, d, e, f, g, k, l) and (M, 6)
+        hexagon rows (a, b, c, d, e, g), and whether the symbols are consistent
+        """
+        f_symbols = np.asarray(self._f_symbols, dtype=complex)
+        r_symbols = np.asarray(self._r_symbols, dtype=complex)
+
+        # [F^{fcd}_e]_{gl} [F^{abl}_e]_{fk} = sum_h [F^{abc}_g]_{fh} [F^{ahd}_e]_{gk} [F^{bcd}_k]_{hl}
+        pentagon_residual = 0.0
+        pentagon_violations = []
+        for a, f_a in enumerate(f_symbols):
+            lhs = np.einsum('fcdegl,blefk->bcdefgkl', f_symbols, f_a, optimize=True)
+            rhs = np.einsum('bcgfh,hdegk,bcdkhl->bcdefgkl', f_a, f_a, f_symbols, optimize=True)
+            residual = np.abs(lhs - rhs)
+            pentagon_residual = max(pentagon_residual, float(residual.max()))
+            violations = np.argwhere(residual > tol)
+            pentagon_violations.append(np.insert(violations, 0, a, axis=1))
+
+        # R^{ca}_e [F^{acb}_d]_{eg} R^{cb}_g = sum_f [F^{cab}_d]_{ef} R^{cf}_d [F^{abc}_d]_{fg},
+        # and the same with every R replaced by its inverse
+        allowed = r_symbols != 0
+        r_inverse = np.divide(1, r_symbols, out=np.zeros_like(r_symbols), where=allowed)
+        hexagon_residual = np.zeros(f_symbols.shape[:6])
+        for r in (r_symbols, r_inverse):
+            lhs = np.einsum('cae,acbdeg,cbg->abcdeg', r, f_symbols, r, optimize=True)
+            rhs = np.einsum('cabdef,cfd,abcdfg->abcdeg', f_symbols, r, f_symbols, optimize=True)
+            hexagon_residual = np.maximum(hexagon_residual, np.abs(lhs - rhs))
+
+        # F^{qqq}_q and R^{qq} restricted to the qubit channels are the only
+        # served blocks that act on qubits
+        served_residual = 0.0
+        if self.model_type != AnyonModel.Custom:
+            q, channels = self._qubit_charge, self._qubit_channels
+            served_f = f_symbols[q, q, q, q][np.ix_(channels, channels)]
+            served_r = np.diag(r_symbols[q, q, channels])
+            served_residual = max(
+                float(np.abs(self._f_mtx[q, q, q, q] - served_f).max()),
+                float(np.abs(self._r_mtx - served_r).max()),
+            )
+
+        pentagon_violations = np.concatenate(pentagon_violations)
+        hexagon_violations = np.argwhere(hexagon_residual > tol)
+        return {
+            'pentagon_residual': pentagon_residual,
+            'hexagon_residual': float(hexagon_residual.max()),
+            'served_residual': served_residual,
+            'pentagon_violations': pentagon_violations,
+            'hexagon_violations': hexagon_violations,
+            'consistent': len(pentagon_violations) == 0 and len(hexagon_violations) == 0 and served_residual <= tol,
+        }
+
+    def save_symbols(self, path: str) -> None:
+        """
+        Writes a custom model in the layout read by _load_symbols, including
+        the precomputed F^-1 and F^-1RF tables so that reloading is instant.
+        Paths ending in .npz are written as a single archive
+        """
+        if self.model_type != AnyonModel.Custom:
+            raise ValueError('Only custom models can be saved')
+
+        charges = sorted(self._charge_indices, key=self._charge_indices.get)
+        tables = {
+            'charges': np.array(charges),
+            'fusion_rules': self._rules,
+            'f_symbols': self._f_mtx,
+            'r_symbols': self._r_symbols,
+            'f_inv': self._f_inv_mtx,
+            'finvrf': self._finvrf_mtx,
+        }
+
+        if path.endswith('.npz'):
+            np.savez(path, **tables)
+        else:
+            os.makedirs(path, exist_ok=True)
+            for name, table in tables.items():
+                np.save(os.path.join(path, f'{name}.npy'), table)
+
+    def _precompute_tables(self) -> None:
+        """
+        Makes the F table contiguous and marks all symbol tables read-only,
+        since lookups return views into them. The F^-1 and F^-1RF tables are
+        built when first looked up, unless they were loaded from disk
+        """
+        self._f_mtx = np.ascontiguousarray(self._f_mtx)
+        num_charges = self._f_mtx.shape[0]
+
+        if self.model_type != AnyonModel.Custom:
+            # R does not depend on the braided charges in these models, so the
+            # per-pair table is a broadcast view of the single R matrix
+            self._r_mtx = np.ascontiguousarray(self._r_mtx)
+            self._r_table = np.broadcast_to(self._r_mtx, (num_charges, num_charges) + self._r_mtx.shape)
+            self._f_inv = self._finvrf = None
+
+        tables = (self._f_mtx, self._r_mtx, self._r_table, self._f_inv, self._finvrf)
+        for table in tables + (self._rules, self._f_symbols, self._r_symbols):
+            if table is not None and table.flags.writeable:
+                table.flags.writeable = False
+
+    @property
+    def _f_inv_mtx(self) -> np.ndarray:
+        """
+        Read-only table of F^-1 over every index tuple, built on first use
+        unless it was loaded from disk
+        """
+        if self._f_inv is None:
+            # Batched over the four leading index axes. Custom F matrices are
+            # zero outside the allowed fusion channels, so they are pseudo-inverted
+            if self.model_type == AnyonModel.Custom:
+                self._f_inv = np.linalg.pinv(self._f_mtx)
+            else:
+                self._f_inv = np.linalg.inv(self._f_mtx)
+            self._f_inv.flags.writeable = False
+        return self._f_inv
+
+    @property
+    def _finvrf_mtx(self) -> np.ndarray:
+        """
+        Read-only table of F^-1RF over every index tuple, built on first use
+        unless it was loaded from disk
+        """
+        if self._finvrf is None:
+            # R^{bc} braids the second and third anyons of F^{abc}_d
+            self._finvrf = self._f_inv_mtx @ self._r_table[np.newaxis, :, :, np.newaxis] @ self._f_mtx
+            self._finvrf.flags.writeable = False
+        return self._finvrf
+
+    def _charge_index(self, charge: Union[int, str]) -> int:
+        """
+        Converts a charge name or integer charge index to an index into the
+        symbol tables
+        """
+        if isinstance(charge, str):
+            if charge not in self._charge_indices:
+                raise ValueError('invalid anyon name')
+            return self._charge_indices[charge]
+
+        # bool is an Integral too, but True is not a charge
+        if not isinstance(charge, numbers.Integral) or isinstance(charge, (bool, np.bool_)):
+            raise ValueError('invalid anyon index')
+        index = int(charge)
+        if not 0 <= index < self._f_mtx.shape[0]:
+            raise ValueError('invalid anyon index')
+        return index
+
+    def _batch_index(self, indices, columns: Tuple[Optional[np.ndarray], ...]) -> Tuple[np.ndarray, ...]:
+        """
+        Converts either an (N, k) array of integer charge indices, or k
+        broadcastable integer arrays, to k index arrays into the symbol tables
+        """
+        if all(column is None for column in columns):
+            indices = np.asarray(indices)
+            if indices.ndim != 2 or indices.shape[1] != len(columns) + 1:
+                raise ValueError(f'Expected an (N, {len(columns) + 1}) array of charge indices')
+            columns = tuple(indices[:, i] for i in range(indices.shape[1]))
+        elif any(column is None for column in columns):
+            raise ValueError('Either pass one (N, k) array or one array per index')
+        else:
+            columns = np.broadcast_arrays(indices, *columns)
+
+        num_charges = self._f_mtx.shape[0]
+        for column in columns:
+            # bool arrays are not an integer dtype, so they are rejected here as well
+            if not np.issubdtype(column.dtype, np.integer):
+                raise ValueError('Batch lookups require integer charge indices')
+            if column.size and (column.min() < 0 or column.max() >= num_charges):
+                raise ValueError('invalid anyon index')
+
+        return tuple(columns)
+
+    def _f_index(self, a, b, c, d) -> tuple:
+        """
+        Converts the four F-symbol labels to an index tuple into the symbol tables
+        """
+        return (self._charge_index(a), self._charge_index(b), self._charge_index(c), self._charge_index(d))
+
     def get_model_type(self) -> AnyonModel:
         """
         Provides the model type
@@ -71,21 +429,21 @@ class Model:
         """
         return self._charges
 
-    def getFMatrix(self, a: str, b: str, c: str, d: str) -> np.ndarray:
+    def getFMatrix(self, a: Union[int, str], b: Union[int, str], c: Union[int, str], d: Union[int, str]) -> np.ndarray:
         """
         Parameters
         ----------
-        a : str
-            name of anyon corresponding to first lower index
-        b : str
-            name of anyon corresponding to second lower index
-        c : str
-            name of anyon corresponding to third lower index
-        d : str
-            name of anyon corresponding to upper index
+        a : int or str
+            name or index of anyon corresponding to first lower index
+        b : int or str
+            name or index of anyon corresponding to second lower index
+        c : int or str
+            name or index of anyon corresponding to third lower index
+        d : int or str
+            name or index of anyon corresponding to upper index
 
         Only the following strings are accepted as parameters:
-        vacuum, sigma, psi
+        vacuum, sigma, psi (Ising) or vacuum, tau (Fibonacci)
 
         Requires that all anyons used as parameters are contained with the
         given model
@@ -96,47 +454,26 @@ class Model:
 
         Returns
         -------
-        the F-matrix corresponding to the set of indices in the model
+        a read-only view of the F-matrix corresponding to the set of indices in the model
         """
 
-        if self.model_type == AnyonModel.Ising:
-            anyondict = {'vacuum': 0, 'sigma': 1, 'psi': 2}
-
-        elif self.model_type == AnyonModel.Fibonacci:
-            anyondict = {
-                'vacuum': 0,
-                'sigma': 1,
-            }
-
-        elif self.model_type == AnyonModel.Custom:
-            raise NotImplementedError('Custom Models not yet implemented')
-
-        else:
-            raise ValueError('Model type not recognized')
-
-        inputs = {a, b, c, d}
-
-        for i in inputs:
-            if i not in anyondict:
-                raise ValueError('invalid anyon name')
+        return self._f_mtx[self._f_index(a, b, c, d)]
 
-        return self._f_mtx[anyondict[a]][anyondict[b]][anyondict[c]][anyondict[d]]
-
-    def getFInv(self, a: str, b: str, c: str, d: str) -> np.ndarray:
+    def getFInv(self, a: Union[int, str], b: Union[int, str], c: Union[int, str], d: Union[int, str]) -> np.ndarray:
         """
         Parameters
         ----------
-        a : str
-            name of anyon corresponding to first lower index
-        b : str
-            name of anyon corresponding to second lower index
-        c : str
-            name of anyon corresponding to third lower index
-        d : str
-            name of anyon corresponding to upper index
+        a : int or str
+            name or index of anyon corresponding to first lower index
+        b : int or str
+            name or index of anyon corresponding to second lower index
+        c : int or str
+            name or index of anyon corresponding to third lower index
+        d : int or str
+            name or index of anyon corresponding to upper index
 
         Only the following strings are accepted as parameters:
-        vacuum, sigma, psi
+        vacuum, sigma, psi (Ising) or vacuum, tau (Fibonacci)
 
         Requires that all anyons used as parameters are contained with the
         given model
@@ -147,26 +484,26 @@ class Model:
 
         Returns
         -------
-        the Inverse F-matrix corresponding to the set of indices in the model
+        a read-only view of the Inverse F-matrix corresponding to the set of indices in the model
         """
 
-        return np.linalg.inv(self.getFMatrix(a,b,c,d))
+        return self._f_inv_mtx[self._f_index(a, b, c, d)]
 
-    def getFInvRF(self, a: str, b: str, c: str, d: str) -> np.ndarray:
+    def getFInvRF(self, a: Union[int, str], b: Union[int, str], c: Union[int, str], d: Union[int, str]) -> np.ndarray:
         """
         Parameters
         ----------
-        a : str
-            name of anyon corresponding to first lower index
-        b : str
-            name of anyon corresponding to second lower index
-        c : str
-            name of anyon corresponding to third lower index
-        d : str
-            name of anyon corresponding to upper index
+        a : int or str
+            name or index of anyon corresponding to first lower index
+        b : int or str
+            name or index of anyon corresponding to second lower index
+        c : int or str
+            name or index of anyon corresponding to third lower index
+        d : int or str
+            name or index of anyon corresponding to upper index
 
         Only the following strings are accepted as parameters:
-        vacuum, sigma, psi
+        vacuum, sigma, psi (Ising) or vacuum, tau (Fibonacci)
 
         Requires that all anyons used as parameters are contained with the
         given model
@@ -177,7 +514,82 @@ class Model:
 
         Returns
         -------
-        the matrix product of (F^-1)RF corresponding to the set of indices in the model
+        a read-only view of the matrix product of (F^-1)RF corresponding to the set of indices in the model
+        """
+
+        return self._finvrf_mtx[self._f_index(a, b, c, d)]
+
+    def getRMatrix(self, a: Union[int, str], b: Union[int, str]) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        a : int or str
+            name or index of the first anyon being braided
+        b : int or str
+            name or index of the second anyon being braided
+
+        Returns
+        -------
+        a read-only view of the R-matrix for braiding the two anyons
+        """
+
+        return self._r_table[self._charge_index(a), self._charge_index(b)]
+
+    def getFMatrixBatch(self, a, b=None, c=None, d=None) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        a : array_like of int
+            indices of the first lower index, or an (N, 4) array holding all
+            four indices when b, c and d are omitted
+        b, c, d : array_like of int, optional
+            indices of the second and third lower index and the upper index
+
+        The index arrays are broadcast against each other
+
+        Returns
+        -------
+        the F-matrices stacked along the leading axes, of shape (N, k, k) for N
+        index tuples
+        """
+
+        return self._f_mtx[self._batch_index(a, (b, c, d))]
+
+    def getFInvBatch(self, a, b=None, c=None, d=None) -> np.ndarray:
+        """
+        Batch form of getFInv, taking the same arguments as getFMatrixBatch
+
+        Returns
+        -------
+        the Inverse F-matrices stacked along the leading axes
+        """
+
+        return self._f_inv_mtx[self._batch_index(a, (b, c, d))]
+
+    def getFInvRFBatch(self, a, b=None, c=None, d=None) -> np.ndarray:
+        """
+        Batch form of getFInvRF, taking the same arguments as getFMatrixBatch
+
+        Returns
+        -------
+        the (F^-1)RF products stacked along the leading axes
+        """
+
+        return self._finvrf_mtx[self._batch_index(a, (b, c, d))]
+
+    def getRMatrixBatch(self, a, b=None) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        a : array_like of int
+            indices of the first braided anyon, or an (N, 2) array holding both
+            indices when b is omitted
+        b : array_like of int, optional
+            indices of the second braided anyon
+
+        Returns
+        -------
+        the R-matrices stacked along the leading axes, of shape (N, k, k)
         """
 
-        return self.getFInv(a,b,c,d) @ self._r_mtx @ self.getFMatrix(a,b,c,d)
+        return self._r_table[self._batch_index(a, (b,))]
@@ -1,5 +1,6 @@
+import numpy as np
 from Model import Model
-from anyon_braiding_simulator import State
+from anyon_braiding_simulator import AnyonModel, State
 
 
 class Simulator:
@@ -8,7 +9,11 @@ class Simulator:
         Creates a the simulator. In order for the simulator to be function, the
         user must first initialize the model and anyons.
         """
+        # Anyons in index order, with their positions as rows of an array that
+        # grows geometrically and a name to index lookup
         self._anyons = []
+        self._positions = np.empty((0, 2), dtype=np.float64)
+        self._anyon_indices = {}
         self._fusion = None
         self._braid = None
         self._model = None
@@ -24,14 +29,46 @@ class Simulator:
         """
 
         if is_increasing:
-            # Check if any anyons are being added that are already in the simulator
-            for anyon in anyons:
-                for anyon_in_sim in self._anyons:
-                    if anyon_in_sim.name == anyon.name:
-                        raise ValueError('Anyon name is already in simulator')
-            self._anyons.extend(anyons)
+            self._add_anyons(anyons)
         else:
-            self._anyons = [anyon for anyon in self._anyons if anyon not in anyons]
+            self._remove_anyons(anyons)
+
+    def _add_anyons(self, anyons: list) -> None:
+        """
+        Appends anyons, checking every name before any anyon is added.
+        """
+        names = [anyon.name for anyon in anyons]
+        if len(set(names)) != len(names) or any(name in self._anyon_indices for name in names):
+            raise ValueError('Anyon name is already in simulator')
+
+        start = len(self._anyons)
+        end = start + len(anyons)
+        if end > len(self._positions):
+            positions = np.empty((max(end, 2 * len(self._positions)), 2), dtype=np.float64)
+            positions[:start] = self._positions[:start]
+            self._positions = positions
+        if anyons:
+            self._positions[start:end] = [anyon.position for anyon in anyons]
+
+        self._anyons.extend(anyons)
+        self._anyon_indices.update(zip(names, range(start, end)))
+
+    def _remove_anyons(self, anyons: list) -> None:
+        """
+        Removes anyons by name in one pass over the table, keeping the order of
+        the rest. Anyons that are not in the simulator are ignored.
+        """
+        removed = [self._anyon_indices[anyon.name] for anyon in anyons if anyon.name in self._anyon_indices]
+        if not removed:
+            return
+
+        keep = np.ones(len(self._anyons), dtype=bool)
+        keep[removed] = False
+        kept = np.flatnonzero(keep)
+
+        self._anyons = [self._anyons[i] for i in kept]
+        self._positions = self._positions[kept]
+        self._anyon_indices = {anyon.name: index for index, anyon in enumerate(self._anyons)}
 
     def set_model(self, model: Model) -> None:
         """
@@ -55,35 +92,52 @@ class Simulator:
     
     def get_state(self) -> State:
         """
-        Initializes the state of the simulator.
+        Initializes the state of the simulator. The anyons are loaded as whole
+        arrays of names, charge codes and positions in one call.
+        """
+        model_type = self._model.get_model_type() if self._model is not None else AnyonModel.Ising
+        if model_type == AnyonModel.Custom:
+            # Custom charges have no codes, so the anyons are added one at a time
+            state = State()
+            state.set_anyon_model(model_type)
+            for anyon in self._anyons:
+                state.add_anyon(anyon)
+            return state
+
+        names = list(self._anyon_indices)
+        charge_codes = np.array([self._charge_code(anyon, model_type) for anyon in self._anyons], dtype=np.int64)
+        positions = self._positions[: len(self._anyons)]
+        return State.from_arrays(names, charge_codes, positions, model_type)
+
+    def _charge_code(self, anyon, model_type: AnyonModel) -> int:
+        """
+        The value of an anyon's IsingTopoCharge or FibonacciTopoCharge.
         """
-        state = State()
-        for anyon in self._anyons:
-            state.add_anyon(anyon)
-        return state
+        charge = anyon.charge
+        if model_type == AnyonModel.Ising and charge.is_ising():
+            return int(charge.get_ising())
+        if model_type == AnyonModel.Fibonacci and charge.is_fibonacci():
+            return int(charge.get_fibonacci())
+        raise ValueError(f'Anyon {anyon.name} does not have a charge of the model')
         
     def pairs_to_indices(self, anyon_pairs: list) -> list:
         """
         Convert anyon names to indices and collect them in a list of tuples.
         """
-        anyon_indices = []
-        for anyon_A, anyon_B in anyon_pairs:
-            try:
-                index_1 = self.get_anyon_index(anyon_A)
-                index_2 = self.get_anyon_index(anyon_B)
-                anyon_indices.append((index_1, index_2))
-            except ValueError:
-                raise
-        return anyon_indices
+        indices = self._anyon_indices
+        try:
+            return [(indices[anyon_A], indices[anyon_B]) for anyon_A, anyon_B in anyon_pairs]
+        except KeyError as error:
+            raise ValueError(f'Anyon with name {error.args[0]} not found.') from None
 
     def get_anyon_index(self, anyon_name: str) -> int:
         """
         Get the index of two anyons from their names. 
         """
-        for index, anyon in enumerate(self._anyons):
-            if anyon.name == anyon_name:
-                return index
-        raise ValueError(f'Anyon with name {anyon_name} not found.')
+        try:
+            return self._anyon_indices[anyon_name]
+        except KeyError:
+            raise ValueError(f'Anyon with name {anyon_name} not found.') from None
 
     def get_dim_of_anyon_pos(self) -> int:
         """
@@ -101,6 +155,6 @@ class Simulator:
         """
         Check if the anyon is in the simulator.
         """
-        return anyon_name in [anyon.name for anyon in self._anyons]
+        return anyon_name in self._anyon_indices
 
     # waiting on other classes to be implemented
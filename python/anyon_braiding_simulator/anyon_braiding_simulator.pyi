@@ -1,5 +1,7 @@
 # Standard Library
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 class IsingTopoCharge:
     """
@@ -92,12 +94,38 @@ class Fusion:
     step and the inner vector represents the fusion operations that occur at
     that time step.
     """
-    def __init__(self, state: State) -> None: ...
+    def __init__(self, state: State, fusion_rules: Optional[np.ndarray] = None) -> None: ...
     def verify_basis(self, basis: Basis) -> bool: ...
+    def verify_bases(self, bases: np.ndarray) -> np.ndarray: ...
     def qubit_enc(self, anyon_model: AnyonModel) -> List[FusionPair]: ...
+    def qubit_index(self, anyon_1: int, anyon_2: int) -> Optional[int]: ...
+    def are_siblings(self, anyon_1: int, anyon_2: int) -> bool: ...
+    def separating_fusion(self, anyon_1: int, anyon_2: int) -> Optional[FusionPair]: ...
+    def separating_qubit(self, anyon_1: int, anyon_2: int) -> Optional[int]: ...
+    def f_move_distance(self, anyon_1: int, anyon_2: int) -> Optional[int]: ...
     def __str__(self) -> str: ...
-    def apply_fusion(self, anyon_1: List[int], anyon_2: List[int], anyon_model: AnyonModel) -> List[int]: ...
-    def verify_fusion_result(self, init_charge: TopoCharge, anyon_model: AnyonModel) -> bool: ...
+    def apply_fusion(self, anyon_1: List[int], anyon_2: List[int], mode: str = 'count') -> List[int]: ...
+    def apply_fusion_batch(self, anyon_1: np.ndarray, anyon_2: np.ndarray) -> np.ndarray: ...
+    def verify_fusion_result(self, init_charge: TopoCharge, mode: str = 'support') -> bool: ...
+    def minimum_possible_anyons(self, qubits: int) -> List[int]: ...
+    def fusion_space_dimensions(self, counts: Optional[List[int]] = None) -> List[int]: ...
+    def fusion_trees(self, total_charge: Optional[TopoCharge] = None) -> 'FusionTrees': ...
+
+class FusionTrees:
+    """
+    The basis of labelled fusion trees of a state. Each basis element is the
+    list of internal charges produced by the state's fusion operations, in time
+    order. Elements are generated lazily and can be converted to and from their
+    index in the basis, so amplitudes can be addressed without building the
+    basis.
+    """
+
+    dimension: int
+
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[List[int]]: ...
+    def rank(self, tree: List[int]) -> int: ...
+    def unrank(self, index: int) -> List[int]: ...
 
 class State:
     """
@@ -106,12 +134,17 @@ class State:
     statevector).
     """
 
-    anyons: List[Anyon]
-    operations: List[Tuple[int, FusionPair]]
+    anyons: Tuple[Anyon, ...]
+    operations: Tuple[Tuple[int, FusionPair], ...]
 
     def __init__(self) -> None: ...
+    @staticmethod
+    def from_arrays(
+        names: Sequence[str], charge_codes: np.ndarray, positions: np.ndarray, model: AnyonModel
+    ) -> 'State': ...
     def add_anyon(self, anyon: Anyon) -> bool: ...
     def add_operation(self, time: int, operation: FusionPair) -> bool: ...
+    def add_operations(self, times: np.ndarray, pairs: np.ndarray) -> np.ndarray: ...
 
 class Basis:
     """
@@ -119,5 +152,26 @@ class Basis:
     the basis is a sequence of fusion operations that occur in the fusion tree,
     and a different fusion ordering is a different basis.
     """
+
+    ops: List[Tuple[int, FusionPair]]
+
     def __init__(self, ops: List[Tuple[int, FusionPair]]) -> None: ...
     def verify_basis(self, anyons: int) -> bool: ...
+
+class StateVec:
+    """
+    State Vector for the system. The amplitudes live in a NumPy array that is
+    allocated by Rust and shared with Python without copying, so reading `vec`
+    returns a writable view of the register rather than a copy of it.
+    """
+
+    vec: np.ndarray
+    init_size: int
+
+    def __init__(self, qubit_num: int, vec: Optional[np.ndarray]) -> None: ...
+    @staticmethod
+    def from_numpy(vec: np.ndarray, copy: bool = True) -> 'StateVec': ...
+    def copy(self) -> 'StateVec': ...
+    def apply_single_qubit(self, matrix: np.ndarray, target: int) -> None: ...
+    def apply_two_qubit(self, matrix: np.ndarray, target_1: int, target_2: int) -> None: ...
+    def __str__(self) -> str: ...
@@ -140,6 +140,14 @@ def braid(*args):
 
         # Perform the swap operations
         braid.swap(anyon_indices)
+    elif cmd.lower() == 'undo' or cmd.lower() == 'redo':
+        # Undo or redo the last time step of swaps
+        try:
+            layer = braid.undo() if cmd.lower() == 'undo' else braid.redo()
+        except ValueError as error:
+            print(f'Error: {error}')
+            return
+        print(f'\n{cmd.capitalize()}: {" ".join(f"({index_A} {index_B})" for index_A, index_B in layer)}')
     elif cmd.lower() == 'print':
         print(braid)
     else:
@@ -156,7 +164,7 @@ class SimulatorShell(cmd.Cmd):
         self.command_options = {
             'anyon': 'anyon <name> <topological charge> <{x,y} coords>',
             'model': 'model <Ising or Fibonacci>',
-            'braid': 'braid anyon_name_1-anyon_name_2 ...',
+            'braid': 'braid swap anyon_name_1-anyon_name_2 ..., braid undo, braid redo or braid print',
             'list': 'list',
         }
 
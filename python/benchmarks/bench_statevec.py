@@ -0,0 +1,119 @@
+"""
+Compares the native StateVec gate kernels against the equivalent NumPy
+reshape/einsum path.
+
+Run with e.g. `python python/benchmarks/bench_statevec.py --min-qubits 10 --max-qubits 28`.
+A 28 qubit register needs 4 GiB per copy of the amplitudes, and the NumPy path
+needs a second temporary copy.
+
+With `--threads N` it also times N registers updated one after another
+against the same registers updated from N Python threads. The kernels release
+the GIL, so the threaded run should take close to 1/N of the time for
+registers small enough that each kernel runs on a single rayon worker.
+"""
+
+# Standard Library
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from anyon_braiding_simulator import StateVec
+
+HADAMARD = (1 / np.sqrt(2) * np.array([[1, 1], [1, -1]])).astype(complex)
+CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+
+
+def numpy_single_qubit(amps: np.ndarray, gate: np.ndarray, target: int) -> np.ndarray:
+    """
+    Applies a 2x2 gate to the target qubit through a strided reshape
+    """
+    view = amps.reshape(2**target, 2, -1)
+    return np.einsum('ij,ajb->aib', gate, view).reshape(-1)
+
+
+def numpy_two_qubit(amps: np.ndarray, gate: np.ndarray, target_1: int, target_2: int, num_qubits: int) -> np.ndarray:
+    """
+    Applies a 4x4 gate to two target qubits by contracting the qubit tensor
+    """
+    tensor = amps.reshape((2,) * num_qubits)
+    tensor = np.tensordot(gate.reshape(2, 2, 2, 2), tensor, axes=([2, 3], [target_1, target_2]))
+    return np.moveaxis(tensor, [0, 1], [target_1, target_2]).reshape(-1)
+
+
+def best_of(repeats: int, fn) -> float:
+    """
+    Returns the fastest wall clock time of fn over a number of repeats
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def threaded_overlap(num_qubits: int, num_threads: int, calls: int, repeats: int) -> tuple:
+    """
+    Returns the time to apply a gate many times to each of several registers
+    one after another, and from one Python thread per register
+    """
+    registers = [StateVec(num_qubits, None) for _ in range(num_threads)]
+    target = num_qubits // 2
+
+    def run(state_vec):
+        for _ in range(calls):
+            state_vec.apply_single_qubit(HADAMARD, target)
+
+    def sequential():
+        for state_vec in registers:
+            run(state_vec)
+
+    def threaded():
+        with ThreadPoolExecutor(num_threads) as pool:
+            list(pool.map(run, registers))
+
+    return best_of(repeats, sequential), best_of(repeats, threaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--min-qubits', type=int, default=10)
+    parser.add_argument('--max-qubits', type=int, default=28)
+    parser.add_argument('--step', type=int, default=2)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--thread-qubits', type=int, default=12)
+    parser.add_argument('--thread-calls', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f'{"qubits":>6} {"kernel":>10} {"native (s)":>12} {"numpy (s)":>12} {"speedup":>8}')
+    for num_qubits in range(args.min_qubits, args.max_qubits + 1, args.step):
+        state_vec = StateVec(num_qubits, None)
+        amps = np.zeros(2**num_qubits, dtype=complex)
+        amps[0] = 1
+
+        # Target the middle qubits so neither the innermost nor outermost axis is favoured
+        target_1 = num_qubits // 2
+        target_2 = num_qubits // 2 - 1
+
+        native = best_of(args.repeats, lambda sv=state_vec: sv.apply_single_qubit(HADAMARD, target_1))
+        numpy = best_of(args.repeats, lambda a=amps: numpy_single_qubit(a, HADAMARD, target_1))
+        print(f'{num_qubits:>6} {"1-qubit":>10} {native:>12.5f} {numpy:>12.5f} {numpy / native:>7.1f}x')
+
+        native = best_of(args.repeats, lambda sv=state_vec: sv.apply_two_qubit(CNOT, target_1, target_2))
+        numpy = best_of(args.repeats, lambda a=amps: numpy_two_qubit(a, CNOT, target_1, target_2, num_qubits))
+        print(f'{num_qubits:>6} {"2-qubit":>10} {native:>12.5f} {numpy:>12.5f} {numpy / native:>7.1f}x')
+
+        del state_vec, amps
+
+    if args.threads > 1:
+        sequential, threaded = threaded_overlap(args.thread_qubits, args.threads, args.thread_calls, args.repeats)
+        print(
+            f'{args.threads} registers of {args.thread_qubits} qubits: sequential {sequential:.5f} s, '
+            f'threaded {threaded:.5f} s, {sequential / threaded:.1f}x overlap'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'anyon_braiding_simulator')))
+
+from BraidWord import asap_layers, optimize_word, reduce_word, to_generator, to_swap
+
+
+def burau(word, num_anyons, t):
+    # The Burau representation, where sigma_k has eigenvalues 1 and -t
+    matrix = np.eye(num_anyons, dtype=complex)
+    for g in word:
+        k = abs(g) - 1
+        generator = np.eye(num_anyons, dtype=complex)
+        generator[k : k + 2, k : k + 2] = [[1 - t, t], [1, 0]]
+        matrix = matrix @ (generator if g > 0 else np.linalg.inv(generator))
+    return matrix
+
+
+def permutation(word, num_anyons):
+    order = list(range(num_anyons))
+    for g in word:
+        index_A, index_B = to_swap(g)
+        order[index_A], order[index_B] = order[index_B], order[index_A]
+    return order
+
+
+@pytest.mark.braiding
+def test_generators():
+    assert to_generator(0, 1) == 1
+    assert to_generator(3, 2) == -3
+    assert to_swap(1) == (0, 1)
+    assert to_swap(-3) == (3, 2)
+
+    with pytest.raises(ValueError):
+        to_generator(0, 2)
+
+
+@pytest.mark.braiding
+def test_reduce_word():
+    # Cancellation across commuting generators
+    assert reduce_word([1, 3, -1]) == [3]
+    assert reduce_word([1, 2, -1]) == [1, 2, -1]
+    assert reduce_word([1, 2, -2, -1]) == []
+
+    # Powers modulo the order, into the shortest exponent
+    assert reduce_word([1] * 16, 16) == []
+    assert reduce_word([1] * 13, 16) == [-1] * 3
+    assert reduce_word([1] * 13) == [1] * 13
+
+
+@pytest.mark.braiding
+def test_asap_layers():
+    assert asap_layers([1, 2, 3, 1]) == [[1], [2], [3, 1]]
+    assert asap_layers([1, 3, 5, 2, 4]) == [[1, 3, 5], [2, 4]]
+    assert asap_layers([]) == []
+
+
+@pytest.mark.braiding
+def test_optimize_word():
+    # Braid relations that expose a cancellation
+    assert optimize_word([2, 1, 2, -1]) == [1, 2]
+    assert optimize_word([-1, 2, 1, 2]) == [2, 1]
+
+    rng = np.random.default_rng(0)
+    t_generic, t_order_16 = 0.3 + 0.7j, -np.exp(2j * np.pi / 16)
+    for _ in range(300):
+        num_anyons = int(rng.integers(3, 7))
+        word = [int(g) for g in rng.choice([-1, 1], 30) * rng.integers(1, num_anyons, 30)]
+        # Pad with redundant inverse pairs and powers
+        for _ in range(5):
+            g = word[int(rng.integers(len(word)))]
+            position = int(rng.integers(len(word)))
+            word[position:position] = [g, -g] if rng.random() < 0.5 else [g] * int(rng.integers(2, 20))
+
+        for order, t in [(None, t_generic), (16, t_order_16)]:
+            optimized = optimize_word(word, order)
+            assert len(optimized) <= len(word)
+            assert np.allclose(burau(optimized, num_anyons, t), burau(word, num_anyons, t))
+            assert permutation(optimized, num_anyons) == permutation(word, num_anyons)
@@ -5,9 +5,10 @@ import numpy as np
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'anyon_braiding_simulator')))
 
-from Braiding import Braid
+from Braiding import Braid, BraidBatch
+from BraidWord import to_swap
 from Model import Model
-from anyon_braiding_simulator import Anyon, AnyonModel, IsingTopoCharge, FibonacciTopoCharge, TopoCharge, State, FusionPair
+from anyon_braiding_simulator import Anyon, AnyonModel, IsingTopoCharge, FibonacciTopoCharge, TopoCharge, State, FusionPair, StateVec
 
 
 @pytest.fixture
@@ -134,6 +135,176 @@ def test_parametrized_swaps(swaps, expected, setup_state_and_anyons):
     # Assert the result matches the expected output
     assert resulting_names == expected
 
+def test_swap_layers(setup_state_and_anyons):
+    state, _, model = setup_state_and_anyons
+    sequential = Braid(state, model)
+    batched = Braid(state, model)
+
+    layers = [[(0, 1), (2, 3)], [(1, 2), (-1, -1)], [(3, 2), (-1, -1)]]
+    for layer in layers:
+        sequential.swap([swap for swap in layer if swap != (-1, -1)])
+    batched.swap_layers(np.array(layers))
+
+    # Both paths record the same swaps and end in the same order
+    assert batched.swaps == sequential.swaps
+    assert [anyon.name for anyon in batched.anyons] == [anyon.name for anyon in sequential.anyons]
+
+    # A single time step can be given without the time axis
+    batched.swap_layers([(0, 1)])
+    assert batched.swaps[-1] == [(0, 1)]
+
+def test_swap_layers_invalid(setup_state_and_anyons):
+    state, _, model = setup_state_and_anyons
+    braid = Braid(state, model)
+
+    # Non-adjacent swap rejects the whole batch
+    with pytest.raises(ValueError, match=r'The pair \(0, 2\) could not be swapped at time 1'):
+        braid.swap_layers([[(0, 1), (-1, -1)], [(0, 2), (-1, -1)]])
+    assert braid.swaps == []
+    assert [anyon.name for anyon in braid.anyons] == ['A', 'B', 'C', 'D']
+
+    # Out of range swap
+    with pytest.raises(ValueError, match='could not be swapped'):
+        braid.swap_layers([(3, 4)])
+
+    # Reused index within a time step
+    with pytest.raises(ValueError, match='Index 1 is used more than once at time 0'):
+        braid.swap_layers([(0, 1), (1, 2)])
+    assert braid.swaps == []
+
+    # The same index may be reused at a later time step
+    braid.swap_layers([[(0, 1)], [(1, 2)]])
+    assert braid.swaps == [[(0, 1)], [(1, 2)]]
+    assert [anyon.name for anyon in braid.anyons] == ['B', 'C', 'A', 'D']
+
+def test_schedule(setup_state_and_anyons):
+    state, _, model = setup_state_and_anyons
+    scheduled = Braid(state, model)
+    sequential = Braid(state, model)
+
+    sequence = [(0, 1), (1, 2), (2, 3), (0, 1), (3, 2), (1, 0), (2, 1)]
+    for swap in sequence:
+        sequential.swap([swap])
+
+    # (0, 1) waits for (1, 2), but (2, 3) runs next to the second (0, 1)
+    assert scheduled.schedule(sequence) == 5
+    assert scheduled.swaps == [[(0, 1)], [(1, 2)], [(2, 3), (0, 1)], [(3, 2), (1, 0)], [(2, 1)]]
+    assert [anyon.name for anyon in scheduled.anyons] == [anyon.name for anyon in sequential.anyons]
+
+    # Scheduled time steps follow the ones already recorded
+    assert scheduled.schedule([(0, 1), (2, 3)]) == 1
+    assert scheduled.swaps[-1] == [(0, 1), (2, 3)]
+    assert scheduled.schedule([]) == 0
+
+def test_schedule_invalid(setup_state_and_anyons):
+    state, _, model = setup_state_and_anyons
+    braid = Braid(state, model)
+
+    with pytest.raises(ValueError, match='not adjacent'):
+        braid.schedule([(0, 1), (0, 2)])
+    with pytest.raises(ValueError, match='could not be swapped'):
+        braid.schedule([(0, 1), (3, 4)])
+    assert braid.swaps == []
+    assert [anyon.name for anyon in braid.anyons] == ['A', 'B', 'C', 'D']
+
+def test_generate_swap_matrix_inverse(setup_state_and_anyons):
+    state, _, model = setup_state_and_anyons
+    braid = Braid(state, model)
+    braid.swap([(0, 1)])
+    braid.swap([(1, 0)])
+
+    # Swapping back is the inverse generator
+    forward = braid.generate_swap_matrix(1, 0)
+    backward = braid.generate_swap_matrix(2, 0)
+    assert np.allclose(forward @ backward, np.eye(2))
+
+def test_swap_matrix_labels():
+    model = Model(AnyonModel.Ising)
+    state = State()
+    for name, charge in zip('ABCD', [IsingTopoCharge.Sigma] * 3 + [IsingTopoCharge.Psi]):
+        state.add_anyon(Anyon(name, TopoCharge.from_ising(charge), (0, 0)))
+    state.add_operation(1, FusionPair(1, 2))
+    state.add_operation(2, FusionPair(0, 1))
+    state.add_operation(3, FusionPair(0, 3))
+    braid = Braid(state, model)
+
+    # (A (B C)) is moved to ((A B) C) by F^{sigma sigma sigma}_sigma
+    braid.swap([(0, 1)])
+    braid.swap([(2, 3)])
+    f_mtx = model.getFMatrix('sigma', 'sigma', 'sigma', 'sigma')
+    expected = f_mtx @ model.getRMatrix('sigma', 'sigma') @ model.getFInv('sigma', 'sigma', 'sigma', 'sigma')
+    assert np.allclose(braid.generate_swap_matrix(1, 0), expected)
+    assert [anyon.name for anyon in braid.anyons_at(2)] == ['B', 'A', 'C', 'D']
+
+    # After the second swap the three anyons have no definite total charge
+    with pytest.raises(ValueError, match='no definite fused charge'):
+        braid.swap_matrix(0, 1)
+
+def test_anyons_at(setup_state_and_anyons):
+    state, _, model = setup_state_and_anyons
+    braid = Braid(state, model)
+
+    def replayed(time):
+        anyons = list(state.anyons)
+        for layer in braid.swaps[: max(time - 1, 0)]:
+            braid._permute(layer, anyons)
+        return anyons
+
+    # The order at each time step is kept as swaps are recorded, undone and optimized
+    braid.swap([(0, 1), (2, 3)])
+    braid.swap_layers([[[1, 2]], [[1, 0]]])
+    braid.schedule([(2, 3), (0, 1)])
+    braid.undo()
+    braid.swap([(3, 2)])
+    braid.undo()
+    braid.redo()
+    for time in range(len(braid.swaps) + 2):
+        assert braid.anyons_at(time) == replayed(time)
+    braid.optimize()
+    for time in range(len(braid.swaps) + 2):
+        assert braid.anyons_at(time) == replayed(time)
+    assert braid.anyons_at(len(braid.swaps) + 1) == braid.anyons
+
+def test_optimize(setup_state_and_anyons):
+    state, _, model = setup_state_and_anyons
+    braid = Braid(state, model)
+    assert braid.generator_order() == 16
+
+    # A swap and its inverse cancel across a commuting swap
+    braid.swap([(0, 1)])
+    braid.swap([(2, 3)])
+    braid.swap([(1, 0)])
+    # sigma_2 sigma_1 sigma_2 sigma_1^-1 = sigma_1 sigma_2
+    braid.swap([(1, 2)])
+    braid.swap([(0, 1)])
+    braid.swap([(1, 2)])
+    braid.swap([(1, 0)])
+    # R has order 16, so 17 swaps leave one
+    for _ in range(17):
+        braid.swap([(3, 2)])
+    names = [anyon.name for anyon in braid.anyons]
+
+    assert braid.optimize() == 2 + 2 + 16
+    # The (2, 3) swap commutes with (0, 1) and moves into the first time step
+    assert braid.swaps == [[(2, 3), (0, 1)], [(1, 2)], [(3, 2)]]
+    assert [anyon.name for anyon in braid.anyons] == names
+    assert braid.optimize() == 0
+
+def test_optimize_mixed_charges(setup_state_and_anyons):
+    state, anyons, model = setup_state_and_anyons
+    mixed = State()
+    for anyon in anyons[:3]:
+        mixed.add_anyon(anyon)
+    mixed.add_anyon(Anyon('D', TopoCharge.from_ising(IsingTopoCharge.Sigma), (4, 4)))
+    braid = Braid(mixed, model)
+
+    # Swaps of different charges have different matrices, so powers are kept
+    assert braid.generator_order() is None
+    for _ in range(16):
+        braid.swap([(0, 1)])
+    assert braid.optimize() == 0
+    assert len(braid.swaps) == 16
+
 @pytest.fixture
 def setup_state():
     # Initialize the state with 6 anyons
@@ -187,7 +358,7 @@ def setup_braid():
     state.add_operation(2, FusionPair(2, 4))
     state.add_operation(3, FusionPair(0, 2))
 
-    return Braid(state, model)
+    return Braid(state, model, debug=True)
 
 def test_direct_swap(setup_braid):
     braid = setup_braid
@@ -216,7 +387,154 @@ def test_generate_overall_unitary(setup_braid):
     unitary = braid.generate_overall_unitary(1, 0)
 
     # Assert the unitary matrix matches the expected matrix
-    assert np.shape(unitary) == (64, 64)
+    assert np.shape(unitary) == (8, 8)
+
+def test_generate_overall_unitary_requires_debug(setup_state):
+    braid = setup_state
+    braid.swap([(0, 1)])
+
+    with pytest.raises(ValueError, match='debug mode'):
+        braid.generate_overall_unitary(1, 0)
+
+def test_apply_swap(setup_braid):
+    braid = setup_braid
+    braid.swap([(0, 1)])
+
+    amplitudes = np.arange(1, 9, dtype=complex)
+    state_vec = StateVec(3, amplitudes)
+    expected = braid.generate_overall_unitary(1, 0) @ state_vec.vec
+
+    # Applying the swap in place must agree with the dense unitary
+    braid.apply_swap(state_vec, 1, 0)
+    assert np.allclose(state_vec.vec, expected)
+
+
+def test_unitary(setup_braid):
+    braid = setup_braid
+    assert np.allclose(braid.unitary(), np.eye(8))
+
+    braid.swap([(0, 1)])
+    braid.swap([(2, 3)])
+    braid.swap([(1, 0)])
+    steps = [braid.generate_overall_unitary(time, 0) for time in (1, 2, 3)]
+
+    assert np.allclose(braid.unitary(1), steps[0])
+    assert np.allclose(braid.unitary(), steps[2] @ steps[1] @ steps[0])
+    assert np.allclose(braid.unitary(), steps[1])
+
+    # Cached unitaries are shared, so they cannot be modified
+    with pytest.raises(ValueError):
+        braid.unitary()[0, 0] = 0
+    with pytest.raises(ValueError, match='Time must be between 0 and 3'):
+        braid.unitary(4)
+
+def test_amplitudes(setup_braid, setup_state):
+    debug, braid = setup_braid, setup_state
+    for swaps in ([(0, 1), (2, 3)], [(1, 2)], [(3, 2)]):
+        debug.swap(swaps)
+        braid.swap(swaps)
+
+    # Outside debug mode only the running state of each prefix is kept
+    for time in range(4):
+        assert np.allclose(braid.amplitudes(time), debug.unitary(time)[:, 0])
+        assert np.allclose(debug.amplitudes(time), debug.unitary(time)[:, 0])
+    assert all(prefix.shape == (8,) for prefix in braid._prefixes)
+
+    # Undone states are checkpoints that redo restores without recomputing
+    final = braid.amplitudes()
+    braid.undo()
+    assert np.allclose(braid.amplitudes(), debug.unitary(2)[:, 0])
+    braid.redo()
+    assert braid.amplitudes() is final
+
+def test_optimize_preserves_result(setup_braid, setup_state):
+    debug, braid = setup_braid, setup_state
+    # The swap matrices of this register do not satisfy the braid relation
+    assert not debug.satisfies_braid_relation()
+
+    rng = np.random.default_rng(0)
+    words = [[2, 1, 2, -1]] + [list(rng.choice([-5, -4, -3, -2, -1, 1, 2, 3, 4, 5], 12)) for _ in range(5)]
+    for word in words:
+        debug = Braid(debug.state, debug.model, debug=True)
+        braid = Braid(braid.state, braid.model)
+        for register in (debug, braid):
+            for g in word:
+                register.swap([to_swap(int(g))])
+        unitary, amplitudes = debug.unitary(), braid.amplitudes()
+
+        debug.optimize()
+        braid.optimize()
+        assert np.allclose(debug.unitary(), unitary)
+        assert np.allclose(braid.amplitudes(), amplitudes)
+
+def test_undo_redo(setup_braid):
+    braid = setup_braid
+    names = [anyon.name for anyon in braid.anyons]
+    braid.swap([(0, 1), (2, 3)])
+    braid.swap([(1, 2)])
+    full = braid.unitary().copy()
+
+    assert braid.undo() == [(1, 2)]
+    assert braid.undo() == [(0, 1), (2, 3)]
+    assert braid.swaps == []
+    assert [anyon.name for anyon in braid.anyons] == names
+    assert np.allclose(braid.unitary(), np.eye(8))
+    with pytest.raises(ValueError, match='no swaps to undo'):
+        braid.undo()
+
+    assert braid.redo() == [(0, 1), (2, 3)]
+    assert braid.redo() == [(1, 2)]
+    assert braid.swaps == [[(0, 1), (2, 3)], [(1, 2)]]
+    assert np.allclose(braid.unitary(), full)
+
+    # New swaps discard what was undone
+    braid.undo()
+    braid.swap([(4, 5)])
+    with pytest.raises(ValueError, match='no swaps to redo'):
+        braid.redo()
+    assert braid.swaps == [[(0, 1), (2, 3)], [(4, 5)]]
+
+
+def test_braid_batch(setup_braid):
+    braid = setup_braid
+    batch = BraidBatch(braid.state, braid.model)
+    assert batch.generators.shape == (11, 8, 8)
+
+    rng = np.random.default_rng(0)
+    words = rng.integers(-5, 6, size=(20, 12))
+    unitaries = batch.unitaries(words)
+    assert unitaries.shape == (20, 8, 8)
+
+    # Each word matches a braid of its swaps, where 0 pads
+    for word, unitary in zip(words, unitaries):
+        single = Braid(braid.state, braid.model, debug=True)
+        single.schedule([to_swap(g) for g in word if g != 0])
+        assert np.allclose(unitary, single.unitary())
+
+    amplitudes = np.arange(1, 9, dtype=complex)
+    state_vec = StateVec(3, amplitudes)
+    assert np.allclose(batch.amplitudes(words, state_vec), unitaries @ state_vec.vec)
+    assert np.allclose(batch.amplitudes(words[0], state_vec.vec), unitaries[0] @ state_vec.vec)
+
+def test_braid_batch_invalid(setup_braid):
+    batch = BraidBatch(setup_braid.state, setup_braid.model)
+
+    with pytest.raises(ValueError, match='between -5 and 5'):
+        batch.unitaries([[1, 6]])
+    with pytest.raises(ValueError, match='integer array'):
+        batch.unitaries([[0.5]])
+    with pytest.raises(ValueError, match='8 amplitudes'):
+        batch.amplitudes([[1]], np.ones(4))
+
+    # Swapping different charges changes which matrix later generators need
+    mixed = State()
+    for anyon in setup_braid.state.anyons[:-1]:
+        mixed.add_anyon(anyon)
+    mixed.add_anyon(Anyon('5', TopoCharge.from_ising(IsingTopoCharge.Psi), (0, 0)))
+    for time, op in setup_braid.state.operations:
+        mixed.add_operation(time, op)
+    with pytest.raises(ValueError, match='same charge'):
+        BraidBatch(mixed, setup_braid.model)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,126 @@
+import os
+import sys
+from itertools import product
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'anyon_braiding_simulator')))
+
+from anyon_braiding_simulator import (
+    Anyon,
+    AnyonModel,
+    Basis,
+    FibonacciTopoCharge,
+    FusionPair,
+    IsingTopoCharge,
+    State,
+    TopoCharge,
+)
+from FMoves import FMovePlanner, _rotations, shortest_f_moves
+from Model import Model
+
+
+def left_comb(num_anyons: int) -> Basis:
+    return Basis([(t, FusionPair(0, t)) for t in range(1, num_anyons)])
+
+
+def right_comb(num_anyons: int) -> Basis:
+    return Basis([(t, FusionPair(num_anyons - t - 1, num_anyons - t)) for t in range(1, num_anyons)])
+
+
+def paired(num_anyons: int) -> Basis:
+    # ((0 1) (2 3)) ... then a left comb over the pairs
+    ops = [(1, FusionPair(i, i + 1)) for i in range(0, num_anyons - 1, 2)]
+    ops += [(t + 1, FusionPair(0, 2 * t)) for t in range(1, (num_anyons + 1) // 2)]
+    return Basis(ops)
+
+
+@pytest.fixture
+def fibo_planner() -> FMovePlanner:
+    state = State()
+    state.set_anyon_model(AnyonModel.Fibonacci)
+    for i in range(5):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_fibonacci(FibonacciTopoCharge.Tau), (i, 0)))
+    return FMovePlanner(state, Model(AnyonModel.Fibonacci))
+
+
+@pytest.fixture
+def ising_planner() -> FMovePlanner:
+    state = State()
+    for i in range(4):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Sigma), (i, 0)))
+    return FMovePlanner(state, Model(AnyonModel.Ising))
+
+
+def all_shapes(low: int, high: int):
+    if low == high:
+        yield low
+    for split in range(low, high):
+        for left, right in product(all_shapes(low, split), all_shapes(split + 1, high)):
+            yield (left, right)
+
+
+@pytest.mark.basis
+def test_shortest_f_moves():
+    # Rotation distances against a plain breadth first search
+    shapes = list(all_shapes(0, 4))
+    for source in shapes:
+        distances = {source: 0}
+        frontier = [source]
+        while frontier:
+            next_frontier = []
+            for shape in frontier:
+                for rotated, _ in _rotations(shape):
+                    if rotated not in distances:
+                        distances[rotated] = distances[shape] + 1
+                        next_frontier.append(rotated)
+            frontier = next_frontier
+
+        for target in shapes:
+            assert len(shortest_f_moves(source, target)) == distances[target]
+
+
+@pytest.mark.basis
+def test_plan(fibo_planner):
+    assert fibo_planner.plan(left_comb(5), left_comb(5)) == []
+    assert len(fibo_planner.plan(left_comb(5), right_comb(5))) == 3
+
+    with pytest.raises(ValueError):
+        fibo_planner.plan(left_comb(4), left_comb(5))
+
+
+@pytest.mark.basis
+def test_single_f_move(ising_planner):
+    state = State()
+    for i in range(3):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Sigma), (i, 0)))
+    model = Model(AnyonModel.Ising)
+    planner = FMovePlanner(state, model)
+
+    operator, source, target = planner.basis_change(left_comb(3), right_comb(3), 'sigma')
+    source_charges = [tree[1][0] for tree in source]
+    target_charges = [tree[2][0] for tree in target]
+
+    # Amplitudes change by F^{sigma sigma sigma}_sigma
+    f = model._f_symbols[1, 1, 1, 1]
+    assert np.allclose(operator.toarray(), f[np.ix_(source_charges, target_charges)].T)
+
+
+@pytest.mark.basis
+@pytest.mark.parametrize('planner_fixture, num_anyons', [('fibo_planner', 5), ('ising_planner', 4)])
+def test_basis_change(planner_fixture, num_anyons, request):
+    planner = request.getfixturevalue(planner_fixture)
+    bases = [left_comb(num_anyons), right_comb(num_anyons), paired(num_anyons)]
+
+    for source, target in product(bases, repeat=2):
+        operator, source_labelled, target_labelled = planner.basis_change(source, target)
+        assert operator.shape == (len(target_labelled), len(source_labelled))
+        dense = operator.toarray()
+        assert np.allclose(dense.conj().T @ dense, np.eye(len(source_labelled)))
+
+    # The pentagon equation makes every path between two bases agree
+    left_to_paired, _, _ = planner.basis_change(bases[0], bases[2])
+    paired_to_right, _, _ = planner.basis_change(bases[2], bases[1])
+    left_to_right, _, _ = planner.basis_change(bases[0], bases[1])
+    assert np.allclose((paired_to_right @ left_to_paired).toarray(), left_to_right.toarray())
@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
 from anyon_braiding_simulator.anyon_braiding_simulator import (
     Anyon,
     AnyonModel,
+    Basis,
     Fusion,
     FusionPair,
     IsingTopoCharge,
@@ -71,6 +73,52 @@ def test_apply_fibo_fusion(fibo_state):
 
     assert fusion.apply_fusion(tau_vac,  tau_vac) == [3,2]
 
+@pytest.mark.fusion
+def test_apply_custom_fusion():
+    state = State()
+    state.set_anyon_model(AnyonModel.Custom)
+
+    # Fibonacci rules in (vacuum, tau) order
+    rules = np.zeros((2, 2, 2), dtype=np.int64)
+    rules[0, 0, 0] = rules[0, 1, 1] = rules[1, 0, 1] = 1
+    rules[1, 1, 0] = rules[1, 1, 1] = 1
+    fusion = Fusion(state, rules)
+
+    vac = [1, 0]
+    tau = [0, 1]
+
+    assert fusion.apply_fusion(vac, vac) == vac
+    assert fusion.apply_fusion(tau, vac) == tau
+    assert fusion.apply_fusion(tau, tau) == [1, 1]
+    assert fusion.apply_fusion([1, 1], [1, 1]) == [2, 3]
+
+    with pytest.raises(ValueError):
+        fusion.apply_fusion([1, 0, 0], tau)
+
+    # Custom models cannot fuse without rules
+    with pytest.raises(ValueError):
+        Fusion(state).apply_fusion(vac, vac)
+
+@pytest.mark.fusion
+@pytest.mark.parametrize('state_fixture, num_charges', [('ising_state', 3), ('fibo_state', 2)])
+def test_apply_fusion_batch(state_fixture, num_charges, request):
+    fusion = Fusion(request.getfixturevalue(state_fixture))
+    rng = np.random.default_rng(0)
+
+    anyon_1 = rng.integers(0, 4, size=(20, num_charges))
+    anyon_2 = rng.integers(0, 4, size=(20, num_charges))
+    fused = fusion.apply_fusion_batch(anyon_1, anyon_2)
+
+    # Every row matches the single fusion
+    assert fused.shape == (20, num_charges)
+    for row_1, row_2, row in zip(anyon_1, anyon_2, fused):
+        assert list(row) == fusion.apply_fusion(list(map(int, row_1)), list(map(int, row_2)))
+
+    with pytest.raises(ValueError):
+        fusion.apply_fusion_batch(anyon_1, anyon_2[:5])
+    with pytest.raises(ValueError):
+        fusion.apply_fusion_batch(-anyon_1, anyon_2)
+
 @pytest.mark.fusion
 def test_ising_qubit_enc(ising_state):
     ising_state.add_operation(1, FusionPair(0, 1))
@@ -84,6 +132,25 @@ def test_ising_qubit_enc(ising_state):
 
     assert set(map(str, fusion.qubit_enc())) == set(map(str, correct))
 
+@pytest.mark.fusion
+def test_qubit_index(ising_state):
+    ising_state.add_operation(1, FusionPair(0, 1))
+    ising_state.add_operation(1, FusionPair(2, 3))
+    ising_state.add_operation(1, FusionPair(4, 5))
+    ising_state.add_operation(2, FusionPair(2, 4))
+    ising_state.add_operation(3, FusionPair(0, 2))
+
+    fusion = Fusion(ising_state)
+
+    # Every encoding pair maps back to its position in qubit_enc, in either order
+    for qubit, pair in enumerate(fusion.qubit_enc()):
+        assert fusion.qubit_index(pair.anyon_1, pair.anyon_2) == qubit
+        assert fusion.qubit_index(pair.anyon_2, pair.anyon_1) == qubit
+
+    # Pairs outside the encoding have no qubit
+    assert fusion.qubit_index(4, 5) is None
+    assert fusion.qubit_index(1, 2) is None
+
 @pytest.mark.fusion
 def test_fibo_qubit_enc(fibo_state):
     fibo_state.add_operation(1, FusionPair(0, 1))
@@ -131,6 +198,35 @@ def test_fibo_verify_fusion_result(fibo_state):
 
     
 
+@pytest.mark.fusion
+def test_fusion_modes():
+    state = State()
+    state.set_anyon_model(AnyonModel.Fibonacci)
+    for i in range(120):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_fibonacci(FibonacciTopoCharge.Tau), (0, 0)))
+    fusion = Fusion(state)
+
+    # 120 taus have Fibonacci number multiplicities past u64
+    for mode in ['support', 'exact']:
+        assert fusion.verify_fusion_result(TopoCharge.from_fibonacci(FibonacciTopoCharge.Tau), mode)
+        assert fusion.verify_fusion_result(TopoCharge.from_fibonacci(FibonacciTopoCharge.Vacuum), mode)
+    with pytest.raises(OverflowError):
+        fusion.verify_fusion_result(TopoCharge.from_fibonacci(FibonacciTopoCharge.Tau), 'count')
+    with pytest.raises(ValueError):
+        fusion.verify_fusion_result(TopoCharge.from_fibonacci(FibonacciTopoCharge.Tau), 'approximate')
+
+    # tau^n = F(n - 1) + F(n) tau, with exact multiplicities past u64
+    tau = [1, 0]
+    power = tau
+    for _ in range(99):
+        power = fusion.apply_fusion(power, tau, 'exact')
+    assert power == [354224848179261915075, 218922995834555169026]
+
+    with pytest.raises(OverflowError):
+        fusion.apply_fusion(power, tau)
+    assert fusion.apply_fusion(power, tau, 'support') == [1, 1]
+    assert fusion.apply_fusion([0, 5], [0, 7], 'support') == [0, 1]
+
 @pytest.mark.fusion
 def test_ising_minimum_possible_anyons(ising_state):
 
@@ -138,6 +234,7 @@ def test_ising_minimum_possible_anyons(ising_state):
 
     assert (fusion.minimum_possible_anyons(10) == [21,22])
     assert (fusion.minimum_possible_anyons(5) == [11,12])
+    assert (fusion.minimum_possible_anyons(0) == [1,2])
 
 @pytest.mark.fusion
 def test_fibo_minimum_possible_anyons(ising_state):
@@ -146,3 +243,149 @@ def test_fibo_minimum_possible_anyons(ising_state):
 
     assert(fusion.minimum_possible_anyons(10) == [17,18])
     assert(fusion.minimum_possible_anyons(0) == [0,1,2,3])
+
+@pytest.mark.fusion
+def test_large_minimum_possible_anyons(ising_state):
+    ising_state.set_anyon_model(AnyonModel.Fibonacci)
+    fusion = Fusion(ising_state)
+
+    # Past the old 30 qubit limit, F(n) first reaches 2^40 at n = 60
+    assert fusion.minimum_possible_anyons(40) == [60, 61]
+    assert Fusion(State()).minimum_possible_anyons(100) == [201, 202]
+
+@pytest.mark.fusion
+def test_fusion_space_dimensions(ising_state, fibo_state):
+    # Six sigmas split evenly between the vacuum and psi sectors, in (psi, vacuum, sigma) order
+    assert Fusion(ising_state).fusion_space_dimensions() == [4, 4, 0]
+    assert Fusion(ising_state).fusion_space_dimensions([0, 0, 7]) == [0, 0, 8]
+
+    # Six taus give F(6) tau and F(5) vacuum sectors, in (tau, vacuum) order
+    fusion = Fusion(fibo_state)
+    assert fusion.fusion_space_dimensions() == [8, 5]
+    assert fusion.fusion_space_dimensions([100, 3]) == [354224848179261915075, 218922995834555169026]
+
+    with pytest.raises(ValueError):
+        fusion.fusion_space_dimensions([1, 2, 3])
+
+
+
+@pytest.mark.fusion
+def test_fusion_trees(ising_state):
+    ising_state.add_operation(1, FusionPair(0, 1))
+    ising_state.add_operation(1, FusionPair(2, 3))
+    ising_state.add_operation(1, FusionPair(4, 5))
+    ising_state.add_operation(2, FusionPair(2, 4))
+    ising_state.add_operation(3, FusionPair(0, 2))
+    fusion = Fusion(ising_state)
+
+    trees = fusion.fusion_trees()
+    assert trees.dimension == len(trees) == 8
+
+    basis = list(trees)
+    assert len({tuple(tree) for tree in basis}) == 8
+    for i, tree in enumerate(basis):
+        assert trees.rank(tree) == i
+        assert trees.unrank(i) == tree
+
+    vacuum = int(IsingTopoCharge.Vacuum)
+    vacuum_trees = fusion.fusion_trees(TopoCharge.from_ising(IsingTopoCharge.Vacuum))
+    assert vacuum_trees.dimension == 4
+    assert all(tree[-1] == vacuum for tree in vacuum_trees)
+
+    psi = int(IsingTopoCharge.Psi)
+    with pytest.raises(ValueError):
+        vacuum_trees.rank([vacuum, vacuum, vacuum, vacuum, psi])
+    with pytest.raises(ValueError):
+        vacuum_trees.rank([psi, psi, psi, psi, vacuum])
+    with pytest.raises(IndexError):
+        vacuum_trees.unrank(4)
+
+
+@pytest.mark.fusion
+def test_large_fusion_trees():
+    state = State()
+    state.set_anyon_model(AnyonModel.Fibonacci)
+    for i in range(100):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_fibonacci(FibonacciTopoCharge.Tau), (0, 0)))
+    for i in range(1, 100):
+        state.add_operation(i, FusionPair(0, i))
+    trees = Fusion(state).fusion_trees()
+
+    # 100 taus have F(99) + F(100) fusion trees, far more than fit in memory
+    assert trees.dimension == 573147844013817084101
+    with pytest.raises(OverflowError):
+        len(trees)
+
+    last = trees.dimension - 1
+    assert trees.rank(trees.unrank(last)) == last
+    assert trees.unrank(0) == next(iter(trees))
+
+
+@pytest.mark.fusion
+def test_incomplete_fusion_trees(ising_state):
+    ising_state.add_operation(1, FusionPair(0, 1))
+    with pytest.raises(ValueError):
+        Fusion(ising_state).fusion_trees()
+
+
+@pytest.mark.fusion
+def test_fusion_tree_queries(ising_state):
+    ising_state.add_operation(1, FusionPair(0, 1))
+    ising_state.add_operation(1, FusionPair(2, 3))
+    ising_state.add_operation(1, FusionPair(4, 5))
+    ising_state.add_operation(2, FusionPair(2, 4))
+    ising_state.add_operation(3, FusionPair(0, 2))
+    fusion = Fusion(ising_state)
+
+    assert fusion.are_siblings(0, 1) and fusion.are_siblings(5, 4)
+    assert not fusion.are_siblings(1, 2)
+    assert not fusion.are_siblings(2, 4)
+    assert not fusion.are_siblings(0, 0)
+
+    assert str(fusion.separating_fusion(2, 5)) == '(2 4)'
+    assert str(fusion.separating_fusion(1, 3)) == '(0 2)'
+    assert fusion.separating_fusion(3, 3) is None
+    assert fusion.separating_qubit(2, 3) == fusion.qubit_index(2, 3)
+
+    assert fusion.f_move_distance(0, 1) == 0
+    assert fusion.f_move_distance(3, 4) == 2
+    assert fusion.f_move_distance(1, 2) == 3
+
+    with pytest.raises(ValueError):
+        fusion.are_siblings(0, 6)
+
+
+@pytest.mark.fusion
+def test_partial_fusion_tree_queries(ising_state):
+    ising_state.add_operation(1, FusionPair(0, 1))
+    fusion = Fusion(ising_state)
+
+    assert fusion.are_siblings(0, 1)
+    assert not fusion.are_siblings(2, 3)
+    assert fusion.separating_fusion(1, 2) is None
+    assert fusion.f_move_distance(2, 3) is None
+
+
+@pytest.mark.fusion
+def test_verify_bases(ising_state):
+    fusion = Fusion(ising_state)
+
+    comb = [(t, 0, t) for t in range(1, 6)]
+    paired = [(1, 0, 1), (1, 2, 3), (1, 4, 5), (2, 2, 4), (3, 0, 2)]
+    swapped = [(t, t, 0) for t in range(1, 6)]
+    same_time = [(1, 0, t) for t in range(1, 6)]
+    # Anyon 1 is still between 0 and 2
+    not_adjacent = [(1, 0, 2), (2, 0, 1), (3, 0, 3), (4, 0, 4), (5, 0, 5)]
+
+    bases = np.array([comb, paired, swapped, same_time, not_adjacent])
+    assert fusion.verify_bases(bases).tolist() == [True, True, False, False, False]
+
+    # Agrees with verifying each basis on its own
+    for basis, valid in zip(bases, fusion.verify_bases(bases)):
+        ops = [(int(t), FusionPair(int(a), int(b))) for t, a, b in basis]
+        assert fusion.verify_basis(Basis(ops)) == valid
+
+    assert fusion.verify_bases(np.repeat(bases, 1000, axis=0)).sum() == 2000
+
+    with pytest.raises(ValueError):
+        fusion.verify_bases(np.zeros((2, 4, 3), dtype=np.int64))
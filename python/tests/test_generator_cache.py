@@ -0,0 +1,149 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'anyon_braiding_simulator')))
+
+from anyon_braiding_simulator import Anyon, AnyonModel, FusionPair, IsingTopoCharge, State, TopoCharge
+import Braiding
+from Braiding import Braid, BraidBatch
+from GeneratorCache import GeneratorCache, register_signature
+from Model import Model
+
+
+def sigma_state(num_anyons: int) -> State:
+    state = State()
+    for i in range(num_anyons):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Sigma), (i, 0)))
+    for i in range(1, num_anyons):
+        state.add_operation(i, FusionPair(0, i))
+    return state
+
+
+@pytest.mark.braiding
+def test_generator_cache_lru():
+    cache = GeneratorCache(max_bytes=3 * 128)
+    builds = []
+
+    def build(key):
+        builds.append(key)
+        return np.zeros(16)
+
+    for key in ['a', 'b', 'c', 'a']:
+        cache.get(key, lambda: build(key))
+    assert builds == ['a', 'b', 'c']
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'entries': 3, 'nbytes': 3 * 128}
+
+    # 'b' is the least recently used, so it makes room for 'd'
+    cache.get('d', lambda: build('d'))
+    assert 'b' not in cache and 'a' in cache and len(cache) == 3
+
+    # Cached arrays are shared, so they are read-only
+    with pytest.raises(ValueError):
+        cache.get('a', lambda: build('a'))[0] = 1
+
+    # Matrices larger than the whole cache are not kept
+    cache.get('big', lambda: np.zeros(100))
+    assert 'big' not in cache and len(cache) == 3
+
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'entries': 0, 'nbytes': 0}
+
+
+@pytest.mark.braiding
+def test_register_signature():
+    model = Model(AnyonModel.Ising)
+    state = sigma_state(4)
+    charges = ['Sigma'] * 4
+
+    assert register_signature(model, charges, state.operations) == register_signature(
+        model, charges, sigma_state(4).operations
+    )
+    assert register_signature(model, charges, state.operations) != register_signature(
+        model, ['Sigma'] * 3 + ['Psi'], state.operations
+    )
+    assert register_signature(model, charges, state.operations) != register_signature(
+        Model(AnyonModel.Fibonacci), charges, state.operations
+    )
+
+
+@pytest.mark.braiding
+def test_register_signature_custom(tmp_path):
+    from test_model import write_z2_symbols
+
+    # Custom models share a model type, so their symbols are part of the signature
+    write_z2_symbols(tmp_path / 'z2')
+    write_z2_symbols(tmp_path / 'bosons')
+    r_symbols = np.load(tmp_path / 'bosons' / 'r_symbols.npy')
+    r_symbols[1, 1, 0] = 1
+    np.save(tmp_path / 'bosons' / 'r_symbols.npy', r_symbols)
+
+    z2 = Model(AnyonModel.Custom, symbol_path=str(tmp_path / 'z2'))
+    bosons = Model(AnyonModel.Custom, symbol_path=str(tmp_path / 'bosons'))
+    reloaded = Model(AnyonModel.Custom, symbol_path=str(tmp_path / 'z2'))
+    operations = sigma_state(4).operations
+    charges = ['psi'] * 4
+    assert register_signature(z2, charges, operations) == register_signature(reloaded, charges, operations)
+    assert register_signature(z2, charges, operations) != register_signature(bosons, charges, operations)
+
+
+@pytest.mark.braiding
+def test_shared_generators():
+    cache = GeneratorCache()
+    model = Model(AnyonModel.Ising)
+    first = Braid(sigma_state(5), model, debug=True, cache=cache)
+    second = Braid(sigma_state(5), model, debug=True, cache=cache)
+    assert first.signature() == second.signature()
+
+    first.swap([(1, 2)])
+    second.swap([(1, 2)])
+    unitary = first.generate_overall_unitary(1, 0)
+    assert cache.stats()['misses'] == 1
+    assert second.generate_overall_unitary(1, 0) is unitary
+    assert cache.stats()['hits'] == 1
+
+    # Sparse forms agree with the dense ones
+    assert np.allclose(first.generator_unitary(-2, sparse=True).toarray(), unitary.conj().T)
+    sparse = first.generator_unitary(2, sparse=True)
+    assert sp.issparse(sparse)
+
+    # Cached sparse matrices are shared as well, so their arrays are read-only
+    assert second.generator_unitary(2, sparse=True) is sparse
+    for array in (sparse.data, sparse.indices, sparse.indptr):
+        with pytest.raises(ValueError):
+            array[0] = 0
+    assert np.allclose((sparse @ sparse.conj().T).toarray(), np.eye(sparse.shape[0]))
+
+    # A batch over the same register reuses every generator
+    batch = BraidBatch(sigma_state(5), model, cache=cache)
+    misses = cache.stats()['misses']
+    BraidBatch(sigma_state(5), model, cache=cache)
+    assert cache.stats()['misses'] == misses
+    assert np.allclose(batch.generators[2 + 4], unitary)
+
+    with pytest.raises(ValueError):
+        first.generator_unitary(0)
+
+
+@pytest.mark.braiding
+def test_signature_computed_once(monkeypatch):
+    calls = []
+
+    def counting_signature(*args):
+        calls.append(args)
+        return register_signature(*args)
+
+    monkeypatch.setattr(Braiding, 'register_signature', counting_signature)
+    braid = Braid(sigma_state(4), Model(AnyonModel.Ising), cache=GeneratorCache())
+    for _ in range(3):
+        braid.generator_unitary(1)
+        braid.generator_unitary(-2)
+    assert len(calls) == 1
+
+    # Swaps of equal charges keep the charge order, so the signature is reused
+    braid.swap([(0, 1)])
+    assert braid.signature() == braid.signature(braid.anyons_at(1))
+    assert len(calls) == 1
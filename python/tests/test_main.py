@@ -13,7 +13,7 @@ def exec(model, cmds: list[str]):
     cmd_string = '\n'.join(cmds)
 
     try:
-        sh.python(['main.py'], _in=cmd_string)
+        return str(sh.python(['main.py'], _in=cmd_string))
     except sh.ErrorReturnCode as e:
         print(e)
         assert False
@@ -65,6 +65,27 @@ class TestBraidAndFuse:
         cmds = ['anyon1 psi {8,-4}', 'anyon2 sigma {5,5}', 'anyon3 psi {1,-1}', 'done', 'braid swap anyon1-anyon2', 'braid print', 'exit']
         exec(model, cmds)
 
+    @pytest.mark.main
+    def test_braid_undo_redo_ising(self):
+        model = 'ising'
+        cmds = [
+            'anyon1 psi',
+            'anyon2 sigma',
+            'anyon3 psi',
+            'done',
+            'braid swap anyon1-anyon2',
+            'braid undo',
+            'braid undo',
+            'braid redo',
+            'braid print',
+            'exit',
+        ]
+        output = exec(model, cmds)
+
+        assert output.count('Undo: (0 1)') == 1
+        assert 'Error: There are no swaps to undo' in output
+        assert 'Redo: (0 1)' in output
+
 class TestListAndHelp:
     @pytest.mark.parametrize('model', ['ising', 'fibonacci'])
     @pytest.mark.main
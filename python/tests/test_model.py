@@ -1,9 +1,11 @@
 # Standard Library
 import cmath
+import os
 
 import numpy as np
 import pytest
-from anyon_braiding_simulator.anyon_braiding_simulator import AnyonModel
+from anyon_braiding_simulator.anyon_braiding_simulator import Anyon, AnyonModel, IsingTopoCharge, State, TopoCharge
+from Braiding import Braid, BraidBatch
 from Model import Model
 
 
@@ -70,3 +72,207 @@ def test_FinvRF(initialize_ising):
 
     # check identity matrices
     assert np.isclose(ising.getFInvRF('psi', 'psi', 'psi', 'vacuum'), np.linalg.inv(ising.getFMatrix('psi', 'psi', 'psi', 'vacuum')) @ ising._r_mtx @ ising.getFMatrix('psi', 'psi', 'psi', 'vacuum')).all()
+
+@pytest.mark.model
+def test_integer_lookup(initialize_ising):
+    ising = initialize_ising
+
+    # Integer indices and charge names address the same precomputed entries
+    assert np.equal(ising.getFMatrix(1, 1, 1, 1), ising.getFMatrix('sigma', 'sigma', 'sigma', 'sigma')).all()
+    assert np.equal(ising.getFInv(2, 1, 1, 0), ising.getFInv('psi', 'sigma', 'sigma', 'vacuum')).all()
+    assert np.equal(ising.getFInvRF(1, 1, 1, 1), ising.getFInvRF('sigma', 'sigma', 'sigma', 'sigma')).all()
+
+    with pytest.raises(ValueError):
+        ising.getFMatrix(3, 1, 1, 1)
+    with pytest.raises(ValueError):
+        ising.getFMatrix('tau', 'sigma', 'sigma', 'sigma')
+
+    # Indices must be integers, which rules out floats that would be truncated and bools
+    assert np.equal(ising.getFMatrix(np.int64(1), 1, 1, 1), ising.getFMatrix(1, 1, 1, 1)).all()
+    for index in (1.5, 1.0, True, np.True_, None):
+        with pytest.raises(ValueError):
+            ising.getFMatrix(index, 1, 1, 1)
+    with pytest.raises(ValueError):
+        ising.getRMatrix(False, 1)
+
+@pytest.mark.model
+def test_lookups_are_read_only(initialize_ising):
+    ising = initialize_ising
+
+    for matrix in (ising.getFMatrix(1, 1, 1, 1), ising.getFInv(1, 1, 1, 1), ising.getFInvRF(1, 1, 1, 1)):
+        assert not matrix.flags.writeable
+        with pytest.raises(ValueError):
+            matrix[0, 0] = 0
+
+@pytest.mark.model
+def test_fibonacci_f_matrix():
+    fibonacci = Model(AnyonModel.Fibonacci)
+    phi = (1 + np.sqrt(5)) / 2
+
+    tau4F = fibonacci.getFMatrix('tau', 'tau', 'tau', 'tau')
+    assert np.isclose(tau4F, np.array([[1 / phi, 1 / np.sqrt(phi)], [1 / np.sqrt(phi), -1 / phi]])).all()
+
+    # The tau F-matrix is its own inverse
+    assert np.isclose(fibonacci.getFInv('tau', 'tau', 'tau', 'tau'), tau4F).all()
+    assert np.isclose(fibonacci.getFInvRF('tau', 'tau', 'tau', 'tau'), tau4F @ fibonacci._r_mtx @ tau4F).all()
+
+    # get_charges keeps its original names, which look up the same charge
+    assert fibonacci.get_charges() == {'vacuum', 'psi'}
+    assert np.isclose(fibonacci.getFMatrix('psi', 'psi', 'psi', 'psi'), tau4F).all()
+
+@pytest.mark.model
+@pytest.mark.parametrize('model_type', [AnyonModel.Ising, AnyonModel.Fibonacci])
+def test_batch_lookup(model_type):
+    model = Model(model_type)
+    num_charges = model._f_mtx.shape[0]
+    rng = np.random.default_rng(0)
+    indices = rng.integers(0, num_charges, size=(50, 4))
+
+    # Stacked (N, 4) form matches the scalar lookups
+    f_batch = model.getFMatrixBatch(indices)
+    assert f_batch.shape == (50, 2, 2)
+    for row, matrix in zip(indices, f_batch):
+        assert np.equal(matrix, model.getFMatrix(*row)).all()
+
+    # Separate index arrays give the same result
+    a, b, c, d = indices.T
+    assert np.equal(model.getFMatrixBatch(a, b, c, d), f_batch).all()
+    assert np.isclose(model.getFInvBatch(indices), np.linalg.inv(f_batch)).all()
+    assert np.isclose(model.getFInvRFBatch(a, b, c, d), np.linalg.inv(f_batch) @ model._r_mtx @ f_batch).all()
+
+    r_batch = model.getRMatrixBatch(indices[:, :2])
+    assert r_batch.shape == (50, 2, 2)
+    assert np.equal(r_batch, model.getRMatrix(0, 0)).all()
+    assert np.equal(model.getRMatrixBatch(a, b), r_batch).all()
+
+@pytest.mark.model
+def test_batch_lookup_invalid(initialize_ising):
+    ising = initialize_ising
+
+    with pytest.raises(ValueError):
+        ising.getFMatrixBatch(np.zeros((5, 3), dtype=int))
+    with pytest.raises(ValueError):
+        ising.getFMatrixBatch(np.full((5, 4), 3))
+    with pytest.raises(ValueError):
+        ising.getFMatrixBatch(np.zeros((5, 4)))
+    with pytest.raises(ValueError):
+        ising.getFMatrixBatch([0, 1], [0, 1])
+    with pytest.raises(ValueError):
+        ising.getFMatrixBatch(np.ones((5, 4), dtype=bool))
+    with pytest.raises(ValueError):
+        ising.getRMatrixBatch([True, False], [1, 1])
+
+def write_z2_symbols(path):
+    """
+    Writes the Z2 model {vacuum, psi}, where psi x psi = vacuum and psi braids with a sign
+    """
+    parity = np.arange(2)
+    rules = (parity[:, None, None] ^ parity[None, :, None]) == parity[None, None, :]
+
+    a, b, c, d, e, f = np.indices((2,) * 6)
+    f_symbols = ((e == a ^ b) & (f == b ^ c) & (d == a ^ b ^ c)).astype(float)
+
+    r_symbols = rules.astype(complex)
+    r_symbols[1, 1, 0] = -1
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'charges.npy'), np.array(['vacuum', 'psi']))
+    np.save(os.path.join(path, 'fusion_rules.npy'), rules.astype(np.int64))
+    np.save(os.path.join(path, 'f_symbols.npy'), f_symbols)
+    np.save(os.path.join(path, 'r_symbols.npy'), r_symbols)
+
+@pytest.mark.model
+def test_custom_model(tmp_path):
+    write_z2_symbols(tmp_path / 'z2')
+    z2 = Model(AnyonModel.Custom, symbol_path=str(tmp_path / 'z2'))
+
+    assert z2.get_charges() == {'vacuum', 'psi'}
+    assert isinstance(z2._f_mtx.base, np.memmap) or isinstance(z2._f_mtx, np.memmap)
+    # F^-1 and F^-1RF are only built when first looked up
+    assert z2._f_inv is None and z2._finvrf is None
+
+    # F^{psi psi psi}_psi maps the vacuum channel of (psi psi) to the vacuum channel of (psi psi)
+    assert np.equal(z2.getFMatrix('psi', 'psi', 'psi', 'psi'), np.array([[1, 0], [0, 0]])).all()
+    assert np.isclose(z2.getFInv('psi', 'psi', 'psi', 'psi'), np.array([[1, 0], [0, 0]])).all()
+    assert np.isclose(z2.getRMatrix('psi', 'psi'), np.diag([-1, 0])).all()
+    assert np.isclose(z2.getFInvRF(1, 1, 1, 1), np.diag([-1, 0])).all()
+
+    # Saved models reload from a directory or a single archive with the precomputed tables
+    z2.save_symbols(str(tmp_path / 'saved'))
+    z2.save_symbols(str(tmp_path / 'saved.npz'))
+    for path in ('saved', 'saved.npz'):
+        reloaded = Model(AnyonModel.Custom, symbol_path=str(tmp_path / path))
+        assert np.isclose(reloaded.getFInvRFBatch(np.ones((3, 4), dtype=int)), z2.getFInvRF(1, 1, 1, 1)).all()
+        assert np.equal(reloaded._rules, z2._rules).all()
+
+@pytest.mark.model
+def test_custom_model_braid(tmp_path):
+    write_z2_symbols(tmp_path)
+    z2 = Model(AnyonModel.Custom, symbol_path=str(tmp_path))
+    state = State()
+    state.set_anyon_model(AnyonModel.Custom)
+    for i in range(3):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Psi), (i, 0)))
+
+    # Swaps are recorded, but custom anyons have no qubit encoding to build matrices on
+    braid = Braid(state, z2, debug=True)
+    braid.swap([(0, 1)])
+    with pytest.raises(ValueError, match='custom models'):
+        braid.generate_swap_matrix(1, 0)
+    with pytest.raises(ValueError, match='custom models'):
+        braid.unitary()
+    with pytest.raises(ValueError, match='custom models'):
+        BraidBatch(state, z2)
+
+@pytest.mark.model
+def test_custom_model_invalid(tmp_path):
+    with pytest.raises(ValueError, match='symbol_path'):
+        Model(AnyonModel.Custom)
+
+    write_z2_symbols(tmp_path)
+    os.remove(tmp_path / 'r_symbols.npy')
+    with pytest.raises(ValueError, match='r_symbols'):
+        Model(AnyonModel.Custom, symbol_path=str(tmp_path))
+
+    with pytest.raises(ValueError, match='Only custom models'):
+        Model(AnyonModel.Ising).save_symbols(str(tmp_path / 'ising'))
+
+@pytest.mark.model
+@pytest.mark.parametrize('model_type', [AnyonModel.Ising, AnyonModel.Fibonacci])
+def test_consistency(model_type):
+    report = Model(model_type, check_symbols=True).check_consistency()
+
+    assert report['consistent']
+    assert report['pentagon_residual'] < 1e-12
+    assert report['hexagon_residual'] < 1e-12
+    assert len(report['pentagon_violations']) == 0
+    assert len(report['hexagon_violations']) == 0
+    assert report['served_residual'] < 1e-12
+
+@pytest.mark.model
+def test_consistency_served_matrices():
+    # The check covers the R matrix braids are built from, not only the symbols
+    ising = Model(AnyonModel.Ising)
+    ising._r_mtx = ising._r_mtx.conj()
+    report = ising.check_consistency()
+    assert not report['consistent']
+    assert report['served_residual'] > 0.5
+    assert report['hexagon_residual'] < 1e-12
+
+@pytest.mark.model
+def test_consistency_violations(tmp_path):
+    write_z2_symbols(tmp_path)
+
+    # A braiding phase of i on psi x psi breaks the hexagon but not the pentagon
+    r_symbols = np.load(os.path.join(tmp_path, 'r_symbols.npy'))
+    r_symbols[1, 1, 0] = 1j
+    np.save(os.path.join(tmp_path, 'r_symbols.npy'), r_symbols)
+    with pytest.raises(ValueError, match='inconsistent'):
+        Model(AnyonModel.Custom, symbol_path=str(tmp_path), check_symbols=True)
+
+    # Loading does not check the symbols unless asked to
+    report = Model(AnyonModel.Custom, symbol_path=str(tmp_path)).check_consistency()
+    assert not report['consistent']
+    assert report['pentagon_residual'] < 1e-12
+    assert report['hexagon_residual'] > 0.5
+    assert report['hexagon_violations'].shape[1] == 6
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 from Simulator import Simulator
-from anyon_braiding_simulator import Anyon, TopoCharge, IsingTopoCharge
+from Model import Model
+from anyon_braiding_simulator import Anyon, AnyonModel, TopoCharge, IsingTopoCharge
 
 @pytest.mark.simulator
 def test_pairs_to_indices():
@@ -13,4 +15,58 @@ def test_pairs_to_indices():
     pairs = [("anyon1", "anyon2"), ("anyon2", "anyon3")]
     indices = simulator.pairs_to_indices(pairs)
 
-    assert indices == [(0, 1), (1, 2)]
\ No newline at end of file
+    assert indices == [(0, 1), (1, 2)]
+
+
+@pytest.mark.simulator
+def test_get_state():
+    simulator = Simulator()
+    simulator.set_model(Model(AnyonModel.Ising))
+    anyon1 = Anyon("anyon1", TopoCharge(IsingTopoCharge.Sigma), (1, 2))
+    anyon2 = Anyon("anyon2", TopoCharge(IsingTopoCharge.Psi), (3, 4))
+    simulator.update_anyons(True, [anyon1, anyon2])
+
+    state = simulator.get_state()
+    assert state.anyon_model == AnyonModel.Ising
+    assert [anyon.name for anyon in state.anyons] == ["anyon1", "anyon2"]
+    assert [anyon.charge.get_ising() for anyon in state.anyons] == [IsingTopoCharge.Sigma, IsingTopoCharge.Psi]
+    assert [anyon.position for anyon in state.anyons] == [(1, 2), (3, 4)]
+
+
+@pytest.mark.simulator
+def test_update_anyons():
+    simulator = Simulator()
+    anyons = [Anyon(f"anyon{i}", TopoCharge(IsingTopoCharge.Sigma), (i, 0)) for i in range(5)]
+    simulator.update_anyons(True, anyons)
+
+    # Duplicates within a batch or with the simulator add nothing
+    with pytest.raises(ValueError):
+        simulator.update_anyons(True, [Anyon("new", TopoCharge(IsingTopoCharge.Psi), (0, 0)), anyons[0]])
+    with pytest.raises(ValueError):
+        simulator.update_anyons(True, [Anyon("new", TopoCharge(IsingTopoCharge.Psi), (0, 0))] * 2)
+    assert not simulator.contains_anyon("new")
+
+    simulator.update_anyons(False, [anyons[1], anyons[3]])
+    assert [anyon.name for anyon in simulator.list_anyons()] == ["anyon0", "anyon2", "anyon4"]
+    assert simulator.get_anyon_index("anyon4") == 2
+    assert not simulator.contains_anyon("anyon1")
+    with pytest.raises(ValueError):
+        simulator.get_anyon_index("anyon3")
+
+    simulator.update_anyons(True, [anyons[3]])
+    assert simulator.get_anyon_index("anyon3") == 3
+    assert [anyon.position for anyon in simulator.get_state().anyons] == [(0, 0), (2, 0), (4, 0), (3, 0)]
+
+
+@pytest.mark.simulator
+def test_pairs_to_indices_large():
+    simulator = Simulator()
+    n = 100_000
+    simulator.update_anyons(True, [Anyon(f"{i}", TopoCharge(IsingTopoCharge.Sigma), (i, 0)) for i in range(n)])
+
+    pairs = np.random.default_rng(0).integers(0, n, size=(200_000, 2))
+    indices = simulator.pairs_to_indices([(str(a), str(b)) for a, b in pairs.tolist()])
+    assert indices == [tuple(pair) for pair in pairs.tolist()]
+
+    with pytest.raises(ValueError, match="missing"):
+        simulator.pairs_to_indices([("0", "1"), ("0", "missing")])
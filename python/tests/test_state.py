@@ -1,5 +1,14 @@
+import numpy as np
 import pytest
-from anyon_braiding_simulator.anyon_braiding_simulator import Anyon, FusionPair, IsingTopoCharge, State, TopoCharge
+from anyon_braiding_simulator.anyon_braiding_simulator import (
+    Anyon,
+    AnyonModel,
+    FibonacciTopoCharge,
+    FusionPair,
+    IsingTopoCharge,
+    State,
+    TopoCharge,
+)
 
 
 @pytest.fixture
@@ -35,3 +44,134 @@ def test_add_operation(state):
     assert state.add_operation(1, FusionPair(4, 5))
     assert state.add_operation(2, FusionPair(2, 4))
     assert state.add_operation(3, FusionPair(0, 2))
+
+
+@pytest.mark.state
+def test_add_operation_adjacency(state):
+    for i in range(4):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Sigma), (0, 0)))
+
+    # Anyon 1 is still between 0 and 2
+    assert not state.add_operation(1, FusionPair(0, 2))
+    assert not state.add_operation(1, FusionPair(0, 3))
+    assert not state.add_operation(1, FusionPair(2, 2))
+    assert not state.add_operation(1, FusionPair(2, 4))
+
+    assert state.add_operation(1, FusionPair(1, 2))
+    assert state.add_operation(2, FusionPair(0, 1))
+    assert not state.add_operation(2, FusionPair(1, 3))
+    assert state.add_operation(3, FusionPair(0, 3))
+
+
+@pytest.mark.state
+def test_add_operations(state):
+    for i in range(101):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Sigma), (0, 0)))
+
+    times = np.array([1, 1, 1, 1, 1, 2, 3])
+    pairs = np.array([[0, 1], [2, 3], [1, 2], [2, 4], [4, 5], [2, 4], [0, 2]])
+    added = state.add_operations(times, pairs)
+
+    assert added.tolist() == [True, True, False, False, True, True, True]
+    assert [(t, op.anyon_1, op.anyon_2) for t, op in state.operations] == [
+        (1, 0, 1),
+        (1, 2, 3),
+        (1, 4, 5),
+        (2, 2, 4),
+        (3, 0, 2),
+    ]
+
+    # The rest of the anyons fuse into 0 one at a time
+    assert state.add_operations(np.arange(4, 98), np.array([[0, i] for i in range(6, 100)])).all()
+    assert len(state.operations) == 99
+
+
+@pytest.mark.state
+def test_add_operations_invalid(state):
+    for i in range(4):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Sigma), (0, 0)))
+
+    with pytest.raises(ValueError):
+        state.add_operations(np.array([1, 1]), np.array([[0, 1]]))
+    with pytest.raises(ValueError):
+        state.add_operations(np.array([1]), np.array([[0, 1, 2]]))
+    with pytest.raises(ValueError):
+        state.add_operations(np.array([-1]), np.array([[0, 1]]))
+    with pytest.raises(ValueError):
+        state.add_operations(np.array([1]), np.array([[-1, 1]]))
+    assert len(state.operations) == 0
+
+
+@pytest.mark.state
+def test_snapshots(state):
+    for i in range(3):
+        state.add_anyon(Anyon(f'{i}', TopoCharge.from_ising(IsingTopoCharge.Sigma), (0, 0)))
+    state.add_operation(1, FusionPair(0, 1))
+
+    anyons = state.anyons
+    operations = state.operations
+    assert isinstance(anyons, tuple) and isinstance(operations, tuple)
+
+    # Reads share one snapshot until the state changes
+    assert state.anyons is anyons
+    assert state.operations is operations
+
+    state.add_anyon(Anyon('3', TopoCharge.from_ising(IsingTopoCharge.Sigma), (0, 0)))
+    state.add_operation(2, FusionPair(0, 2))
+    assert len(anyons) == 3 and len(state.anyons) == 4
+    assert len(operations) == 1 and len(state.operations) == 2
+
+
+@pytest.mark.state
+def test_from_arrays():
+    names = ['a', 'b', 'c']
+    charge_codes = np.array([int(IsingTopoCharge.Sigma), int(IsingTopoCharge.Psi), int(IsingTopoCharge.Vacuum)])
+    positions = np.array([[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]])
+    state = State.from_arrays(names, charge_codes, positions, AnyonModel.Ising)
+
+    assert state.anyon_model == AnyonModel.Ising
+    assert [anyon.name for anyon in state.anyons] == names
+    assert [anyon.charge.get_ising() for anyon in state.anyons] == [
+        IsingTopoCharge.Sigma,
+        IsingTopoCharge.Psi,
+        IsingTopoCharge.Vacuum,
+    ]
+    assert [anyon.position for anyon in state.anyons] == [(0, 1), (2, 3), (4, 5)]
+
+    # Operations are verified like on a state built one anyon at a time
+    assert not state.add_operation(1, FusionPair(0, 2))
+    assert state.add_operation(1, FusionPair(0, 1))
+    assert state.add_operation(2, FusionPair(0, 2))
+
+    state.add_anyon(Anyon('d', TopoCharge.from_ising(IsingTopoCharge.Sigma), (6, 7)))
+    assert state.add_operation(3, FusionPair(0, 3))
+
+
+@pytest.mark.state
+def test_from_arrays_large():
+    n = 200_000
+    state = State.from_arrays(
+        [f'{i}' for i in range(n)],
+        np.full(n, int(FibonacciTopoCharge.Tau)),
+        np.column_stack([np.arange(n, dtype=float), np.zeros(n)]),
+        AnyonModel.Fibonacci,
+    )
+
+    assert len(state.anyons) == n
+    assert state.anyons[-1].charge.get_fibonacci() == FibonacciTopoCharge.Tau
+    assert state.add_operations(np.arange(1, n), np.column_stack([np.zeros(n - 1, dtype=int), np.arange(1, n)])).all()
+
+
+@pytest.mark.state
+def test_from_arrays_invalid():
+    positions = np.zeros((2, 2))
+    with pytest.raises(ValueError):
+        State.from_arrays(['a'], np.array([0, 0]), positions, AnyonModel.Ising)
+    with pytest.raises(ValueError):
+        State.from_arrays(['a', 'b'], np.array([0, 0]), np.zeros((2, 3)), AnyonModel.Ising)
+    with pytest.raises(ValueError):
+        State.from_arrays(['a', 'b'], np.array([0, 2]), positions, AnyonModel.Fibonacci)
+    with pytest.raises(ValueError):
+        State.from_arrays(['a', 'b'], np.array([-1, 0]), positions, AnyonModel.Ising)
+    with pytest.raises(ValueError):
+        State.from_arrays(['a', 'b'], np.array([0, 0]), positions, AnyonModel.Custom)
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 from anyon_braiding_simulator.anyon_braiding_simulator import StateVec
@@ -39,3 +41,108 @@ def test_state_vec_norm():
 def test_state_vec_str():
     state_vec = StateVec(1, np.array([1, 0], dtype=complex))
     assert str(state_vec) == '[\n\t1.0 + 0.0i\n\t0.0 + 0.0i\n]'
+
+
+@pytest.mark.state_vec
+def test_state_vec_apply_single_qubit():
+    state_vec = StateVec(2, None)
+    pauli_x = np.array([[0, 1], [1, 0]], dtype=complex)
+
+    # qubit 0 is the most significant bit of the amplitude index
+    state_vec.apply_single_qubit(pauli_x, 0)
+    assert np.allclose(state_vec.vec, [0, 0, 1, 0])
+
+    state_vec.apply_single_qubit(pauli_x, 1)
+    assert np.allclose(state_vec.vec, [0, 0, 0, 1])
+
+    with pytest.raises(ValueError):
+        state_vec.apply_single_qubit(pauli_x, 2)
+
+
+@pytest.mark.state_vec
+def test_state_vec_apply_two_qubit():
+    cnot = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+    state_vec = StateVec(2, np.array([0, 0, 1, 0], dtype=complex))
+
+    # the first target is the control of the CNOT
+    state_vec.apply_two_qubit(cnot, 0, 1)
+    assert np.allclose(state_vec.vec, [0, 0, 0, 1])
+
+    state_vec.apply_two_qubit(cnot, 1, 0)
+    assert np.allclose(state_vec.vec, [0, 1, 0, 0])
+
+    with pytest.raises(ValueError):
+        state_vec.apply_two_qubit(cnot, 1, 1)
+
+
+@pytest.mark.state_vec
+def test_state_vec_view():
+    state_vec = StateVec(1, None)
+
+    # vec is a view of the register, so writes are visible to the state vector
+    view = state_vec.vec
+    view[:] = [0, 1]
+    assert str(state_vec) == '[\n\t0.0 + 0.0i\n\t1.0 + 0.0i\n]'
+
+    # copy() detaches the amplitudes
+    snapshot = state_vec.copy()
+    state_vec.apply_single_qubit(np.array([[0, 1], [1, 0]], dtype=complex), 0)
+    assert np.allclose(view, [1, 0])
+    assert np.allclose(snapshot.vec, [0, 1])
+
+
+@pytest.mark.state_vec
+def test_state_vec_from_numpy():
+    amps = np.array([1, 0, 0, 0], dtype=complex)
+
+    shared = StateVec.from_numpy(amps, copy=False)
+    copied = StateVec.from_numpy(amps)
+    shared.apply_single_qubit(np.array([[0, 1], [1, 0]], dtype=complex), 1)
+
+    assert np.allclose(amps, [0, 1, 0, 0])
+    assert np.shares_memory(shared.vec, amps)
+    assert np.allclose(copied.vec, [1, 0, 0, 0])
+
+    with pytest.raises(ValueError):
+        StateVec.from_numpy(np.zeros(8, dtype=complex)[::2], copy=False)
+
+
+@pytest.mark.state_vec
+def test_state_vec_set_vec():
+    state_vec = StateVec(1, None)
+    view = state_vec.vec
+
+    # A vector of the same length is written into the existing storage
+    state_vec.vec = np.array([0, 1], dtype=complex)
+    assert np.allclose(view, [0, 1])
+
+    # A new length reallocates the register and resizes it
+    state_vec.vec = np.array([0, 0, 0, 1], dtype=complex)
+    assert state_vec.init_size == 4
+    state_vec.apply_single_qubit(np.array([[0, 1], [1, 0]], dtype=complex), 1)
+    assert np.allclose(state_vec.vec, [0, 0, 1, 0])
+    assert np.allclose(view, [0, 1])
+
+    with pytest.raises(ValueError):
+        state_vec.vec = np.zeros(3, dtype=complex)
+    assert state_vec.init_size == 4
+
+
+@pytest.mark.state_vec
+def test_state_vec_threads():
+    pauli_x = np.array([[0, 1], [1, 0]], dtype=complex)
+    registers = [StateVec(14, None) for _ in range(4)]
+
+    def flip(target):
+        state_vec = registers[target]
+        for _ in range(2 * target + 1):
+            state_vec.apply_single_qubit(pauli_x, target)
+
+    # Kernels release the GIL, so each thread updates its own register concurrently
+    with ThreadPoolExecutor(len(registers)) as pool:
+        list(pool.map(flip, range(len(registers))))
+    for target, state_vec in enumerate(registers):
+        assert state_vec.vec[1 << (13 - target)] == 1
+
+    # The register is writable again once a kernel has finished
+    assert all(state_vec.vec.flags.writeable for state_vec in registers)
@@ -1,2 +1,5 @@
+pub mod dimension;
 pub mod fusion;
+pub mod rules;
 pub mod state;
+pub mod tree;
@@ -0,0 +1,167 @@
+use crate::fusion::rules::FusionRules;
+use num_bigint::BigUint;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+
+/// Square matrix of exact multiplicities
+type Matrix = Vec<Vec<BigUint>>;
+
+/// The transfer matrix of fusing in one anyon of the given charge, i.e.
+/// T[x][y] = N_{x charge}^y. A row vector of sector dimensions times T gives
+/// the sector dimensions with that anyon added.
+fn transfer_matrix(rules: &FusionRules, charge: usize) -> Matrix {
+    let r = rules.num_charges();
+    (0..r)
+        .map(|x| {
+            (0..r)
+                .map(|y| BigUint::from(rules.multiplicity(x, charge, y)))
+                .collect()
+        })
+        .collect()
+}
+
+fn identity(r: usize) -> Matrix {
+    (0..r)
+        .map(|x| (0..r).map(|y| BigUint::from((x == y) as u64)).collect())
+        .collect()
+}
+
+fn mat_mul(a: &Matrix, b: &Matrix) -> Matrix {
+    let r = a.len();
+    let mut output = vec![vec![BigUint::default(); r]; r];
+    for x in 0..r {
+        for k in 0..r {
+            if a[x][k].bits() == 0 {
+                continue;
+            }
+            for y in 0..r {
+                if b[k][y].bits() > 0 {
+                    output[x][y] += &a[x][k] * &b[k][y];
+                }
+            }
+        }
+    }
+    output
+}
+
+fn vec_mul(v: &[BigUint], m: &Matrix) -> Vec<BigUint> {
+    let r = v.len();
+    let mut output = vec![BigUint::default(); r];
+    for (x, v_x) in v.iter().enumerate() {
+        if v_x.bits() == 0 {
+            continue;
+        }
+        for y in 0..r {
+            if m[x][y].bits() > 0 {
+                output[y] += v_x * &m[x][y];
+            }
+        }
+    }
+    output
+}
+
+/// m^n by repeated squaring, taking O(log n) matrix products
+fn mat_pow(m: &Matrix, mut n: u64) -> Matrix {
+    let mut result = identity(m.len());
+    let mut base = m.clone();
+    while n > 0 {
+        if n & 1 == 1 {
+            result = mat_mul(&result, &base);
+        }
+        n >>= 1;
+        if n > 0 {
+            base = mat_mul(&base, &base);
+        }
+    }
+    result
+}
+
+/// Sector dimensions of the vacuum fused with nothing, i.e. the starting row
+/// vector of every transfer matrix product
+fn vacuum_dimensions(rules: &FusionRules) -> PyResult<Vec<BigUint>> {
+    let vacuum = rules
+        .vacuum()
+        .ok_or_else(|| PyValueError::new_err("The fusion rules have no vacuum charge"))?;
+    Ok((0..rules.num_charges())
+        .map(|c| BigUint::from((c == vacuum) as u64))
+        .collect())
+}
+
+/// Dimension of the fusion space of each total charge sector, for a multiset
+/// of anyons given as the number of anyons of each charge. Each charge
+/// contributes a power of its transfer matrix, so this takes O(log n)
+/// products per charge.
+pub fn sector_dimensions(rules: &FusionRules, counts: &[u64]) -> PyResult<Vec<BigUint>> {
+    if counts.len() != rules.num_charges() {
+        return Err(PyValueError::new_err(format!(
+            "Anyon counts must have length {}",
+            rules.num_charges()
+        )));
+    }
+
+    let mut dimensions = vacuum_dimensions(rules)?;
+    for (charge, &count) in counts.iter().enumerate() {
+        if count > 0 {
+            dimensions = vec_mul(&dimensions, &mat_pow(&transfer_matrix(rules, charge), count));
+        }
+    }
+    Ok(dimensions)
+}
+
+/// Numbers of anyons of the given charge whose fusion space has a total
+/// charge sector of dimension in [2^qubits, 2^(qubits + 1)), i.e. a sector
+/// that holds exactly `qubits` qubits
+pub fn qubit_anyon_counts(rules: &FusionRules, charge: usize, qubits: u64) -> PyResult<Vec<u64>> {
+    let transfer = transfer_matrix(rules, charge);
+
+    // Abelian charges only ever have one dimensional sectors
+    if transfer.iter().all(|row| row.iter().sum::<BigUint>() == BigUint::from(1u64)) {
+        return Err(PyValueError::new_err(
+            "Anyons of an abelian charge cannot encode qubits",
+        ));
+    }
+
+    let start = vacuum_dimensions(rules)?;
+    let total_bits = |n: u64| -> u64 {
+        vec_mul(&start, &mat_pow(&transfer, n))
+            .iter()
+            .sum::<BigUint>()
+            .bits()
+    };
+
+    // Every sector is at most the total dimension, which never decreases, so
+    // skip to the first n whose total reaches 2^qubits by exponential then
+    // binary search
+    let mut high = 1;
+    while total_bits(high) <= qubits {
+        high *= 2;
+    }
+    let mut low = 0;
+    while low < high {
+        let mid = low + (high - low) / 2;
+        if total_bits(mid) <= qubits {
+            low = mid + 1;
+        } else {
+            high = mid;
+        }
+    }
+
+    // Step one anyon at a time until every non-empty sector is too large. A
+    // non-empty sector only feeds sectors at least as large, so none can
+    // shrink back into range afterwards
+    let mut counts = Vec::new();
+    let mut n = low;
+    let mut dimensions = vec_mul(&start, &mat_pow(&transfer, n));
+    loop {
+        if dimensions.iter().any(|d| d.bits() == qubits + 1) {
+            counts.push(n);
+        }
+        if dimensions.iter().all(|d| d.bits() == 0 || d.bits() > qubits + 1) {
+            break;
+        }
+        dimensions = vec_mul(&dimensions, &transfer);
+        n += 1;
+    }
+
+    Ok(counts)
+}
@@ -1,13 +1,22 @@
 use std::collections::HashMap;
+use std::sync::OnceLock;
 
+use crate::fusion::dimension::{qubit_anyon_counts, sector_dimensions};
+use crate::fusion::rules::{ChargeMask, ChargeVec, FusionMode, FusionRules, MAX_CHARGES};
 use crate::fusion::state::State;
+use crate::fusion::tree::{FusionTree, FusionTreeSpace, FusionTrees};
 use crate::model::anyon::FibonacciTopoCharge;
 use crate::model::anyon::IsingTopoCharge;
 use crate::model::anyon::TopoCharge;
 use crate::model::model::AnyonModel;
-use crate::util::basis::Basis;
-use pyo3::exceptions::PyValueError;
+use crate::util::basis::{verify_fusion_order, Basis};
+use num_bigint::BigUint;
+use numpy::ndarray::Array2;
+use numpy::prelude::*;
+use numpy::{PyArray1, PyArray2, PyReadonlyArray2, PyReadonlyArray3};
+use pyo3::exceptions::{PyOverflowError, PyValueError};
 use pyo3::prelude::*;
+use rayon::prelude::*;
 
 #[pyclass]
 #[derive(Clone, Debug, PartialEq, Hash, Eq, Ord, PartialOrd)]
@@ -36,7 +45,7 @@ impl FusionPair {
 #[pymethods]
 impl FusionPair {
     #[new]
-    fn new(anyon_1: usize, anyon_2: usize) -> Self {
+    pub fn new(anyon_1: usize, anyon_2: usize) -> Self {
         FusionPair { anyon_1, anyon_2 }
     }
 
@@ -49,58 +58,64 @@ impl FusionPair {
 /// Stores the state of the system and all fusion operations that occur in the
 /// fusion tree. The vector is 2D, where the outer vector represents the time
 /// step and the inner vector represents the fusion operations that occur at
-/// that time step.
+/// that time step. The operations are also kept as an arena tree for
+/// constant and logarithmic time adjacency queries.
 pub struct Fusion {
     state: State,
     ops: Vec<Vec<FusionPair>>,
+    tree: FusionTree,
+    qubit_encoding: OnceLock<QubitEncoding>,
+    rules: FusionRules,
+}
+
+/// The qubit encoding of a fusion tree along with a lookup from the (sorted)
+/// anyon indices of each encoding FusionPair to its qubit index. Fusion owns a
+/// snapshot of the state, so the encoding is computed on first use and never
+/// needs to be invalidated.
+struct QubitEncoding {
+    pairs: Vec<FusionPair>,
+    qubit_index: HashMap<(usize, usize), usize>,
 }
 
 /// Internal Methods
 impl Fusion {
     /// Converts from IsingTopoCharge to internal format
     /// Format is [psi, vacuum, sigma]  (so we can use the index as the encode)
-    pub fn ising_canonical_topo_charge(&self, charge: IsingTopoCharge) -> Vec<u64> {
-        match charge {
-            IsingTopoCharge::Psi => vec![1, 0, 0],
-            IsingTopoCharge::Vacuum => vec![0, 1, 0],
-            IsingTopoCharge::Sigma => vec![0, 0, 1],
-        }
+    pub fn ising_canonical_topo_charge(&self, charge: IsingTopoCharge) -> ChargeVec {
+        self.rules.unit(charge.value())
     }
 
     /// Converts from FibonacciTopoCharge to internal format
     /// Format is [tau, vacuum]  (so we can use the index as the encode)
-    pub fn fibonacci_canonical_topo_charge(&self, charge: FibonacciTopoCharge) -> Vec<u64> {
-        match charge {
-            FibonacciTopoCharge::Tau => vec![1, 0],
-            FibonacciTopoCharge::Vacuum => vec![0, 1],
-        }
+    pub fn fibonacci_canonical_topo_charge(&self, charge: FibonacciTopoCharge) -> ChargeVec {
+        self.rules.unit(charge.value())
     }
 
     /// Creates a qubit encoding for the Ising model from the fusion tree. The encoding is a list of
     /// FusionPairs that represent the anyons that are fused to create the qubit
     /// encoding.
     pub fn ising_qubit_enc(&self) -> Vec<FusionPair> {
-        let mut tcs: Vec<Vec<u64>> = self
+        let mut tcs: Vec<ChargeVec> = self
             .state
             .anyons()
+            .charges()
             .iter()
-            .map(|a| self.ising_canonical_topo_charge(a.charge().get_ising()))
+            .map(|charge| self.ising_canonical_topo_charge(charge.get_ising()))
             .collect();
-        let mut fusion_pair_tc: HashMap<FusionPair, Vec<u64>> = HashMap::new();
+        let mut fusion_pair_tc: HashMap<FusionPair, ChargeVec> = HashMap::new();
 
-        let mut final_tc: Vec<u64> = vec![0, 0, 0];
+        let mut final_tc: ChargeVec = [0; MAX_CHARGES];
 
         for (i, op) in self.ops.iter().enumerate() {
             for (j, fusion_pair) in op.iter().enumerate() {
-                let tc = self.ising_apply_fusion(
-                    tcs[fusion_pair.anyon_1()].clone(),
-                    tcs[fusion_pair.anyon_2()].clone(),
-                );
+                let tc = self
+                    .rules
+                    .fuse(&tcs[fusion_pair.anyon_1()], &tcs[fusion_pair.anyon_2()]);
                 if i == self.ops.len() - 1 && j == op.len() - 1 {
                     final_tc = tc;
                     break;
                 }
-                fusion_pair_tc.insert(fusion_pair.clone(), tc.clone());
+                fusion_pair_tc.insert(fusion_pair.clone(), tc);
                 tcs[fusion_pair.anyon_1()] = tc;
             }
         }
@@ -128,25 +143,25 @@ impl Fusion {
     /// FusionPairs that represent the anyons that are fused to create the qubit
     /// encoding.
     pub fn fibonacci_qubit_enc(&self) -> Vec<FusionPair> {
-        let mut tcs: Vec<Vec<u64>> = self
+        let mut tcs: Vec<ChargeVec> = self
             .state
             .anyons()
+            .charges()
             .iter()
-            .map(|a| self.fibonacci_canonical_topo_charge(a.charge().get_fibonacci()))
+            .map(|charge| self.fibonacci_canonical_topo_charge(charge.get_fibonacci()))
             .collect();
-        let mut fusion_pair_tc: HashMap<FusionPair, Vec<u64>> = HashMap::new();
+        let mut fusion_pair_tc: HashMap<FusionPair, ChargeVec> = HashMap::new();
 
 
         for (i, op) in self.ops.iter().enumerate() {
             for (j, fusion_pair) in op.iter().enumerate() {
-                let tc = self.fibonacci_apply_fusion(
-                    tcs[fusion_pair.anyon_1()].clone(),
-                    tcs[fusion_pair.anyon_2()].clone(),
-                );
+                let tc = self
+                    .rules
+                    .fuse(&tcs[fusion_pair.anyon_1()], &tcs[fusion_pair.anyon_2()]);
                 if i == self.ops.len() - 1 && j == op.len() - 1 {
                     break;
                 }
-                fusion_pair_tc.insert(fusion_pair.clone(), tc.clone());
+                fusion_pair_tc.insert(fusion_pair.clone(), tc);
                 tcs[fusion_pair.anyon_1()] = tc;
             }
         }
@@ -164,174 +179,164 @@ impl Fusion {
         encoding_fusions
     }
 
-    /// Applies the fusion rules to two anyons and returns the resulting anyon(s).
-    pub fn ising_apply_fusion(&self, anyon_1: Vec<u64>, anyon_2: Vec<u64>) -> Vec<u64> {
-        assert!(anyon_1.len() == 3 && anyon_2.len() == 3);
-
-        let add = |a: [u64; 3], b: [u64; 3]| -> [u64; 3] { std::array::from_fn(|i| a[i] + b[i]) };
-        let arr_scale = |a: [u64; 3], b: u64| -> [u64; 3] { std::array::from_fn(|i| a[i] * b) };
-
-        let mut output = [0 as u64; 3];
-
-        // ising fusion rules
-        // symmetric matrix which is built from fusion rules of (psi, 1, sigma) ^ (psi, 1, sigma)
-        let fusion_rules_mtx: [[[u64; 3]; 3]; 3] = [
-            [[0, 1, 0], [1, 0, 0], [0, 0, 1]],
-            [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
-            [[0, 0, 1], [0, 0, 1], [1, 1, 0]],
-        ];
-
-        // build the outer product of the two tc vectors
-        let mut tc_mtx = [[0; 3]; 3];
-        for i in 0..tc_mtx.len() {
-            for j in 0..tc_mtx[i].len() {
-                tc_mtx[i][j] = anyon_1[i] * anyon_2[j];
-            }
+    /// Returns the cached qubit encoding, building it on the first call
+    fn qubit_encoding(&self) -> PyResult<&QubitEncoding> {
+        if let Some(encoding) = self.qubit_encoding.get() {
+            return Ok(encoding);
         }
 
-        // mtx multiply fusion rules with tc_mtx
-        for i in 0..3 {
-            for j in 0..3 {
-                output = add(output, arr_scale(fusion_rules_mtx[i][j], tc_mtx[i][j]));
-            }
-        }
+        let pairs = match self.state.anyon_model() {
+            AnyonModel::Ising => self.ising_qubit_enc(),
+            AnyonModel::Fibonacci => self.fibonacci_qubit_enc(),
+            _ => return Err(PyValueError::new_err("This model is not supported yet")),
+        };
+        let qubit_index = pairs
+            .iter()
+            .enumerate()
+            .map(|(i, pair)| (pair_key(pair.anyon_1(), pair.anyon_2()), i))
+            .collect();
 
-        Vec::from(output)
+        Ok(self.qubit_encoding.get_or_init(|| QubitEncoding { pairs, qubit_index }))
     }
-    /// Applies the fusion rules to two anyones and returns the resulting anyon(s).
-    pub fn fibonacci_apply_fusion(&self, anyon_1: Vec<u64>, anyon_2: Vec<u64>) -> Vec<u64> {
-        assert!(anyon_1.len() == 2 && anyon_2.len() == 2);
 
-        let add = |a: [u64; 2], b: [u64; 2]| -> [u64; 2] { std::array::from_fn(|i| a[i] + b[i]) };
-        let arr_scale = |a: [u64; 2], b: u64| -> [u64; 2] { std::array::from_fn(|i| a[i] * b) };
-
-        let mut output = [0 as u64; 2];
-
-        // ising fusion rules
-        // symmetric matrix which is built from fusion rules of (tau, 1) ^ (tau, 1)
-        let fusion_rules_mtx: [[[u64; 2]; 2]; 2] = [[[1, 1], [1, 0]], [[1, 0], [0, 1]]];
-
-        // build the outer product of the two tc vectors
-        let mut tc_mtx = [[0; 2]; 2];
-        for i in 0..2 {
-            for j in 0..2 {
-                tc_mtx[i][j] = anyon_1[i] * anyon_2[j];
-            }
-        }
-
-        // mtx multiply fusion rules with tc_mtx
-        for i in 0..2 {
-            for j in 0..2 {
-                output = add(output, arr_scale(fusion_rules_mtx[i][j], tc_mtx[i][j]));
-            }
+    /// Index of a topological charge in the model's charge vectors, or None
+    /// for models whose charges TopoCharge cannot represent
+    fn charge_index(&self, charge: &TopoCharge) -> Option<usize> {
+        match self.state.anyon_model() {
+            AnyonModel::Ising => Some(charge.get_ising().value()),
+            AnyonModel::Fibonacci => Some(charge.get_fibonacci().value()),
+            AnyonModel::Custom => None,
         }
-
-        Vec::from(output)
     }
 
     /// Checks if an overall fusion result is possible given the state's
-    /// configuration and an initial topo charge under the Ising model
-    ///
-    /// Precondition: Non empty list of anyons
-    pub fn ising_verify_fusion_result(&self, init_charge: IsingTopoCharge) -> bool {
-        let overall_fusion_result: Vec<u64> = self
+    /// configuration and the index of an initial topo charge. Support mode
+    /// only tracks which charges are reachable, so it never overflows; count
+    /// mode raises OverflowError past u64 multiplicities.
+    pub fn verify_fusion_result_index(&self, init_charge: usize, mode: FusionMode) -> PyResult<bool> {
+        let charges: Vec<usize> = self
             .state
             .anyons()
+            .charges()
             .iter()
-            .map(|a| self.ising_canonical_topo_charge(a.charge().get_ising()))
-            .reduce(|acc, tc| self.ising_apply_fusion(acc, tc))
-            .unwrap();
-
-        // if an element > 0 that means it was our initial charge, so we need to
-        // check if our final fusion result also has that element > 0
-        overall_fusion_result
-            .iter()
-            .zip(self.ising_canonical_topo_charge(init_charge).iter())
-            .all(|(a, b)| *b <= 0 || *a > 0)
-    }
-
-    /// Checks if an overall fusion result is possible given the state's
-    /// configuration and an initial topo charge under the Fibonacci model
-    ///
-    /// Precondition: Non empty list of anyons
-    pub fn fibonacci_verify_fusion_result(&self, init_charge: FibonacciTopoCharge) -> bool {
-        let overall_fusion_result: Vec<u64> = self
-            .state
-            .anyons()
-            .iter()
-            .map(|a| self.fibonacci_canonical_topo_charge(a.charge().get_fibonacci()))
-            .reduce(|acc, tc| self.fibonacci_apply_fusion(acc, tc))
-            .unwrap();
-
-        // if an element > 0 that means it was our initial charge, so we need to
-        // check if our final fusion result also has that element > 0
-        overall_fusion_result
-            .iter()
-            .zip(self.fibonacci_canonical_topo_charge(init_charge).iter())
-            .all(|(a, b)| *b <= 0 || *a > 0)
-    }
-
-    ///
-    /// Returns number of sigmas that can be in the initial topological charges of anyons to exactly a certain number of qubits for the Ising model
-    ///
-    pub fn ising_possible_sigmas(&self, qubits: u32) -> Vec<u32> {
-        vec![2 * qubits + 1, 2 * qubits + 2]
-    }
-    ///
-    /// Returns number of taus that can be in the initial topological charges of anyons to exactly a certain number of qubits for the Fibonacci model
-    ///
-    /// Precondition: Requires qubits <=30
-    pub fn fibonacci_possible_taus(&self, qubits: u32) -> Vec<u32> {
-        if qubits == 0 {
-            return vec![0, 1, 2, 3];
+            .filter_map(|charge| self.charge_index(charge))
+            .collect();
+        if charges.is_empty() {
+            return Err(PyValueError::new_err("There are no anyons to fuse"));
         }
 
-        let mut possible_taus = Vec::new();
-
-        let mut n = 1;
-
-        // We have that the fibonacci recurrence gives us that tau^n = a + b * tau
-        let mut a = 0;
-        let mut b = 1;
+        match mode {
+            FusionMode::Support => {
+                let overall: ChargeMask = charges
+                    .iter()
+                    .map(|&c| 1 << c)
+                    .reduce(|acc, mask| self.rules.fuse_support(acc, mask))
+                    .unwrap();
+                Ok(overall & (1 << init_charge) != 0)
+            }
+            FusionMode::Count => {
+                let mut overall = self.rules.unit(charges[0]);
+                for &c in &charges[1..] {
+                    overall = self
+                        .rules
+                        .checked_fuse(&overall, &self.rules.unit(c))
+                        .ok_or_else(overflow_error)?;
+                }
+                Ok(overall[init_charge] > 0)
+            }
+            FusionMode::Exact => {
+                let unit = |c: usize| -> Vec<BigUint> {
+                    (0..self.rules.num_charges())
+                        .map(|i| BigUint::from((i == c) as u64))
+                        .collect()
+                };
+                let overall = charges[1..]
+                    .iter()
+                    .fold(unit(charges[0]), |acc, &c| self.rules.fuse_exact(&acc, &unit(c)));
+                Ok(overall[init_charge].bits() > 0)
+            }
+        }
+    }
 
-        // Checks that b < 2^(qubits+1) meaning as otherwise fusing to tau would result in too many qubits
-        while b < 1 << (qubits + 1) {
-            // If b >= 2^qubits we have that this will give exactly 'qubits' qubits
-            if (1 << (qubits)) <= b {
-                possible_taus.push(n);
+    /// The charge whose anyons encode qubits, i.e. sigma for Ising and tau
+    /// for Fibonacci. For custom models this is the charge with the largest
+    /// total fusion multiplicity, which is the most non-abelian one
+    fn computational_charge(&self) -> usize {
+        match self.state.anyon_model() {
+            AnyonModel::Ising => IsingTopoCharge::Sigma.value(),
+            AnyonModel::Fibonacci => FibonacciTopoCharge::Tau.value(),
+            AnyonModel::Custom => {
+                let r = self.rules.num_charges();
+                (0..r)
+                    .max_by_key(|&c| {
+                        (0..r)
+                            .flat_map(|a| (0..r).map(move |b| (a, b)))
+                            .map(|(a, b)| self.rules.multiplicity(a, c, b))
+                            .sum::<u64>()
+                    })
+                    .unwrap()
             }
+        }
+    }
+}
 
-            b = a + b;
-            a = b - a;
+fn overflow_error() -> PyErr {
+    PyOverflowError::new_err("Fusion multiplicities overflowed u64, use mode='exact'")
+}
 
-            n += 1;
-        }
-        // Accounts for the case that we can also fuse to vaccuum
-        possible_taus.push(n);
-        possible_taus
+fn check_anyons(tree: &FusionTree, anyon_1: usize, anyon_2: usize) -> PyResult<()> {
+    if anyon_1.max(anyon_2) >= tree.num_leaves() {
+        return Err(PyValueError::new_err("Anyon index out of range"));
     }
+    Ok(())
+}
+
+/// Orders a pair of anyon indices so lookups are independent of swap direction
+fn pair_key(anyon_1: usize, anyon_2: usize) -> (usize, usize) {
+    (anyon_1.min(anyon_2), anyon_1.max(anyon_2))
 }
 
 /// Python Facing Methods
 #[pymethods]
 impl Fusion {
     #[new]
-    fn new(state: State) -> Self {
-        let operations = state.operations();
+    #[pyo3(signature = (state, fusion_rules=None))]
+    fn new(state: State, fusion_rules: Option<PyReadonlyArray3<i64>>) -> PyResult<Self> {
+        let rules = match (state.anyon_model(), fusion_rules) {
+            (AnyonModel::Ising, None) => FusionRules::ising(),
+            (AnyonModel::Fibonacci, None) => FusionRules::fibonacci(),
+            (AnyonModel::Custom, Some(rules)) => FusionRules::from_array(rules.as_array())?,
+            (AnyonModel::Custom, None) => {
+                return Err(PyValueError::new_err("Custom models require fusion rules"))
+            }
+            (_, Some(_)) => {
+                return Err(PyValueError::new_err(
+                    "Fusion rules can only be given for custom models",
+                ))
+            }
+        };
 
         let mut ops: Vec<Vec<FusionPair>> = Vec::new();
 
         let mut prev_time = 0;
-        for (time, op) in operations {
-            if prev_time == time {
-                ops[time as usize - 1].push(op);
+        for (time, op) in state.operations() {
+            if prev_time == *time {
+                ops[*time as usize - 1].push(op.clone());
             } else {
-                ops.push(vec![op]);
-                prev_time = time;
+                ops.push(vec![op.clone()]);
+                prev_time = *time;
             }
         }
 
-        Fusion { state, ops }
+        let tree = FusionTree::from_ops(state.anyons().len(), &ops)?;
+
+        Ok(Fusion {
+            state,
+            ops,
+            tree,
+            qubit_encoding: OnceLock::new(),
+            rules,
+        })
     }
 
     /// Verifies the basis
@@ -339,12 +344,94 @@ impl Fusion {
         Ok(basis.verify_basis(self.state.anyons().len()))
     }
 
+    /// Verifies a batch of bases given as a (B, n - 1, 3) array of
+    /// (time, anyon_1, anyon_2) rows, each sorted by time. The bases are
+    /// verified in parallel without the GIL, returning a (B,) mask of which
+    /// are valid
+    fn verify_bases<'py>(
+        &self,
+        py: Python<'py>,
+        bases: PyReadonlyArray3<i64>,
+    ) -> PyResult<Bound<'py, PyArray1<bool>>> {
+        let anyons = self.state.anyons().len();
+        let bases = bases.as_array();
+        let (batch, num_ops, columns) = bases.dim();
+        if anyons == 0 || num_ops != anyons - 1 || columns != 3 {
+            return Err(PyValueError::new_err(format!(
+                "Bases must have shape (B, {}, 3)",
+                anyons.saturating_sub(1)
+            )));
+        }
+
+        // A single anyon needs no fusions, so every (empty) basis is valid
+        if num_ops == 0 {
+            return Ok(PyArray1::from_vec_bound(py, vec![true; batch]));
+        }
+
+        let bases = bases.as_standard_layout();
+        let rows = bases.as_slice().unwrap();
+        let valid = py.allow_threads(|| {
+            rows.par_chunks(3 * num_ops)
+                .map(|basis| {
+                    let ops = basis.chunks_exact(3).map(|row| (row[0], row[1], row[2]));
+                    verify_fusion_order(anyons, num_ops, ops)
+                })
+                .collect::<Vec<bool>>()
+        });
+
+        Ok(PyArray1::from_vec_bound(py, valid))
+    }
+
     fn qubit_enc(&self) -> PyResult<Vec<FusionPair>> {
-        match self.state.anyon_model() {
-            AnyonModel::Ising => Ok(self.ising_qubit_enc()),
-            AnyonModel::Fibonacci => Ok(self.fibonacci_qubit_enc()),
-            _ => Err(PyValueError::new_err("This model is not supported yet")),
+        Ok(self.qubit_encoding()?.pairs.clone())
+    }
+
+    /// Returns the qubit encoded by fusing the two anyons, or None if the pair
+    /// is not part of the qubit encoding. The order of the indices does not
+    /// matter
+    fn qubit_index(&self, anyon_1: usize, anyon_2: usize) -> PyResult<Option<usize>> {
+        Ok(self
+            .qubit_encoding()?
+            .qubit_index
+            .get(&pair_key(anyon_1, anyon_2))
+            .copied())
+    }
+
+    /// Checks if two anyons are fused with each other directly, i.e. they can
+    /// be swapped with a single R move
+    fn are_siblings(&self, anyon_1: usize, anyon_2: usize) -> PyResult<bool> {
+        check_anyons(&self.tree, anyon_1, anyon_2)?;
+        Ok(self.tree.are_siblings(anyon_1, anyon_2))
+    }
+
+    /// Returns the fusion operation where the branches of two anyons meet, or
+    /// None if they are never fused together
+    fn separating_fusion(&self, anyon_1: usize, anyon_2: usize) -> PyResult<Option<FusionPair>> {
+        check_anyons(&self.tree, anyon_1, anyon_2)?;
+        if anyon_1 == anyon_2 {
+            return Ok(None);
         }
+        let n = self.tree.num_leaves();
+        Ok(self
+            .tree
+            .lca(anyon_1, anyon_2)
+            .map(|node| self.tree.fusion(node - n).clone()))
+    }
+
+    /// Returns the qubit encoded by the fusion where the branches of two
+    /// anyons meet, or None if that fusion does not encode a qubit
+    fn separating_qubit(&self, anyon_1: usize, anyon_2: usize) -> PyResult<Option<usize>> {
+        match self.separating_fusion(anyon_1, anyon_2)? {
+            Some(pair) => self.qubit_index(pair.anyon_1(), pair.anyon_2()),
+            None => Ok(None),
+        }
+    }
+
+    /// Returns the number of F-moves needed to make two anyons siblings, or
+    /// None if they are never fused together
+    fn f_move_distance(&self, anyon_1: usize, anyon_2: usize) -> PyResult<Option<usize>> {
+        check_anyons(&self.tree, anyon_1, anyon_2)?;
+        Ok(self.tree.f_move_distance(anyon_1, anyon_2))
     }
 
     /// Builds the fusion tree's graphical representation
@@ -352,13 +439,13 @@ impl Fusion {
         // call state's get_anyons
         let anyons = self.state.anyons();
 
-        let mut active_anyons: Vec<bool> = anyons.iter().map(|_| true).collect();
+        let mut active_anyons: Vec<bool> = vec![true; anyons.len()];
 
         // Anyon names
-        let top_level: String = anyons.iter().map(|a| format!("{} ", (*a).name())).collect();
+        let top_level: String = anyons.names().iter().map(|name| format!("{} ", name)).collect();
 
         // Anyon levels
-        let level_2: String = anyons.iter().map(|_| format!("| ")).collect();
+        let level_2: String = "| ".repeat(anyons.len());
 
         let mut body: String = String::new();
 
@@ -396,28 +483,158 @@ impl Fusion {
         Ok(format!("{}\n{}\n{}{}", top_level, level_2, body, last_time).to_string())
     }
 
-    fn apply_fusion(&self, anyon_1: Vec<u64>, anyon_2: Vec<u64>) -> PyResult<Vec<u64>> {
-        match self.state.anyon_model() {
-            AnyonModel::Ising => Ok(self.ising_apply_fusion(anyon_1, anyon_2)),
-            AnyonModel::Fibonacci => Ok(self.fibonacci_apply_fusion(anyon_1, anyon_2)),
-            _ => Err(PyValueError::new_err("This model is not supported yet")),
+    /// Applies the model's fusion rules to two anyons and returns the resulting anyon(s).
+    /// 'count' gives u64 multiplicities and raises OverflowError past them,
+    /// 'exact' gives arbitrary precision multiplicities and 'support' gives 1
+    /// for every charge that can result and 0 otherwise
+    #[pyo3(signature = (anyon_1, anyon_2, mode="count"))]
+    fn apply_fusion(&self, anyon_1: Vec<BigUint>, anyon_2: Vec<BigUint>, mode: &str) -> PyResult<Vec<BigUint>> {
+        let r = self.rules.num_charges();
+        if anyon_1.len() != r || anyon_2.len() != r {
+            return Err(PyValueError::new_err(format!(
+                "Topological charge vectors must have length {}",
+                r
+            )));
+        }
+
+        match FusionMode::parse(mode)? {
+            FusionMode::Support => {
+                let support = |tc: &[BigUint]| -> ChargeMask {
+                    tc.iter()
+                        .enumerate()
+                        .filter(|(_, n)| n.bits() > 0)
+                        .fold(0, |mask, (c, _)| mask | (1 << c))
+                };
+                let mask = self.rules.fuse_support(support(&anyon_1), support(&anyon_2));
+                Ok((0..r).map(|c| BigUint::from((mask >> c) as u64 & 1)).collect())
+            }
+            FusionMode::Count => {
+                let to_charge_vec = |tc: &[BigUint]| -> PyResult<ChargeVec> {
+                    let mut output = [0; MAX_CHARGES];
+                    for (out, n) in output.iter_mut().zip(tc) {
+                        *out = u64::try_from(n).map_err(|_| overflow_error())?;
+                    }
+                    Ok(output)
+                };
+                let tc = self
+                    .rules
+                    .checked_fuse(&to_charge_vec(&anyon_1)?, &to_charge_vec(&anyon_2)?)
+                    .ok_or_else(overflow_error)?;
+                Ok(tc[..r].iter().map(|&n| BigUint::from(n)).collect())
+            }
+            FusionMode::Exact => Ok(self.rules.fuse_exact(&anyon_1, &anyon_2)),
         }
     }
 
-    fn verify_fusion_result(&self, init_charge: TopoCharge) -> bool {
-        match self.state.anyon_model() {
-            AnyonModel::Ising => self.ising_verify_fusion_result(init_charge.get_ising()),
-            AnyonModel::Fibonacci => {
-                self.fibonacci_verify_fusion_result(init_charge.get_fibonacci())
+    /// Fuses each row of two (B, r) arrays of charge multiplicities, returning
+    /// a (B, r) array of the results
+    fn apply_fusion_batch<'py>(
+        &self,
+        py: Python<'py>,
+        anyon_1: PyReadonlyArray2<i64>,
+        anyon_2: PyReadonlyArray2<i64>,
+    ) -> PyResult<Bound<'py, PyArray2<i64>>> {
+        let r = self.rules.num_charges();
+        let anyon_1 = anyon_1.as_array();
+        let anyon_2 = anyon_2.as_array();
+        if anyon_1.dim() != anyon_2.dim() || anyon_1.ncols() != r {
+            return Err(PyValueError::new_err(format!(
+                "Charge arrays must both have shape (B, {})",
+                r
+            )));
+        }
+        if anyon_1.iter().chain(anyon_2.iter()).any(|&n| n < 0) {
+            return Err(PyValueError::new_err("Charge multiplicities must be non-negative"));
+        }
+
+        let rows = anyon_1.nrows();
+        let output = py.allow_threads(|| {
+            let mut output = Array2::<i64>::zeros((rows, r));
+            for ((row_1, row_2), mut out) in anyon_1
+                .outer_iter()
+                .zip(anyon_2.outer_iter())
+                .zip(output.outer_iter_mut())
+            {
+                let mut tc_1: ChargeVec = [0; MAX_CHARGES];
+                let mut tc_2: ChargeVec = [0; MAX_CHARGES];
+                for c in 0..r {
+                    tc_1[c] = row_1[c] as u64;
+                    tc_2[c] = row_2[c] as u64;
+                }
+                let tc = self.rules.checked_fuse(&tc_1, &tc_2).ok_or_else(overflow_error)?;
+                for c in 0..r {
+                    out[c] = i64::try_from(tc[c]).map_err(|_| overflow_error())?;
+                }
             }
-            _ => false,
+            Ok::<_, PyErr>(output)
+        })?;
+
+        Ok(output.into_pyarray_bound(py))
+    }
+
+    /// Checks if the anyons can fuse to the given overall charge. Uses
+    /// support-only fusion by default, which never overflows
+    #[pyo3(signature = (init_charge, mode="support"))]
+    fn verify_fusion_result(&self, init_charge: TopoCharge, mode: &str) -> PyResult<bool> {
+        let mode = FusionMode::parse(mode)?;
+        match self.charge_index(&init_charge) {
+            Some(index) => self.verify_fusion_result_index(index, mode),
+            None => Ok(false),
         }
     }
-    fn minimum_possible_anyons(&self, qubits: u32) -> PyResult<Vec<u32>> {
-        match self.state.anyon_model() {
-            AnyonModel::Ising => Ok(self.ising_possible_sigmas(qubits)),
-            AnyonModel::Fibonacci => Ok(self.fibonacci_possible_taus(qubits)),
-            _ => Err(PyValueError::new_err("This model is not supported yet")),
+
+    /// Returns the numbers of anyons of the model's computational charge whose
+    /// fusion space has a total charge sector holding exactly `qubits` qubits
+    fn minimum_possible_anyons(&self, qubits: u64) -> PyResult<Vec<u64>> {
+        let mut counts = qubit_anyon_counts(&self.rules, self.computational_charge(), qubits)?;
+        // No anyons trivially hold zero qubits, which Fibonacci counts but
+        // Ising has always left out, i.e. 2 * qubits + 1 and 2 * qubits + 2
+        if qubits == 0 && self.state.anyon_model() == AnyonModel::Ising {
+            counts.retain(|&n| n > 0);
         }
+        Ok(counts)
+    }
+
+    /// Returns the basis of labelled fusion trees of the state's fusion
+    /// operations, optionally restricted to one total charge. Charges are
+    /// given by their TopoCharge value
+    #[pyo3(signature = (total_charge=None))]
+    fn fusion_trees(&self, total_charge: Option<TopoCharge>) -> PyResult<FusionTrees> {
+        let leaf_charges = self
+            .state
+            .anyons()
+            .charges()
+            .iter()
+            .map(|charge| self.charge_index(charge))
+            .collect::<Option<Vec<usize>>>()
+            .ok_or_else(|| PyValueError::new_err("Fusion trees are not supported for custom models"))?;
+        let sectors = match total_charge {
+            Some(charge) => vec![self.charge_index(&charge).unwrap()],
+            None => (0..self.rules.num_charges()).collect(),
+        };
+
+        let space = FusionTreeSpace::new(self.tree.clone(), self.rules.clone(), leaf_charges, sectors)?;
+        Ok(FusionTrees::new(space))
+    }
+
+    /// Returns the exact dimension of the fusion space in each total charge
+    /// sector, in the model's charge order. `counts` gives the number of
+    /// anyons of each charge and defaults to the anyons in the state
+    #[pyo3(signature = (counts=None))]
+    fn fusion_space_dimensions(&self, counts: Option<Vec<u64>>) -> PyResult<Vec<BigUint>> {
+        let counts = match counts {
+            Some(counts) => counts,
+            None => {
+                let mut counts = vec![0; self.rules.num_charges()];
+                for charge in self.state.anyons().charges() {
+                    let charge = self.charge_index(charge).ok_or_else(|| {
+                        PyValueError::new_err("Anyon counts must be given for custom models")
+                    })?;
+                    counts[charge] += 1;
+                }
+                counts
+            }
+        };
+        sector_dimensions(&self.rules, &counts)
     }
 }
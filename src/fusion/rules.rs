@@ -0,0 +1,245 @@
+use num_bigint::BigUint;
+use numpy::ndarray::ArrayView3;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+
+/// Largest number of charges a model can have. Charge vectors are fixed size
+/// arrays of this length so fusing never allocates.
+pub const MAX_CHARGES: usize = 16;
+
+/// Multiplicity of each charge in a superposition of topological charges.
+/// Only the first `num_charges` entries of the model are used.
+pub type ChargeVec = [u64; MAX_CHARGES];
+
+/// Set of charges present in a superposition, one bit per charge index
+pub type ChargeMask = u16;
+
+/// How multiplicities are tracked when fusing
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum FusionMode {
+    /// Only which charges are reachable, as a ChargeMask
+    Support,
+    /// u64 multiplicities, raising an error instead of overflowing
+    Count,
+    /// Arbitrary precision multiplicities
+    Exact,
+}
+
+impl FusionMode {
+    pub fn parse(mode: &str) -> PyResult<Self> {
+        match mode {
+            "support" => Ok(FusionMode::Support),
+            "count" => Ok(FusionMode::Count),
+            "exact" => Ok(FusionMode::Exact),
+            _ => Err(PyValueError::new_err(
+                "Fusion mode must be one of 'support', 'count' or 'exact'",
+            )),
+        }
+    }
+}
+
+/// The fusion rules of a model as the tensor of multiplicities N_ab^c. Each
+/// (a, b) pair stores its row over c as a fixed size array, so fusing two
+/// charge vectors is a contraction over stack arrays. The allowed channels of
+/// each pair are also kept as a ChargeMask for support-only fusion.
+#[derive(Clone, Debug, PartialEq)]
+pub struct FusionRules {
+    num_charges: usize,
+    multiplicities: Vec<ChargeVec>,
+    support: Vec<ChargeMask>,
+}
+
+impl FusionRules {
+    fn new(num_charges: usize, multiplicities: Vec<ChargeVec>) -> Self {
+        let support = multiplicities.iter().map(support_of).collect();
+        FusionRules {
+            num_charges,
+            multiplicities,
+            support,
+        }
+    }
+
+    /// Builds the rules from a nested N[a][b][c] table
+    fn from_table<const R: usize>(table: [[[u64; R]; R]; R]) -> Self {
+        let multiplicities = table
+            .iter()
+            .flatten()
+            .map(|row| std::array::from_fn(|c| if c < R { row[c] } else { 0 }))
+            .collect();
+        Self::new(R, multiplicities)
+    }
+
+    /// Ising fusion rules, in the (psi, vacuum, sigma) order of IsingTopoCharge
+    pub fn ising() -> Self {
+        Self::from_table([
+            [[0, 1, 0], [1, 0, 0], [0, 0, 1]],
+            [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
+            [[0, 0, 1], [0, 0, 1], [1, 1, 0]],
+        ])
+    }
+
+    /// Fibonacci fusion rules, in the (tau, vacuum) order of FibonacciTopoCharge
+    pub fn fibonacci() -> Self {
+        Self::from_table([[[1, 1], [1, 0]], [[1, 0], [0, 1]]])
+    }
+
+    /// Builds the rules of a custom model from an (r, r, r) array of N_ab^c
+    pub fn from_array(rules: ArrayView3<'_, i64>) -> PyResult<Self> {
+        let (a, b, c) = rules.dim();
+        if a != b || b != c {
+            return Err(PyValueError::new_err("Fusion rules must have shape (r, r, r)"));
+        }
+        if a == 0 || a > MAX_CHARGES {
+            return Err(PyValueError::new_err(format!(
+                "Models must have between 1 and {} charges",
+                MAX_CHARGES
+            )));
+        }
+        if rules.iter().any(|&n| n < 0) {
+            return Err(PyValueError::new_err("Fusion multiplicities must be non-negative"));
+        }
+
+        let multiplicities = rules
+            .outer_iter()
+            .flat_map(|plane| {
+                plane
+                    .outer_iter()
+                    .map(|row| std::array::from_fn(|c| if c < a { row[c] as u64 } else { 0 }))
+                    .collect::<Vec<ChargeVec>>()
+            })
+            .collect();
+
+        Ok(Self::new(a, multiplicities))
+    }
+
+    pub fn num_charges(&self) -> usize {
+        self.num_charges
+    }
+
+    /// The multiplicity N_ab^c
+    pub fn multiplicity(&self, a: usize, b: usize, c: usize) -> u64 {
+        self.multiplicities[a * self.num_charges + b][c]
+    }
+
+    /// The index of the vacuum, i.e. the charge u with u x a = a for every a
+    pub fn vacuum(&self) -> Option<usize> {
+        let r = self.num_charges;
+        (0..r).find(|&u| {
+            (0..r).all(|a| (0..r).all(|c| self.multiplicity(u, a, c) == (a == c) as u64))
+        })
+    }
+
+    /// The charge vector of a single anyon with the given charge index
+    pub fn unit(&self, charge: usize) -> ChargeVec {
+        let mut tc = [0; MAX_CHARGES];
+        tc[charge] = 1;
+        tc
+    }
+
+    /// Fuses two charge vectors, i.e. sum_ab anyon_1[a] anyon_2[b] N_ab^c.
+    /// Multiplicities saturate at u64::MAX, which keeps whether a charge is
+    /// present correct; use checked_fuse when the counts themselves matter
+    pub fn fuse(&self, anyon_1: &ChargeVec, anyon_2: &ChargeVec) -> ChargeVec {
+        let r = self.num_charges;
+        let mut output: ChargeVec = [0; MAX_CHARGES];
+
+        for (a, &n_a) in anyon_1[..r].iter().enumerate() {
+            if n_a == 0 {
+                continue;
+            }
+            for (b, &n_b) in anyon_2[..r].iter().enumerate() {
+                let weight = n_a.saturating_mul(n_b);
+                if weight == 0 {
+                    continue;
+                }
+                let channels = &self.multiplicities[a * r + b];
+                for c in 0..r {
+                    output[c] = output[c].saturating_add(weight.saturating_mul(channels[c]));
+                }
+            }
+        }
+
+        output
+    }
+
+    /// Fuses two charge vectors like fuse, returning None if a multiplicity
+    /// overflows u64
+    pub fn checked_fuse(&self, anyon_1: &ChargeVec, anyon_2: &ChargeVec) -> Option<ChargeVec> {
+        let r = self.num_charges;
+        let mut output: ChargeVec = [0; MAX_CHARGES];
+
+        for (a, &n_a) in anyon_1[..r].iter().enumerate() {
+            if n_a == 0 {
+                continue;
+            }
+            for (b, &n_b) in anyon_2[..r].iter().enumerate() {
+                let weight = n_a.checked_mul(n_b)?;
+                if weight == 0 {
+                    continue;
+                }
+                let channels = &self.multiplicities[a * r + b];
+                for c in 0..r {
+                    output[c] = output[c].checked_add(weight.checked_mul(channels[c])?)?;
+                }
+            }
+        }
+
+        Some(output)
+    }
+
+    /// Fuses two sets of charges, returning every charge that can result. The
+    /// cost depends only on how many charges are present, not on multiplicities
+    pub fn fuse_support(&self, anyon_1: ChargeMask, anyon_2: ChargeMask) -> ChargeMask {
+        let r = self.num_charges;
+        let mut output = 0;
+
+        let mut rest_1 = anyon_1;
+        while rest_1 != 0 {
+            let a = rest_1.trailing_zeros() as usize;
+            rest_1 &= rest_1 - 1;
+
+            let mut rest_2 = anyon_2;
+            while rest_2 != 0 {
+                let b = rest_2.trailing_zeros() as usize;
+                rest_2 &= rest_2 - 1;
+                output |= self.support[a * r + b];
+            }
+        }
+
+        output
+    }
+
+    /// Fuses two charge vectors with arbitrary precision multiplicities
+    pub fn fuse_exact(&self, anyon_1: &[BigUint], anyon_2: &[BigUint]) -> Vec<BigUint> {
+        let r = self.num_charges;
+        let mut output = vec![BigUint::default(); r];
+
+        for (a, n_a) in anyon_1.iter().enumerate() {
+            if n_a.bits() == 0 {
+                continue;
+            }
+            for (b, n_b) in anyon_2.iter().enumerate() {
+                if n_b.bits() == 0 {
+                    continue;
+                }
+                let weight = n_a * n_b;
+                let channels = &self.multiplicities[a * r + b];
+                for c in 0..r {
+                    if channels[c] != 0 {
+                        output[c] += &weight * channels[c];
+                    }
+                }
+            }
+        }
+
+        output
+    }
+}
+
+/// The set of charges with a non-zero multiplicity
+pub fn support_of(tc: &ChargeVec) -> ChargeMask {
+    tc.iter()
+        .enumerate()
+        .filter(|(_, &n)| n > 0)
+        .fold(0, |mask, (c, _)| mask | (1 << c))
+}
@@ -1,6 +1,149 @@
-use crate::{fusion::fusion::FusionPair, model::anyon::Anyon, model::model::AnyonModel};
+use std::collections::HashSet;
+use std::sync::Arc;
+
+use crate::fusion::fusion::FusionPair;
+use crate::model::anyon::{Anyon, FibonacciTopoCharge, IsingTopoCharge, TopoCharge};
+use crate::model::model::AnyonModel;
 use crate::util::statevec::StateVec;
+use numpy::{PyArray1, PyReadonlyArray1, PyReadonlyArray2};
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
+use pyo3::types::PyTuple;
+
+/// Tracks which anyons can still be fused as operations are added, so each
+/// operation is verified in O(log n) instead of by replaying every previous
+/// operation
+#[derive(Clone, Debug, Default, PartialEq)]
+struct FusibilityIndex {
+    /// Whether each anyon has been fused into a lower index anyon
+    absorbed: Vec<bool>,
+    /// Fenwick tree counting the anyons that have not been absorbed
+    alive: Vec<usize>,
+    /// The (time, anyon) pairs of anyons that already fuse at a time step
+    used: HashSet<(u32, usize)>,
+}
+
+impl FusibilityIndex {
+    /// An index over `n` anyons that have not been fused. A Fenwick node
+    /// counting the range (i - lowbit(i), i] starts at lowbit(i), so this is
+    /// O(n) rather than n pushes
+    fn with_anyons(n: usize) -> Self {
+        FusibilityIndex {
+            absorbed: vec![false; n],
+            alive: (1..=n).map(|i| i & i.wrapping_neg()).collect(),
+            used: HashSet::new(),
+        }
+    }
+
+    fn push_anyon(&mut self) {
+        // The new node covers its own anyon plus the range below it down to
+        // its lowest set bit
+        let i = self.alive.len() + 1;
+        let low = i - (i & i.wrapping_neg());
+        let count = 1 + self.alive_before(i - 1) - self.alive_before(low);
+        self.alive.push(count);
+        self.absorbed.push(false);
+    }
+
+    /// The number of anyons in 0..end that have not been absorbed
+    fn alive_before(&self, mut end: usize) -> usize {
+        let mut count = 0;
+        while end > 0 {
+            count += self.alive[end - 1];
+            end &= end - 1;
+        }
+        count
+    }
+
+    fn absorb(&mut self, anyon: usize) {
+        self.absorbed[anyon] = true;
+        let mut i = anyon + 1;
+        while i <= self.alive.len() {
+            self.alive[i - 1] -= 1;
+            i += i & i.wrapping_neg();
+        }
+    }
+
+    /// Two anyons can fuse at a time step if neither has been absorbed or is
+    /// already fusing at that time, and every anyon between them has been
+    /// absorbed
+    fn can_fuse(&self, time: u32, anyon_1: usize, anyon_2: usize) -> bool {
+        anyon_1 < anyon_2
+            && anyon_2 < self.absorbed.len()
+            && !self.absorbed[anyon_1]
+            && !self.absorbed[anyon_2]
+            && !self.used.contains(&(time, anyon_1))
+            && !self.used.contains(&(time, anyon_2))
+            && self.alive_before(anyon_2) == self.alive_before(anyon_1 + 1)
+    }
+
+    fn fuse(&mut self, time: u32, anyon_1: usize, anyon_2: usize) {
+        self.used.insert((time, anyon_1));
+        self.absorb(anyon_2);
+    }
+}
+
+/// The anyons of a state stored column by column, so registers can be loaded
+/// from and read as whole arrays without building an Anyon per entry
+#[derive(Clone, Debug, Default, PartialEq)]
+pub struct AnyonTable {
+    names: Vec<String>,
+    charges: Vec<TopoCharge>,
+    positions: Vec<(f64, f64)>,
+}
+
+impl AnyonTable {
+    pub fn len(&self) -> usize {
+        self.names.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.names.is_empty()
+    }
+
+    pub fn names(&self) -> &[String] {
+        &self.names
+    }
+
+    pub fn charges(&self) -> &[TopoCharge] {
+        &self.charges
+    }
+
+    pub fn positions(&self) -> &[(f64, f64)] {
+        &self.positions
+    }
+
+    /// The anyon at the given index
+    pub fn anyon(&self, index: usize) -> Anyon {
+        Anyon::new(
+            self.names[index].clone(),
+            self.charges[index].clone(),
+            self.positions[index],
+        )
+    }
+
+    fn push(&mut self, anyon: Anyon) {
+        self.names.push(anyon.name().to_string());
+        self.charges.push(anyon.charge().clone());
+        self.positions.push(anyon.position());
+    }
+}
+
+/// Python tuples of the anyons and operations, built on the first read from
+/// Python and dropped whenever the state changes. Anyon and FusionPair have no
+/// setters, so the tuples are immutable and can be handed out repeatedly.
+#[derive(Clone, Debug, Default)]
+struct Snapshots {
+    anyons: Option<Py<PyTuple>>,
+    operations: Option<Py<PyTuple>>,
+}
+
+// Snapshots are a cache of the other fields, so they never affect equality
+impl PartialEq for Snapshots {
+    fn eq(&self, _other: &Self) -> bool {
+        true
+    }
+}
 
 /// The state of the system
 #[pyclass]
@@ -8,25 +151,30 @@ use pyo3::prelude::*;
 /// Stores the overall state of the system. Use this struct to keep track of any
 /// common information throughout the simulation (e.g. anyons, operations,
 /// statevector).
+///
+/// The anyons are stored as columns of names, charges and positions. They,
+/// the operations and the fusibility index are shared behind Arcs, so
+/// cloning a State (e.g. into a Fusion) is cheap and they are only copied if a
+/// shared State is then modified.
 pub struct State {
-    #[pyo3(get)]
-    anyons: Vec<Anyon>,
-    #[pyo3(get)]
-    operations: Vec<(u32, FusionPair)>,
+    anyons: Arc<AnyonTable>,
+    operations: Arc<Vec<(u32, FusionPair)>>,
     #[pyo3(get)]
     anyon_model: AnyonModel,
     #[pyo3(get)]
     state_vec: StateVec,
+    fusibility: Arc<FusibilityIndex>,
+    snapshots: Snapshots,
 }
 
 /// Internal Methods
 impl State {
-    pub fn anyons(&self) -> Vec<Anyon> {
-        self.anyons.clone()
+    pub fn anyons(&self) -> &AnyonTable {
+        &self.anyons
     }
 
-    pub fn operations(&self) -> Vec<(u32, FusionPair)> {
-        self.operations.clone()
+    pub fn operations(&self) -> &[(u32, FusionPair)] {
+        &self.operations
     }
 
     pub fn anyon_model(&self) -> AnyonModel{
@@ -34,28 +182,18 @@ impl State {
     }
 
     /// Verify the operation
-    /// TODO: Provide better error for panic when no anyons loaded
     pub fn verify_operation(&self, time: u32, operation: &FusionPair) -> bool {
-        assert!(operation.anyon_1() < operation.anyon_2());
-        assert!(operation.anyon_2() < self.anyons.len());
-        let mut fusible_anyons = vec![true; self.anyons.len()];
-
-        for (t, op) in &self.operations {
-            fusible_anyons[op.anyon_2()] = false;
-            if *t == time {
-                fusible_anyons[op.anyon_1()] = false;
-            }
-        }
+        self.fusibility.can_fuse(time, operation.anyon_1(), operation.anyon_2())
+    }
 
-        if !fusible_anyons[operation.anyon_1()] || !fusible_anyons[operation.anyon_2()] {
+    /// Adds the operation if it is valid, returning whether it was added
+    fn try_add_operation(&mut self, time: u32, operation: FusionPair) -> bool {
+        if !self.verify_operation(time, &operation) {
             return false;
         }
-
-        for i in operation.anyon_1() + 1..operation.anyon_2() - 1 {
-            if fusible_anyons[i] {
-                return false;
-            }
-        }
+        Arc::make_mut(&mut self.fusibility).fuse(time, operation.anyon_1(), operation.anyon_2());
+        Arc::make_mut(&mut self.operations).push((time, operation));
+        self.snapshots.operations = None;
         true
     }
 }
@@ -64,30 +202,149 @@ impl State {
 #[pymethods]
 impl State {
     #[new]
-    fn new() -> Self {
+    fn new(py: Python<'_>) -> Self {
         State {
-            anyons: Vec::new(),
-            operations: Vec::new(),
+            anyons: Arc::new(AnyonTable::default()),
+            operations: Arc::new(Vec::new()),
             anyon_model: AnyonModel::Ising, //Assume model is Ising by default
-            state_vec: StateVec::new(1, None),
+            state_vec: StateVec::new(py, 1, None),
+            fusibility: Arc::new(FusibilityIndex::default()),
+            snapshots: Snapshots::default(),
+        }
+    }
+
+    /// Builds a state from whole arrays of anyons: a sequence of n names, an
+    /// (n,) array of charge codes and an (n, 2) array of positions. Charge
+    /// codes are the values of the model's IsingTopoCharge or
+    /// FibonacciTopoCharge, e.g. 2 for an Ising sigma
+    #[staticmethod]
+    fn from_arrays(
+        py: Python<'_>,
+        names: Vec<String>,
+        charge_codes: PyReadonlyArray1<i64>,
+        positions: PyReadonlyArray2<f64>,
+        model: AnyonModel,
+    ) -> PyResult<Self> {
+        let charge_codes = charge_codes.as_array();
+        let positions = positions.as_array();
+        let n = names.len();
+        if charge_codes.len() != n || positions.nrows() != n || positions.ncols() != 2 {
+            return Err(PyValueError::new_err(
+                "Anyons must be given as n names, charge codes of shape (n,) and positions of shape (n, 2)",
+            ));
         }
+
+        if !matches!(model, AnyonModel::Ising | AnyonModel::Fibonacci) {
+            return Err(PyValueError::new_err(
+                "Anyons can only be loaded from arrays for the Ising and Fibonacci models",
+            ));
+        }
+
+        let charge = |code: i64| -> Option<TopoCharge> {
+            let code = usize::try_from(code).ok()?;
+            match model {
+                AnyonModel::Ising => IsingTopoCharge::from_value(code).map(TopoCharge::from_ising),
+                AnyonModel::Fibonacci => FibonacciTopoCharge::from_value(code).map(TopoCharge::from_fibonacci),
+                _ => None,
+            }
+        };
+        let charges = charge_codes
+            .iter()
+            .map(|&code| charge(code))
+            .collect::<Option<Vec<TopoCharge>>>()
+            .ok_or_else(|| PyValueError::new_err("Invalid charge code for the model"))?;
+        let positions = positions.outer_iter().map(|row| (row[0], row[1])).collect();
+
+        Ok(State {
+            anyons: Arc::new(AnyonTable {
+                names,
+                charges,
+                positions,
+            }),
+            operations: Arc::new(Vec::new()),
+            anyon_model: model,
+            state_vec: StateVec::new(py, 1, None),
+            fusibility: Arc::new(FusibilityIndex::with_anyons(n)),
+            snapshots: Snapshots::default(),
+        })
+    }
+
+    /// The anyons as a tuple, which is cached until the state changes
+    #[getter(anyons)]
+    fn anyons_snapshot(&mut self, py: Python<'_>) -> Py<PyTuple> {
+        let anyons = &self.anyons;
+        self.snapshots
+            .anyons
+            .get_or_insert_with(|| {
+                PyTuple::new_bound(py, (0..anyons.len()).map(|i| anyons.anyon(i).into_py(py))).unbind()
+            })
+            .clone_ref(py)
+    }
+
+    /// The (time, FusionPair) operations as a tuple, which is cached until
+    /// the state changes
+    #[getter(operations)]
+    fn operations_snapshot(&mut self, py: Python<'_>) -> Py<PyTuple> {
+        let operations = &self.operations;
+        self.snapshots
+            .operations
+            .get_or_insert_with(|| {
+                PyTuple::new_bound(py, operations.iter().map(|op| op.clone().into_py(py))).unbind()
+            })
+            .clone_ref(py)
     }
 
     /// Add an anyon to the state
     fn add_anyon(&mut self, anyon: Anyon) -> PyResult<bool> {
-        self.anyons.push(anyon);
+        Arc::make_mut(&mut self.anyons).push(anyon);
+        Arc::make_mut(&mut self.fusibility).push_anyon();
+        self.snapshots.anyons = None;
         Ok(true)
     }
 
     /// Verifies and then adds an operation to the state
     fn add_operation(&mut self, time: u32, operation: FusionPair) -> PyResult<bool> {
-        let result = Self::verify_operation(self, time, &operation);
-        if !result {
-            return Ok(false);
+        Ok(self.try_add_operation(time, operation))
+    }
+
+    /// Verifies and adds a batch of operations in order, given as a (k,) array
+    /// of times and a (k, 2) array of anyon index pairs. Returns a (k,) mask of
+    /// which operations were added, like calling add_operation on each
+    fn add_operations<'py>(
+        &mut self,
+        py: Python<'py>,
+        times: PyReadonlyArray1<i64>,
+        pairs: PyReadonlyArray2<i64>,
+    ) -> PyResult<Bound<'py, PyArray1<bool>>> {
+        let times = times.as_array();
+        let pairs = pairs.as_array();
+        if pairs.ncols() != 2 || pairs.nrows() != times.len() {
+            return Err(PyValueError::new_err(
+                "Operations must be given as times of shape (k,) and pairs of shape (k, 2)",
+            ));
+        }
+        if times.iter().any(|&t| t < 0 || t > u32::MAX as i64) {
+            return Err(PyValueError::new_err("Times must be between 0 and 2^32 - 1"));
+        }
+        if pairs.iter().any(|&anyon| anyon < 0) {
+            return Err(PyValueError::new_err("Anyon indices must be non-negative"));
         }
-        self.operations.push((time, operation));
 
-        Ok(true)
+        // Drop the cached tuple while the GIL is held
+        self.snapshots.operations = None;
+        let added = py.allow_threads(|| {
+            Arc::make_mut(&mut self.operations).reserve(times.len());
+            times
+                .iter()
+                .zip(pairs.outer_iter())
+                .map(|(&time, pair)| {
+                    let operation = FusionPair::new(pair[0] as usize, pair[1] as usize);
+                    self.try_add_operation(time as u32, operation)
+                })
+                .collect::<Vec<bool>>()
+        });
+
+        Ok(PyArray1::from_vec_bound(py, added))
     }
     fn set_anyon_model(&mut self, model:AnyonModel){
         self.anyon_model=model;
@@ -0,0 +1,458 @@
+use std::sync::Arc;
+
+use crate::fusion::fusion::FusionPair;
+use crate::fusion::rules::FusionRules;
+use num_bigint::BigUint;
+use pyo3::exceptions::{PyIndexError, PyOverflowError, PyValueError};
+use pyo3::prelude::*;
+
+/// A fusion tree stored as an arena of nodes. Nodes 0..n are the anyons and
+/// node n + k is the result of the k-th fusion operation, in time order, so
+/// every node's children have lower indices than the node itself.
+///
+/// Parent links, depths and a binary lifting table of ancestors are built
+/// once, so sibling checks take O(1) and lowest common ancestor queries
+/// O(log n). Until every anyon is fused the tree is a forest, and each root is
+/// its own parent.
+#[derive(Clone, Debug)]
+pub struct FusionTree {
+    num_leaves: usize,
+    children: Vec<(usize, usize)>,
+    fusions: Vec<FusionPair>,
+    parent: Vec<usize>,
+    depth: Vec<usize>,
+    // ancestors[j][node] is the 2^j-th ancestor of node, stopping at its root
+    ancestors: Vec<Vec<usize>>,
+}
+
+impl FusionTree {
+    /// Builds the tree from the fusion operations grouped by time step
+    pub fn from_ops(num_leaves: usize, ops: &[Vec<FusionPair>]) -> PyResult<Self> {
+        // The node currently held by each anyon index, or None once fused away
+        let mut slots: Vec<Option<usize>> = (0..num_leaves).map(Some).collect();
+        let mut children = Vec::new();
+        let mut fusions = Vec::new();
+        let mut parent: Vec<usize> = (0..num_leaves).collect();
+
+        for fusion_pair in ops.iter().flatten() {
+            let (anyon_1, anyon_2) = (fusion_pair.anyon_1(), fusion_pair.anyon_2());
+            let left = slots.get(anyon_1).copied().flatten();
+            let right = slots.get(anyon_2).copied().flatten();
+            match (left, right) {
+                (Some(left), Some(right)) if anyon_1 < anyon_2 => {
+                    let node = parent.len();
+                    parent[left] = node;
+                    parent[right] = node;
+                    parent.push(node);
+                    slots[anyon_1] = Some(node);
+                    slots[anyon_2] = None;
+                    children.push((left, right));
+                    fusions.push(fusion_pair.clone());
+                }
+                _ => {
+                    return Err(PyValueError::new_err(format!(
+                        "The anyons ({} {}) cannot be fused",
+                        anyon_1, anyon_2
+                    )))
+                }
+            }
+        }
+
+        // Parents come after their children, so depths fill in from the roots
+        let mut depth: Vec<usize> = vec![0; parent.len()];
+        for node in (0..parent.len()).rev() {
+            if parent[node] != node {
+                depth[node] = depth[parent[node]] + 1;
+            }
+        }
+
+        let max_depth = depth.iter().copied().max().unwrap_or(0);
+        let mut ancestors = vec![parent.clone()];
+        for j in 1..(usize::BITS - max_depth.leading_zeros()) as usize {
+            let previous = &ancestors[j - 1];
+            let next = previous.iter().map(|&node| previous[node]).collect();
+            ancestors.push(next);
+        }
+
+        Ok(FusionTree {
+            num_leaves,
+            children,
+            fusions,
+            parent,
+            depth,
+            ancestors,
+        })
+    }
+
+    pub fn num_leaves(&self) -> usize {
+        self.num_leaves
+    }
+
+    /// Number of fusion vertices, i.e. internal nodes
+    pub fn num_internal(&self) -> usize {
+        self.children.len()
+    }
+
+    pub fn num_nodes(&self) -> usize {
+        self.num_leaves + self.children.len()
+    }
+
+    /// The children of the internal node n + k
+    pub fn children(&self, k: usize) -> (usize, usize) {
+        self.children[k]
+    }
+
+    /// The fusion operation that creates the internal node n + k
+    pub fn fusion(&self, k: usize) -> &FusionPair {
+        &self.fusions[k]
+    }
+
+    /// The parent of a node, or None for a root
+    pub fn parent(&self, node: usize) -> Option<usize> {
+        Some(self.parent[node]).filter(|&parent| parent != node)
+    }
+
+    pub fn depth(&self, node: usize) -> usize {
+        self.depth[node]
+    }
+
+    /// Whether every anyon has been fused into a single root
+    pub fn is_complete(&self) -> bool {
+        self.num_leaves > 0 && self.children.len() == self.num_leaves - 1
+    }
+
+    /// The root of a complete tree
+    pub fn root(&self) -> usize {
+        self.num_nodes() - 1
+    }
+
+    /// The 2^j-th ancestors of a node for the set bits j of steps
+    fn lift(&self, mut node: usize, steps: usize) -> usize {
+        for (j, ancestors) in self.ancestors.iter().enumerate() {
+            if steps >> j & 1 == 1 {
+                node = ancestors[node];
+            }
+        }
+        node
+    }
+
+    /// The lowest common ancestor of two nodes, or None if they are in
+    /// different trees of the forest
+    pub fn lca(&self, node_1: usize, node_2: usize) -> Option<usize> {
+        let (mut u, mut v) = if self.depth[node_1] >= self.depth[node_2] {
+            (node_1, node_2)
+        } else {
+            (node_2, node_1)
+        };
+        u = self.lift(u, self.depth[u] - self.depth[v]);
+        if u == v {
+            return Some(u);
+        }
+
+        for ancestors in self.ancestors.iter().rev() {
+            if ancestors[u] != ancestors[v] {
+                u = ancestors[u];
+                v = ancestors[v];
+            }
+        }
+        self.parent(u).filter(|&parent| Some(parent) == self.parent(v))
+    }
+
+    /// Whether two distinct nodes were fused with each other directly
+    pub fn are_siblings(&self, node_1: usize, node_2: usize) -> bool {
+        node_1 != node_2 && self.parent(node_1).is_some() && self.parent(node_1) == self.parent(node_2)
+    }
+
+    /// The number of internal nodes strictly between two nodes and their
+    /// lowest common ancestor. Each F-move along the path shortens it by one,
+    /// so this is the number of F-moves needed to make the nodes siblings
+    pub fn f_move_distance(&self, node_1: usize, node_2: usize) -> Option<usize> {
+        if node_1 == node_2 {
+            return None;
+        }
+        let lca = self.lca(node_1, node_2)?;
+        // A node that is an ancestor of the other can never become its sibling
+        if lca == node_1 || lca == node_2 {
+            return None;
+        }
+        Some(self.depth[node_1] + self.depth[node_2] - 2 * self.depth[lca] - 2)
+    }
+}
+
+/// Counts of the charge labellings of every subtree of a fusion tree, which
+/// give a mixed radix numbering of the fusion tree basis. A basis element is
+/// the list of internal charges, one per fusion operation.
+///
+/// Trees are ordered by total charge, in the order of `sectors`, then
+/// recursively at each vertex by the (left, right) charge pair, then by the
+/// left subtree and finally the right subtree. Only which charges each vertex
+/// allows is used, so a vertex with multiplicity N_ab^c > 1 contributes one
+/// basis element rather than N_ab^c.
+#[derive(Debug)]
+pub struct FusionTreeSpace {
+    tree: FusionTree,
+    rules: FusionRules,
+    leaf_charges: Vec<usize>,
+    sectors: Vec<usize>,
+    // counts[node][c] is the number of labellings of the subtree at node with charge c
+    counts: Vec<Vec<BigUint>>,
+    dimension: BigUint,
+}
+
+impl FusionTreeSpace {
+    /// Counts the labellings of a complete tree bottom up. `sectors` are the
+    /// allowed total charges
+    pub fn new(
+        tree: FusionTree,
+        rules: FusionRules,
+        leaf_charges: Vec<usize>,
+        sectors: Vec<usize>,
+    ) -> PyResult<Self> {
+        if !tree.is_complete() {
+            return Err(PyValueError::new_err(
+                "The fusion tree must fuse every anyon into one",
+            ));
+        }
+
+        let r = rules.num_charges();
+        let mut counts: Vec<Vec<BigUint>> = leaf_charges
+            .iter()
+            .map(|&charge| (0..r).map(|c| BigUint::from((c == charge) as u64)).collect())
+            .collect();
+
+        for k in 0..tree.num_internal() {
+            let (left, right) = tree.children(k);
+            let mut count = vec![BigUint::default(); r];
+            for a in 0..r {
+                if counts[left][a].bits() == 0 {
+                    continue;
+                }
+                for b in 0..r {
+                    if counts[right][b].bits() == 0 {
+                        continue;
+                    }
+                    let block = &counts[left][a] * &counts[right][b];
+                    for (c, total) in count.iter_mut().enumerate() {
+                        if rules.multiplicity(a, b, c) > 0 {
+                            *total += &block;
+                        }
+                    }
+                }
+            }
+            counts.push(count);
+        }
+
+        let root = tree.root();
+        let dimension = sectors.iter().map(|&c| &counts[root][c]).sum();
+
+        Ok(FusionTreeSpace {
+            tree,
+            rules,
+            leaf_charges,
+            sectors,
+            counts,
+            dimension,
+        })
+    }
+
+    pub fn dimension(&self) -> &BigUint {
+        &self.dimension
+    }
+
+    /// The (left, right) charge pairs that can fuse to c at internal node k,
+    /// in basis order, along with the number of labellings of each
+    fn blocks(&self, k: usize, c: usize) -> impl Iterator<Item = (usize, usize, BigUint)> + '_ {
+        let r = self.rules.num_charges();
+        let (left, right) = self.tree.children(k);
+        (0..r)
+            .flat_map(move |a| (0..r).map(move |b| (a, b)))
+            .filter(move |&(a, b)| self.rules.multiplicity(a, b, c) > 0)
+            .map(move |(a, b)| (a, b, &self.counts[left][a] * &self.counts[right][b]))
+            .filter(|(_, _, size)| size.bits() > 0)
+    }
+
+    /// The index of a tree given by its internal charges. Ranks are combined
+    /// bottom up in node order, so this needs no recursion however deep the
+    /// tree is
+    pub fn rank(&self, labels: &[usize]) -> PyResult<BigUint> {
+        let n = self.tree.num_leaves();
+        let m = self.tree.num_internal();
+        if labels.len() != m {
+            return Err(PyValueError::new_err(format!(
+                "A fusion tree of this state has {} internal charges",
+                m
+            )));
+        }
+        if labels.iter().any(|&c| c >= self.rules.num_charges()) {
+            return Err(PyValueError::new_err("Invalid charge in fusion tree"));
+        }
+
+        let charge = |node: usize| if node < n { self.leaf_charges[node] } else { labels[node - n] };
+        let mut ranks: Vec<Option<BigUint>> = vec![None; m];
+        let take_rank = |ranks: &mut Vec<Option<BigUint>>, node: usize| {
+            if node < n {
+                BigUint::default()
+            } else {
+                ranks[node - n].take().unwrap()
+            }
+        };
+
+        for k in 0..m {
+            let (left, right) = self.tree.children(k);
+            let (a, b, c) = (charge(left), charge(right), labels[k]);
+            if self.rules.multiplicity(a, b, c) == 0 {
+                return Err(PyValueError::new_err(format!(
+                    "The charges of fusion {} do not obey the fusion rules",
+                    k
+                )));
+            }
+
+            let offset: BigUint = self
+                .blocks(k, c)
+                .take_while(|&(a_, b_, _)| (a_, b_) != (a, b))
+                .map(|(_, _, size)| size)
+                .sum();
+            let left_rank = take_rank(&mut ranks, left);
+            let right_rank = take_rank(&mut ranks, right);
+            ranks[k] = Some(offset + left_rank * &self.counts[right][b] + right_rank);
+        }
+
+        let root_charge = charge(self.tree.root());
+        let position = self
+            .sectors
+            .iter()
+            .position(|&c| c == root_charge)
+            .ok_or_else(|| PyValueError::new_err("The fusion tree has the wrong total charge"))?;
+        let sector_offset: BigUint = self.sectors[..position]
+            .iter()
+            .map(|&c| &self.counts[self.tree.root()][c])
+            .sum();
+        let root_rank = if m == 0 { BigUint::default() } else { ranks[m - 1].take().unwrap() };
+
+        Ok(sector_offset + root_rank)
+    }
+
+    /// The internal charges of the tree with the given index. Each node is
+    /// assigned its charge and rank by its parent, which always has a higher
+    /// index, so nodes are visited in reverse order without recursion
+    pub fn unrank(&self, index: &BigUint) -> PyResult<Vec<usize>> {
+        if *index >= self.dimension {
+            return Err(PyIndexError::new_err("Fusion tree index out of range"));
+        }
+
+        let n = self.tree.num_leaves();
+        let m = self.tree.num_internal();
+        let root = self.tree.root();
+
+        let mut rest = index.clone();
+        let mut root_charge = 0;
+        for &c in &self.sectors {
+            if rest < self.counts[root][c] {
+                root_charge = c;
+                break;
+            }
+            rest -= &self.counts[root][c];
+        }
+
+        let mut labels = vec![0; m];
+        if m == 0 {
+            return Ok(labels);
+        }
+        let mut pending: Vec<Option<(usize, BigUint)>> = vec![None; m];
+        pending[m - 1] = Some((root_charge, rest));
+
+        for k in (0..m).rev() {
+            let (c, mut rest) = pending[k].take().unwrap();
+            labels[k] = c;
+
+            let (left, right) = self.tree.children(k);
+            for (a, b, size) in self.blocks(k, c) {
+                if rest < size {
+                    let right_count = &self.counts[right][b];
+                    if left >= n {
+                        pending[left - n] = Some((a, &rest / right_count));
+                    }
+                    if right >= n {
+                        pending[right - n] = Some((b, &rest % right_count));
+                    }
+                    break;
+                }
+                rest -= size;
+            }
+        }
+
+        Ok(labels)
+    }
+}
+
+#[pyclass]
+/// The basis of labelled fusion trees of a state. Each basis element is the
+/// list of internal charges produced by the state's fusion operations, in time
+/// order. Elements are generated lazily and can be converted to and from their
+/// index in the basis, so amplitudes can be addressed without building the
+/// basis.
+pub struct FusionTrees {
+    space: Arc<FusionTreeSpace>,
+}
+
+impl FusionTrees {
+    pub fn new(space: FusionTreeSpace) -> Self {
+        FusionTrees {
+            space: Arc::new(space),
+        }
+    }
+}
+
+#[pymethods]
+impl FusionTrees {
+    /// The number of fusion trees in the basis
+    #[getter]
+    fn dimension(&self) -> BigUint {
+        self.space.dimension().clone()
+    }
+
+    fn __len__(&self) -> PyResult<usize> {
+        usize::try_from(self.space.dimension())
+            .map_err(|_| PyOverflowError::new_err("The basis is too large for len, use dimension"))
+    }
+
+    fn __iter__(&self) -> FusionTreeIter {
+        FusionTreeIter {
+            space: Arc::clone(&self.space),
+            next: BigUint::default(),
+        }
+    }
+
+    /// Returns the index of a fusion tree in the basis
+    fn rank(&self, tree: Vec<usize>) -> PyResult<BigUint> {
+        self.space.rank(&tree)
+    }
+
+    /// Returns the fusion tree at an index of the basis
+    fn unrank(&self, index: BigUint) -> PyResult<Vec<usize>> {
+        self.space.unrank(&index)
+    }
+}
+
+#[pyclass]
+/// Iterates over a fusion tree basis in index order
+pub struct FusionTreeIter {
+    space: Arc<FusionTreeSpace>,
+    next: BigUint,
+}
+
+#[pymethods]
+impl FusionTreeIter {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&mut self) -> PyResult<Option<Vec<usize>>> {
+        if self.next >= *self.space.dimension() {
+            return Ok(None);
+        }
+        let tree = self.space.unrank(&self.next)?;
+        self.next += 1u64;
+        Ok(Some(tree))
+    }
+}
@@ -18,6 +18,8 @@ fn anyon_braiding_simulator(m: &Bound<'_, PyModule>) -> PyResult<()> {
 
     m.add_class::<fusion::fusion::Fusion>()?;
     m.add_class::<fusion::fusion::FusionPair>()?;
+    m.add_class::<fusion::tree::FusionTrees>()?;
+    m.add_class::<fusion::tree::FusionTreeIter>()?;
 
     m.add_class::<fusion::state::State>()?;
 
@@ -98,6 +98,13 @@ impl IsingTopoCharge {
         *self as usize
     }
 
+    /// The charge with the given value, i.e. the inverse of value
+    pub fn from_value(value: usize) -> Option<Self> {
+        [IsingTopoCharge::Psi, IsingTopoCharge::Vacuum, IsingTopoCharge::Sigma]
+            .get(value)
+            .copied()
+    }
+
     pub fn to_string(&self) -> &str {
         match self {
             IsingTopoCharge::Psi => "Psi",
@@ -112,6 +119,13 @@ impl FibonacciTopoCharge {
         *self as usize
     }
 
+    /// The charge with the given value, i.e. the inverse of value
+    pub fn from_value(value: usize) -> Option<Self> {
+        [FibonacciTopoCharge::Tau, FibonacciTopoCharge::Vacuum]
+            .get(value)
+            .copied()
+    }
+
     pub fn to_string(&self) -> &str {
         match self {
             FibonacciTopoCharge::Tau => "Tau",
@@ -140,8 +154,8 @@ impl Anyon {
         &self.name
     }
 
-    pub fn charge(&self) -> TopoCharge {
-        self.charge.clone()
+    pub fn charge(&self) -> &TopoCharge {
+        &self.charge
     }
 
     pub fn position(&self) -> (f64, f64) {
@@ -8,6 +8,7 @@ use crate::fusion::fusion::FusionPair;
 /// the basis is a sequence of fusion operations that occur in the fusion tree,
 /// and a different fusion ordering is a different basis.
 pub struct Basis {
+    #[pyo3(get)]
     ops: Vec<(u32, FusionPair)>,
 }
 
@@ -21,47 +22,64 @@ impl Basis {
     /// Verifies the basis
     /// Preconditions: sorted by time
     pub fn verify_basis(&self, anyons: usize) -> bool {
-        if self.ops.len() != anyons - 1 {
-            return false;
-        }
+        verify_fusion_order(
+            anyons,
+            self.ops.len(),
+            self.ops
+                .iter()
+                .map(|(t, op)| (*t as i64, op.anyon_1() as i64, op.anyon_2() as i64)),
+        )
+    }
+}
 
-        let mut fusible_anyons = vec![true; anyons];
-        let mut unused_anyons = vec![true; anyons];
+/// Verifies a fusion ordering given as (time, anyon_1, anyon_2) rows sorted
+/// by time, i.e. that it fuses all anyons into one by fusing adjacent anyons
+/// that are each used at most once per time step. Shared by Basis and the
+/// batched Fusion.verify_bases
+pub fn verify_fusion_order(
+    anyons: usize,
+    num_ops: usize,
+    ops: impl Iterator<Item = (i64, i64, i64)>,
+) -> bool {
+    if anyons == 0 || num_ops != anyons - 1 {
+        return false;
+    }
 
-        let mut current_time: u32 = 0;
+    let mut fusible_anyons = vec![true; anyons];
+    let mut unused_anyons = vec![true; anyons];
 
-        for (t, op) in &self.ops {
-            if *t != current_time {
-                unused_anyons = vec![true; anyons];
-                current_time = *t;
-            }
+    let mut current_time: i64 = 0;
 
-            // Anyons in fuision pair is not in range [0,anyons)
-            if !(op.anyon_1() < op.anyon_2() && op.anyon_2() < anyons) {
-                return false;
-            }
+    for (t, anyon_1, anyon_2) in ops {
+        if t != current_time {
+            unused_anyons.fill(true);
+            current_time = t;
+        }
 
-            // Anyons have been fusioned away at a previous time
-            if !fusible_anyons[op.anyon_1()] || !fusible_anyons[op.anyon_2()] {
-                return false;
-            }
+        // Anyons in fuision pair is not in range [0,anyons)
+        if !(0 <= anyon_1 && anyon_1 < anyon_2 && anyon_2 < anyons as i64) {
+            return false;
+        }
+        let (anyon_1, anyon_2) = (anyon_1 as usize, anyon_2 as usize);
 
-            // Anyons have already been fusioned at the current time
-            if !unused_anyons[op.anyon_1()] || !unused_anyons[op.anyon_2()] {
-                return false;
-            }
+        // Anyons have been fusioned away at a previous time
+        if !fusible_anyons[anyon_1] || !fusible_anyons[anyon_2] {
+            return false;
+        }
 
-            // Checks for adjacency of anyon_1 and anyon_2
-            for anyon in op.anyon_1() + 1..op.anyon_2() - 1 {
-                if fusible_anyons[anyon] && unused_anyons[anyon] {
-                    return false;
-                }
-            }
+        // Anyons have already been fusioned at the current time
+        if !unused_anyons[anyon_1] || !unused_anyons[anyon_2] {
+            return false;
+        }
 
-            fusible_anyons[op.anyon_2()] = false;
-            unused_anyons[op.anyon_1()] = false;
+        // Checks for adjacency of anyon_1 and anyon_2
+        if fusible_anyons[anyon_1 + 1..anyon_2].iter().any(|&fusible| fusible) {
+            return false;
         }
 
-        true
+        fusible_anyons[anyon_2] = false;
+        unused_anyons[anyon_1] = false;
     }
+
+    true
 }
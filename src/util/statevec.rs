@@ -1,27 +1,233 @@
 use numpy::ndarray::Array1;
-use numpy::{Complex64, PyArray1, PyReadonlyArray1, ToPyArray};
+use numpy::prelude::*;
+use numpy::{Complex64, PyArray1, PyReadonlyArray1, PyReadonlyArray2};
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
+use rayon::prelude::*;
 
 #[pyclass]
-#[derive(Clone, Debug, PartialEq)]
-/// State Vector for the system
+#[derive(Clone, Debug)]
+/// State Vector for the system. The amplitudes live in a NumPy array that is
+/// allocated by Rust and shared with Python without copying, so reading `vec`
+/// returns a writable view of the register rather than a copy of it.
 pub struct StateVec {
-    vec: Array1<Complex64>,
+    vec: Py<PyArray1<Complex64>>,
     #[pyo3(get)]
     init_size: usize,
 }
 
+impl PartialEq for StateVec {
+    fn eq(&self, other: &Self) -> bool {
+        Python::with_gil(|py| {
+            self.init_size == other.init_size
+                && self.vec.bind(py).readonly().as_array() == other.vec.bind(py).readonly().as_array()
+        })
+    }
+}
+
 /// Internal Methods
 impl StateVec {
     /// Returns a clone of the state vector
-    pub fn get_vec(&self) -> Array1<Complex64> {
-        self.vec.clone()
+    pub fn get_vec(&self, py: Python<'_>) -> Array1<Complex64> {
+        self.vec.bind(py).to_owned_array()
     }
     /// Modifies the norm of the state vector to 1
-    pub fn normalize(&mut self) {
-        let norm = self.vec.iter().map(|x| x.norm_sqr()).sum::<f64>().sqrt();
-        for i in 0..self.vec.len() {
-            self.vec[i] /= Complex64::new(norm, 0.0);
+    pub fn normalize(&self, py: Python<'_>) -> PyResult<()> {
+        let mut vec = self.vec.bind(py).try_readwrite().map_err(|e| PyValueError::new_err(e.to_string()))?;
+        let mut vec = vec.as_array_mut();
+        let norm = vec.iter().map(|x| x.norm_sqr()).sum::<f64>().sqrt();
+        vec.mapv_inplace(|x| x / Complex64::new(norm, 0.0));
+        Ok(())
+    }
+
+    /// Number of qubits the state vector spans, or None if its length is not
+    /// a power of two
+    pub fn qubit_num(&self, py: Python<'_>) -> Option<usize> {
+        let len = self.vec.bind(py).len();
+        if len.is_power_of_two() {
+            Some(len.trailing_zeros() as usize)
+        } else {
+            None
+        }
+    }
+
+    /// Returns the number of qubits, checking that every target is in range
+    fn checked_qubit_num(&self, py: Python<'_>, targets: &[usize]) -> PyResult<usize> {
+        let qubit_num = self
+            .qubit_num(py)
+            .ok_or_else(|| PyValueError::new_err("State vector length is not a power of two"))?;
+        if let Some(target) = targets.iter().find(|t| **t >= qubit_num) {
+            return Err(PyValueError::new_err(format!(
+                "Target qubit {} is out of range for {} qubits",
+                target, qubit_num
+            )));
+        }
+        Ok(qubit_num)
+    }
+
+    /// Runs a kernel over the amplitudes with the GIL released, so kernels on
+    /// other registers can run from other Python threads at the same time.
+    /// The storage is shared with Python through `vec` and
+    /// from_numpy(copy=False), so it is borrowed mutably, which stops other
+    /// Rust code from touching it, and marked read-only while the kernel runs,
+    /// so Python writes through `vec` or the wrapped array raise instead of
+    /// racing with it. As with NumPy's own in-place operations, other views
+    /// of the array must not be written to from another thread meanwhile.
+    fn with_amplitudes<F>(&self, py: Python<'_>, kernel: F) -> PyResult<()>
+    where
+        F: FnOnce(&mut [Complex64]) + Send,
+    {
+        let storage = self.vec.bind(py);
+        let mut vec = storage.try_readwrite().map_err(|e| PyValueError::new_err(e.to_string()))?;
+        let amps = vec.as_slice_mut().map_err(|e| PyValueError::new_err(e.to_string()))?;
+
+        let flags = storage.getattr("flags")?;
+        flags.setattr("writeable", false)?;
+        py.allow_threads(|| kernel(amps));
+        flags.setattr("writeable", true)?;
+        Ok(())
+    }
+}
+
+/// Minimum number of amplitudes handed to a single rayon task. Below this the
+/// cost of scheduling outweighs the arithmetic.
+const PAR_MIN_LEN: usize = 1 << 12;
+
+/// Applies a 2x2 gate to the target qubit of the amplitudes in place. Qubit 0
+/// is the most significant bit of the amplitude index, matching the ordering
+/// of the np.kron products in Braid.generate_overall_unitary.
+///
+/// The amplitudes are viewed as a (2^target, 2, stride) array and the gate is
+/// contracted against the middle axis, so each pair of amplitudes that differ
+/// only in the target bit is updated with no extra allocation. Blocks are
+/// spread over the rayon thread pool, or the pairs within a block when there
+/// are only a few large blocks.
+pub fn apply_single_qubit_gate(amps: &mut [Complex64], gate: &[[Complex64; 2]; 2], target: usize) {
+    let stride = amps.len() >> (target + 1);
+    let update = |(a, b): (&mut Complex64, &mut Complex64)| {
+        let (x, y) = (*a, *b);
+        *a = gate[0][0] * x + gate[0][1] * y;
+        *b = gate[1][0] * x + gate[1][1] * y;
+    };
+
+    if amps.len() < 2 * PAR_MIN_LEN {
+        for block in amps.chunks_mut(2 * stride) {
+            let (lo, hi) = block.split_at_mut(stride);
+            lo.iter_mut().zip(hi.iter_mut()).for_each(update);
+        }
+    } else if stride >= PAR_MIN_LEN {
+        for block in amps.chunks_mut(2 * stride) {
+            let (lo, hi) = block.split_at_mut(stride);
+            lo.par_iter_mut()
+                .zip(hi.par_iter_mut())
+                .with_min_len(PAR_MIN_LEN)
+                .for_each(update);
+        }
+    } else {
+        amps.par_chunks_mut(2 * stride)
+            .with_min_len(PAR_MIN_LEN / stride)
+            .for_each(|block| {
+                let (lo, hi) = block.split_at_mut(stride);
+                lo.iter_mut().zip(hi.iter_mut()).for_each(update);
+            });
+    }
+}
+
+/// Applies a 4x4 gate to the quadruples of amplitudes in `quads`, which hold
+/// the amplitudes whose (higher, lower) target bits are 00, 01, 10 and 11.
+/// `order` maps each quadrant to its row of the gate.
+fn update_quads(
+    quads: [&mut [Complex64]; 4],
+    gate: &[[Complex64; 4]; 4],
+    order: &[usize; 4],
+    parallel: bool,
+) {
+    let update = |((a, b), (c, d)): ((&mut Complex64, &mut Complex64), (&mut Complex64, &mut Complex64))| {
+        let quad = [a, b, c, d];
+        let mut x = [Complex64::new(0.0, 0.0); 4];
+        for q in 0..4 {
+            x[order[q]] = *quad[q];
+        }
+        for q in 0..4 {
+            let row = &gate[order[q]];
+            *quad[q] = row[0] * x[0] + row[1] * x[1] + row[2] * x[2] + row[3] * x[3];
+        }
+    };
+
+    let [q00, q01, q10, q11] = quads;
+    if parallel {
+        q00.par_iter_mut()
+            .zip(q01.par_iter_mut())
+            .zip(q10.par_iter_mut().zip(q11.par_iter_mut()))
+            .with_min_len(PAR_MIN_LEN)
+            .for_each(update);
+    } else {
+        q00.iter_mut()
+            .zip(q01.iter_mut())
+            .zip(q10.iter_mut().zip(q11.iter_mut()))
+            .for_each(update);
+    }
+}
+
+/// Splits a block of 2 * hi amplitudes into the quadrants of the two target
+/// bits and applies the gate to them
+fn update_block(
+    block: &mut [Complex64],
+    hi: usize,
+    lo: usize,
+    gate: &[[Complex64; 4]; 4],
+    order: &[usize; 4],
+    parallel: bool,
+) {
+    let (h0, h1) = block.split_at_mut(hi);
+    for (c0, c1) in h0.chunks_mut(2 * lo).zip(h1.chunks_mut(2 * lo)) {
+        let (q00, q01) = c0.split_at_mut(lo);
+        let (q10, q11) = c1.split_at_mut(lo);
+        update_quads([q00, q01, q10, q11], gate, order, parallel);
+    }
+}
+
+/// Applies a 4x4 gate to two distinct target qubits of the amplitudes in
+/// place. The gate acts on the basis |target_1 target_2>, so target_1 selects
+/// the higher of the two bits of the gate's row index.
+///
+/// Work is parallelized over whichever level of the (2^t, 2, ..., 2, stride)
+/// view has enough independent blocks to keep the thread pool busy.
+pub fn apply_two_qubit_gate(
+    amps: &mut [Complex64],
+    gate: &[[Complex64; 4]; 4],
+    target_1: usize,
+    target_2: usize,
+) {
+    let mask_1 = amps.len() >> (target_1 + 1);
+    let mask_2 = amps.len() >> (target_2 + 1);
+    let (hi, lo) = (mask_1.max(mask_2), mask_1.min(mask_2));
+    // Quadrants are ordered by (hi bit, lo bit); swap the middle two rows of
+    // the gate when target_2 is the more significant qubit
+    let order = if mask_1 > mask_2 { [0, 1, 2, 3] } else { [0, 2, 1, 3] };
+
+    let blocks = amps.len() / (2 * hi);
+    if amps.len() < 4 * PAR_MIN_LEN || lo >= PAR_MIN_LEN {
+        // Small vectors run serially, long runs are split inside update_quads
+        let parallel = amps.len() >= 4 * PAR_MIN_LEN;
+        for block in amps.chunks_mut(2 * hi) {
+            update_block(block, hi, lo, gate, &order, parallel);
+        }
+    } else if blocks >= rayon::current_num_threads() {
+        amps.par_chunks_mut(2 * hi)
+            .with_min_len((PAR_MIN_LEN / (2 * hi)).max(1))
+            .for_each(|block| update_block(block, hi, lo, gate, &order, false));
+    } else {
+        for block in amps.chunks_mut(2 * hi) {
+            let (h0, h1) = block.split_at_mut(hi);
+            h0.par_chunks_mut(2 * lo)
+                .zip(h1.par_chunks_mut(2 * lo))
+                .with_min_len(PAR_MIN_LEN / lo)
+                .for_each(|(c0, c1)| {
+                    let (q00, q01) = c0.split_at_mut(lo);
+                    let (q10, q11) = c1.split_at_mut(lo);
+                    update_quads([q00, q01, q10, q11], gate, &order, false);
+                });
         }
     }
 }
@@ -33,10 +239,10 @@ impl StateVec {
     /// Creates a new state vector. If no vector is provided, it will be
     /// initialized to |0> for all qubits. Additionally, the vector will be
     /// normalized.
-    pub fn new(qubit_num: usize, vec: Option<PyReadonlyArray1<Complex64>>) -> Self {
+    pub fn new(py: Python<'_>, qubit_num: usize, vec: Option<PyReadonlyArray1<Complex64>>) -> Self {
         let init_size = 2 << (qubit_num - 1);
         let vec = match vec {
-            Some(vec) => vec.as_array().to_owned(),
+            Some(vec) => Array1::from(vec.as_array().to_vec()),
             None => {
                 let mut vec = vec![Complex64::new(1.0, 0.0)];
                 vec.extend(vec![Complex64::new(0.0, 0.0); init_size - 1]);
@@ -45,30 +251,134 @@ impl StateVec {
         };
 
         // normalize the vector
-        let mut state_vec = StateVec { vec, init_size };
-        state_vec.normalize();
+        let state_vec = StateVec {
+            vec: PyArray1::from_owned_array_bound(py, vec).unbind(),
+            init_size,
+        };
+        state_vec.normalize(py).unwrap();
         state_vec
     }
 
+    /// Wraps a complex128 NumPy array as a state vector. With copy=False the
+    /// array itself becomes the storage, so it must be contiguous and writable
+    /// and later writes through either object are visible to both. The
+    /// amplitudes are not normalized.
+    #[staticmethod]
+    #[pyo3(signature = (vec, copy = true))]
+    pub fn from_numpy(vec: Bound<'_, PyArray1<Complex64>>, copy: bool) -> PyResult<Self> {
+        let init_size = vec.len();
+        if !init_size.is_power_of_two() {
+            return Err(PyValueError::new_err("State vector length must be a power of two"));
+        }
+
+        let vec = if copy {
+            PyArray1::from_owned_array_bound(vec.py(), vec.to_owned_array())
+        } else {
+            if !vec.is_c_contiguous() {
+                return Err(PyValueError::new_err("copy=False requires a contiguous array"));
+            }
+            vec.try_readwrite().map_err(|e| PyValueError::new_err(e.to_string()))?;
+            vec
+        };
+
+        Ok(StateVec {
+            vec: vec.unbind(),
+            init_size,
+        })
+    }
+
+    /// Returns an independent copy of the state vector
+    pub fn copy(&self, py: Python<'_>) -> Self {
+        StateVec {
+            vec: PyArray1::from_owned_array_bound(py, self.get_vec(py)).unbind(),
+            init_size: self.init_size,
+        }
+    }
+
+    /// A writable view of the amplitudes. No data is copied; use copy() or
+    /// numpy.copy for a snapshot.
     #[getter]
-    fn vec(&self, py: Python<'_>) -> PyResult<Py<PyArray1<Complex64>>> {
-        Ok(self.vec.to_pyarray_bound(py).to_owned().into())
+    fn vec<'py>(&self, py: Python<'py>) -> Bound<'py, PyArray1<Complex64>> {
+        self.vec.bind(py).clone()
     }
 
+    /// Writes the amplitudes into the existing storage when the length
+    /// matches, so views taken earlier stay attached. Otherwise the register
+    /// is reallocated with a copy of the new amplitudes and resized to match.
     #[setter]
-    fn set_vec(&mut self, vec: PyReadonlyArray1<Complex64>) {
-        self.vec = vec.as_array().to_owned();
+    fn set_vec(&mut self, py: Python<'_>, vec: Bound<'_, PyArray1<Complex64>>) -> PyResult<()> {
+        let storage = self.vec.bind(py);
+        if vec.is(storage) {
+            return Ok(());
+        }
+        if !vec.len().is_power_of_two() {
+            return Err(PyValueError::new_err("State vector length must be a power of two"));
+        }
+
+        if vec.len() == storage.len() {
+            let src = vec.try_readonly().map_err(|e| PyValueError::new_err(e.to_string()))?;
+            let mut dst = storage.try_readwrite().map_err(|e| PyValueError::new_err(e.to_string()))?;
+            dst.as_array_mut().assign(&src.as_array());
+        } else {
+            self.init_size = vec.len();
+            self.vec = PyArray1::from_owned_array_bound(py, vec.to_owned_array()).unbind();
+        }
+        Ok(())
+    }
+
+    /// Applies a 2x2 matrix to the target qubit in place, without building
+    /// the full 2^n x 2^n unitary. The GIL is released while the amplitudes
+    /// are updated on the rayon thread pool.
+    pub fn apply_single_qubit(
+        &mut self,
+        py: Python<'_>,
+        matrix: PyReadonlyArray2<Complex64>,
+        target: usize,
+    ) -> PyResult<()> {
+        self.checked_qubit_num(py, &[target])?;
+
+        let matrix = matrix.as_array();
+        if matrix.dim() != (2, 2) {
+            return Err(PyValueError::new_err("Single qubit gates must be 2x2 matrices"));
+        }
+        let gate: [[Complex64; 2]; 2] = std::array::from_fn(|i| std::array::from_fn(|j| matrix[[i, j]]));
+
+        self.with_amplitudes(py, |amps| apply_single_qubit_gate(amps, &gate, target))
+    }
+
+    /// Applies a 4x4 matrix to two distinct target qubits in place. The matrix
+    /// acts on the basis |target_1 target_2>. The GIL is released while the
+    /// amplitudes are updated on the rayon thread pool.
+    pub fn apply_two_qubit(
+        &mut self,
+        py: Python<'_>,
+        matrix: PyReadonlyArray2<Complex64>,
+        target_1: usize,
+        target_2: usize,
+    ) -> PyResult<()> {
+        self.checked_qubit_num(py, &[target_1, target_2])?;
+        if target_1 == target_2 {
+            return Err(PyValueError::new_err("Two qubit gates need distinct target qubits"));
+        }
+
+        let matrix = matrix.as_array();
+        if matrix.dim() != (4, 4) {
+            return Err(PyValueError::new_err("Two qubit gates must be 4x4 matrices"));
+        }
+        let gate: [[Complex64; 4]; 4] = std::array::from_fn(|i| std::array::from_fn(|j| matrix[[i, j]]));
+
+        self.with_amplitudes(py, |amps| apply_two_qubit_gate(amps, &gate, target_1, target_2))
     }
 
     #[setter]
-    pub fn set_size(&mut self, qubit_num: usize) {
+    pub fn set_size(&mut self, py: Python<'_>, qubit_num: usize) {
         self.init_size = 2 << qubit_num;
-        self.vec = Array1::zeros(self.init_size);
+        self.vec = PyArray1::zeros_bound(py, self.init_size, false).unbind();
     }
 
-    pub fn __str__(&self) -> PyResult<String> {
+    pub fn __str__(&self, py: Python<'_>) -> PyResult<String> {
         let mut output: String = "[\n".to_string();
-        for val in self.vec.iter() {
+        for val in self.vec.bind(py).readonly().as_array().iter() {
             output.push_str(&format!("\t{:?} + {:?}i\n", val.re, val.im));
         }
         output.push_str("]");